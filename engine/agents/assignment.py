@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from engine.agents.generic import GenericTemplateAgent
 from engine.resolver.learner import LearnerProfile
 
@@ -12,23 +12,40 @@ class AssignmentAgent(GenericTemplateAgent):
         # Hardcoded default template for now, could come from config
         super().__init__(config, "assignment/v1_standard.md")
 
-    def run(self, module_data: Dict[str, Any], assignment_id: str, context: str) -> str:
+    def build_prompts(self, module_data: Dict[str, Any], assignment_id: str, context: str) -> Tuple[str, str]:
         """
-        Generate mission.md content using external template.
+        Render (context_str, instructions_str) for one assignment.
         """
         # Load profile to provide competence/fluency context
         profile = LearnerProfile(self.config.learner_state.model_dump())
+        # Only evidence about this module's contract is relevant to one of its missions
+        scope = [module_data.get("id") or ""] + list(module_data.get("requires") or []) + list(module_data.get("produces") or [])
+        learner_summary = profile.to_prompt_string(scope=[s for s in scope if s])
         
         # Prepare context for Jinja2
         template_context = {
             "module_data": module_data,
             "assignment_id": assignment_id,
             "context": context,
-            "learner_summary": profile.to_prompt_string()
+            "learner_summary": learner_summary
         }
         
         # The dynamic user data: what the learner wants and who they are
-        context_str = f"Assignment ID: {assignment_id}\nGoal: {context}\n\n{profile.to_prompt_string()}"
+        context_str = f"Assignment ID: {assignment_id}\nGoal: {context}\n\n{learner_summary}"
         
         instructions_str = self.render_prompt(**template_context)
+        return context_str, instructions_str
+
+    def run(self, module_data: Dict[str, Any], assignment_id: str, context: str) -> str:
+        """
+        Generate mission.md content using external template.
+        """
+        context_str, instructions_str = self.build_prompts(module_data, assignment_id, context)
         return self.call("assignment", context=context_str, instructions=instructions_str)
+
+    async def arun(self, module_data: Dict[str, Any], assignment_id: str, context: str) -> str:
+        """
+        Async variant of `run`, used to generate a module's assignments concurrently.
+        """
+        context_str, instructions_str = self.build_prompts(module_data, assignment_id, context)
+        return await self.acall("assignment", context=context_str, instructions=instructions_str)
@@ -7,7 +7,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 
 from openai import OpenAI
-from engine.benchmarking.client import init_client, call_agent, PROMPTS_DIR
+from engine.benchmarking.client import get_client, get_async_client, call_agent, acall_agent, PROMPTS_DIR
+from engine.benchmarking.telemetry import span
 from engine.schemas.config import RunConfig
 
 from datetime import datetime
@@ -16,7 +17,7 @@ import yaml
 class BaseAgent(ABC):
     def __init__(self, config: RunConfig):
         self.config = config
-        self.client = init_client()
+        self.client = get_client()
         self.model = config.model
         self.last_metadata = {}
         self.last_prompt = ""
@@ -31,20 +32,65 @@ class BaseAgent(ABC):
             context:      Dynamic per-request data (goal, learner profile) → user role.
             instructions: Static agent directives and output schema → system role.
         """
+        self._record_prompt(context, instructions)
+        run_info = {}
+        with self._llm_span(agent_name) as s:
+            output, usage = call_agent(self.client, agent_name, instructions, context, self.model,
+                                       run_info=run_info, **self._sampling())
+            self._record_metadata(agent_name, context, usage, run_info)
+            s.set(**self._span_attrs(usage, run_info))
+        return output
+
+    async def acall(self, agent_name: str, context: str, instructions: str) -> str:
+        """Async variant of `call` for concurrent generation."""
+        self._record_prompt(context, instructions)
+        run_info = {}
+        with self._llm_span(agent_name) as s:
+            output, usage = await acall_agent(get_async_client(), agent_name, instructions, context, self.model,
+                                              run_info=run_info, **self._sampling())
+            self._record_metadata(agent_name, context, usage, run_info)
+            s.set(**self._span_attrs(usage, run_info))
+        return output
+
+    def _sampling(self) -> Dict[str, Any]:
+        return {"max_tokens": self.config.max_tokens, "temperature": self.config.temperature, "seed": self.config.seed}
+
+    def _llm_span(self, agent_name: str):
+        return span("llm", agent=agent_name, model=self.model,
+                    prompt_version=getattr(self, "template_path", None))
+
+    @staticmethod
+    def _span_attrs(usage: Dict[str, Any], run_info: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "tokens_estimated": usage.get("estimated"),
+            "cache": run_info.get("cache"),
+            "retries": run_info.get("retries"),
+            "ttft": run_info.get("ttft"),
+            "stream_aborted": run_info.get("stream_aborted"),
+        }
+
+    def _record_prompt(self, context: str, instructions: str):
         self.last_context = context
         self.last_instructions = instructions
         # Keep last_prompt for backwards-compat logging (context + instructions combined)
         self.last_prompt = f"{instructions}\n\n{context}"
 
-        output, usage = call_agent(self.client, agent_name, instructions, context, self.model)
+    def _record_metadata(self, agent_name: str, context: str, usage: Dict[str, Any], run_info: Dict[str, Any]):
         self.last_metadata = {
             "agent": agent_name,
             "timestamp": datetime.now().isoformat(),
             "model": self.model,
             "usage": usage,
+            "cache": run_info.get("cache"),
+            "cache_hit": run_info.get("cache") == "hit",
             "input_preview": context[:200] + "..."
         }
-        return output
+        # Model call time and streaming details (time-to-first-token, early stop/abort reasons)
+        for key in ("latency", "stream", "ttft", "stream_stopped", "stream_aborted"):
+            if key in run_info:
+                self.last_metadata[key] = run_info[key]
 
     @abstractmethod
     def run(self, **kwargs) -> Any:
@@ -1,4 +1,4 @@
-from engine.agents.generic import GenericTemplateAgent
+from engine.agents.generic import GenericTemplateAgent, read_template_text
 
 class CampaignAgent(GenericTemplateAgent):
     """
@@ -8,21 +8,18 @@ class CampaignAgent(GenericTemplateAgent):
     def __init__(self, config):
         super().__init__(config, "campaign/v1_standard.md")
 
-    def run(self, track_content: str) -> str:
+    def run(self, track_content: str, target_campaign: str = None) -> str:
         """
         Generate a campaign.yaml content based on the track definition.
+        `target_campaign` (a serialized campaign entry) selects which of the
+        track's campaigns to expand; by default the agent picks the first.
         """
-        from pathlib import Path
-        
-        template_path = Path(__file__).parent / "templates" / "campaign.yaml"
-        if not template_path.exists():
-            raise FileNotFoundError(f"Campaign template not found: {template_path}")
-            
-        campaign_template = template_path.read_text()
+        campaign_template = read_template_text("campaign.yaml")
         
         instructions_str = self.render_prompt(
             track_content=track_content,
-            campaign_template=campaign_template
+            campaign_template=campaign_template,
+            target_campaign=target_campaign
         )
         # The raw track content is the dynamic user data; instructions are the agent directives
         return self.call("campaign", context=track_content, instructions=instructions_str)
@@ -1,7 +1,57 @@
+import os
+import threading
 from pathlib import Path
-from typing import Any
-from jinja2 import Environment, FileSystemLoader
+from typing import Any, Dict, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from engine.agents.base import BaseAgent
+from engine.benchmarking.telemetry import span
+
+# Prompts are now stored alongside the agents in engine/agents/prompts
+PROMPTS_BASE_DIR = Path(__file__).parent / "prompts"
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+JINJA_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "jinja"
+
+_env: Optional[Environment] = None
+_lock = threading.Lock()
+# name -> (mtime_ns, text) for the static templates/*.yaml output schemas
+_template_texts: Dict[str, Tuple[int, str]] = {}
+# (template path, static context) -> (compiled template it came from, rendered text)
+_static_renders: Dict[Tuple[str, tuple], Tuple[Template, str]] = {}
+
+
+def get_environment() -> Environment:
+    """
+    Process-wide Jinja environment shared by every agent.
+
+    Compiled templates are kept in memory and in an on-disk bytecode cache;
+    `auto_reload` re-checks source mtimes so prompt edits apply without a restart.
+    """
+    global _env
+    with _lock:
+        if _env is None:
+            JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _env = Environment(
+                loader=FileSystemLoader(str(PROMPTS_BASE_DIR)),
+                bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+                auto_reload=True,
+            )
+        return _env
+
+
+def read_template_text(name: str) -> str:
+    """Text of engine/agents/templates/<name>, re-read only when its mtime changes."""
+    path = TEMPLATES_DIR / name
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template not found: {path}") from None
+    cached = _template_texts.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    text = path.read_text()
+    _template_texts[name] = (mtime, text)
+    return text
+
 
 class GenericTemplateAgent(BaseAgent):
     """
@@ -10,14 +60,28 @@ class GenericTemplateAgent(BaseAgent):
     def __init__(self, config, template_path: str):
         super().__init__(config)
         self.template_path = template_path
-        # Prompts are now stored alongside the agents in engine/agents/prompts
-        base_dir = Path(__file__).parent / "prompts"
-        self.env = Environment(loader=FileSystemLoader(str(base_dir)))
-        
+        self.env = get_environment()
+
     def render_prompt(self, **context) -> str:
+        with span("render", agent=type(self).__name__, prompt_version=self.template_path):
+            template = self.env.get_template(self.template_path)
+            return template.render(**context)
+
+    def render_static(self, **context: str) -> str:
+        """
+        Render a prompt whose inputs are all static (no per-request data) once
+        per template and reuse it. Invalidated when the template source changes.
+        """
+        key = (self.template_path, tuple(sorted(context.items())))
         template = self.env.get_template(self.template_path)
-        return template.render(**context)
-    
+        cached = _static_renders.get(key)
+        if cached and cached[0] is template:
+            with span("render", agent=type(self).__name__, prompt_version=self.template_path, cached=True):
+                return cached[1]
+        rendered = self.render_prompt(**context)
+        _static_renders[key] = (template, rendered)
+        return rendered
+
     def run(self, *args, **kwargs) -> Any:
         # subclasses must implement this or we could make a fully generic runner
         pass
@@ -1,6 +1,6 @@
 from pathlib import Path
 from typing import Union, Dict, Any
-from engine.agents.generic import GenericTemplateAgent
+from engine.agents.generic import GenericTemplateAgent, read_template_text
 from engine.schemas.schema import ModuleProposal
 
 class ModuleAgent(GenericTemplateAgent):
@@ -8,22 +8,20 @@ class ModuleAgent(GenericTemplateAgent):
     Agent responsible for defining a specific Module contract.
     """
     
-    def __init__(self, config):
-        # Default template, though we might switch dynamically
-        super().__init__(config, "module/v1_legacy.md")
+    def __init__(self, config, template_path: str = None):
+        # Default template, though we might switch dynamically.
+        # An explicit template_path (e.g. a benchmarked prompt version) wins over the switch.
+        super().__init__(config, template_path or "module/v1_legacy.md")
+        self.template_override = template_path
 
     def run(self, input_data: Union[str, ModuleProposal], target_id: str = None) -> str:
         """
         Generate a module.yaml content based on input (campaign content OR proposal).
         """
-        from pathlib import Path
-        template_path = Path(__file__).parent / "templates" / "module.yaml"
-        if not template_path.exists():
-            raise FileNotFoundError(f"Module template not found: {template_path}")
-        module_template = template_path.read_text()
+        module_template = read_template_text("module.yaml")
         
         if isinstance(input_data, ModuleProposal):
-            self.template_path = "module/v1_from_proposal.md"
+            self.template_path = self.template_override or "module/v1_from_proposal.md"
             context = {
                 "proposal": input_data,
                 "module_template": module_template
@@ -31,7 +29,7 @@ class ModuleAgent(GenericTemplateAgent):
             # The serialized proposal is the dynamic user data
             context_str = str(input_data)
         else:
-            self.template_path = "module/v1_legacy.md"
+            self.template_path = self.template_override or "module/v1_legacy.md"
             context = {
                 "campaign_content": input_data,
                 "module_template": module_template,
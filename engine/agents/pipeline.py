@@ -0,0 +1,111 @@
+"""
+Pipeline Scheduler.
+Runs generation steps as a dependency DAG on a worker pool. Steps become
+ready as soon as their dependencies succeed, so independent branches
+(e.g. two modules and their assignments) proceed in parallel. A running
+step may add further steps, which is how module generation fans out into
+its assignments once the module's assignment list is known.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from engine.benchmarking.telemetry import span
+
+
+class StepResult:
+    def __init__(self, step_id: str, status: str, value: Any = None,
+                 error: Optional[str] = None, duration: float = 0.0):
+        self.step_id = step_id
+        self.status = status        # "ok" | "failed" | "skipped"
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "step": self.step_id,
+            "status": self.status,
+            "error": self.error,
+            "duration": round(self.duration, 3),
+        }
+
+
+class Pipeline:
+    """A dynamic DAG of steps executed on a thread pool."""
+
+    def __init__(self, max_workers: int = 4,
+                 on_complete: Optional[Callable[[StepResult], None]] = None):
+        self.max_workers = max(1, max_workers)
+        self.on_complete = on_complete
+        self._steps: Dict[str, Callable[[], Any]] = {}
+        self._deps: Dict[str, List[str]] = {}
+        self._order: List[str] = []
+        self.results: Dict[str, StepResult] = {}
+        self._lock = threading.Lock()
+
+    def add(self, step_id: str, fn: Callable[[], Any], deps: Iterable[str] = ()):
+        """Register a step. Safe to call from inside a running step."""
+        with self._lock:
+            if step_id in self._steps:
+                raise ValueError(f"Duplicate pipeline step: {step_id}")
+            self._steps[step_id] = fn
+            self._deps[step_id] = list(deps)
+            self._order.append(step_id)
+
+    def _run_step(self, step_id: str) -> StepResult:
+        start = time.perf_counter()
+        try:
+            with span("step", step=step_id):
+                value = self._steps[step_id]()
+            return StepResult(step_id, "ok", value, duration=time.perf_counter() - start)
+        except Exception as e:
+            return StepResult(step_id, "failed", error=str(e), duration=time.perf_counter() - start)
+
+    def _finish(self, result: StepResult):
+        self.results[result.step_id] = result
+        if self.on_complete:
+            self.on_complete(result)
+
+    def _schedule(self, pool: ThreadPoolExecutor, running: Dict[Any, str]):
+        """Submit ready steps; skip (transitively) those behind a failed dependency."""
+        changed = True
+        while changed:
+            changed = False
+            with self._lock:
+                pending = [s for s in self._order if s not in self.results and s not in running.values()]
+            for step_id in pending:
+                deps = self._deps[step_id]
+                unknown = [d for d in deps if d not in self._steps]
+                failed = [d for d in deps if d in self.results and self.results[d].status != "ok"]
+                if unknown or failed:
+                    self._finish(StepResult(step_id, "skipped", error=f"dependency not satisfied: {', '.join(unknown + failed)}"))
+                    changed = True
+                elif all(d in self.results for d in deps):
+                    # Carry the caller's telemetry context into the worker thread
+                    running[pool.submit(contextvars.copy_context().run, self._run_step, step_id)] = step_id
+
+    def run(self) -> Dict[str, StepResult]:
+        """Execute every step; returns results keyed by step ID."""
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                self._schedule(pool, running)
+
+                if not running:
+                    with self._lock:
+                        if all(s in self.results for s in self._order):
+                            break
+                    # Only blocked steps remain and nothing can unblock them
+                    for step_id in [s for s in self._order if s not in self.results]:
+                        self._finish(StepResult(step_id, "skipped", error="dependency cycle"))
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    self._finish(future.result())
+        return self.results
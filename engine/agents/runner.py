@@ -3,31 +3,65 @@ import yaml
 import os
 import shutil
 import datetime
+import re
 import subprocess
 from pathlib import Path
-from rich.console import Console
-
-from engine.schemas.config import RunConfig
-from engine.agents.track import TrackAgent
-from engine.agents.campaign import CampaignAgent
-from engine.agents.module import ModuleAgent
-from engine.agents.assignment import AssignmentAgent
-from engine.resolver.learner import LearnerProfile
+
+# Agents, pydantic schemas and the LLM client (openai, jinja2, dotenv) are
+# imported inside the commands that use them, so --help and the
+# non-generating commands start fast. Keep it that way: startup.py checks it.
 from engine.utils.writer import ArtifactWriter
+from engine.benchmarking.cache import CACHE_MODES
+from engine.benchmarking.telemetry import span
+
+
+class _DeferredConsole:
+    """rich Console created on first use; importing rich alone costs ~30ms."""
+    _console = None
+
+    def __getattr__(self, name):
+        if _DeferredConsole._console is None:
+            from rich.console import Console
+            _DeferredConsole._console = Console()
+        return getattr(_DeferredConsole._console, name)
+
 
-console = Console()
+console = _DeferredConsole()
 
 # Resolve absolute paths
 RUNNER_DIR = Path(__file__).parent
 ENGINE_DIR = RUNNER_DIR.parent
 PROJECT_ROOT = ENGINE_DIR.parent
 
+_FENCE_LINE = re.compile(r"^\s*(`{3,}|~{3,})\s*([\w+\-.#]*)\s*$")
+_HEADING_LINE = re.compile(r"^#{1,6}\s")
+
 def _clean_code_fences(text):
-    """Strip markdown code fences from LLM output."""
-    import re
-    pattern = r"```(?:\w+)?\n?(.*?)```"
-    match = re.search(pattern, text, re.DOTALL)
-    return match.group(1).strip() if match else text.strip()
+    """
+    Strip markdown code fences from LLM output: the first top-level fenced
+    block is the artifact. Blocks opened inside it (```python within an outer
+    ```markdown) are kept. Markdown that only embeds code blocks, such as a
+    mission with a fenced Verification script, is returned whole.
+    """
+    lines = text.strip().split("\n")
+    opened = []
+    start = None
+    for n, line in enumerate(lines):
+        match = _FENCE_LINE.match(line)
+        if not match:
+            if not opened and _HEADING_LINE.match(line):
+                return text.strip()
+            continue
+        marker, info = match.groups()
+        if opened and not info and marker[0] == opened[-1][0] and len(marker) >= len(opened[-1]):
+            opened.pop()
+            if not opened:
+                return "\n".join(lines[start + 1:n]).strip()
+        else:
+            if not opened:
+                start = n
+            opened.append(marker)
+    return text.strip()
 
 def _write_run_log(sandbox_dir, step_name, raw_output, rendered_context=None, rendered_instructions=None, metadata=None):
     """Append a generation step to the run log inside the sandbox."""
@@ -67,11 +101,18 @@ def _write_run_log(sandbox_dir, step_name, raw_output, rendered_context=None, re
 @click.group()
 @click.option("--benchmark", is_flag=True, help="Run in benchmark mode (isolated sandbox)")
 @click.option("--case-file", type=click.Path(exists=True), help="Path to benchmark case YAML")
+@click.option("--cache-mode", type=click.Choice(CACHE_MODES), help="LLM response cache mode (default: readwrite)")
+@click.option("--stream", is_flag=True, help="Stream completions and stop doomed or finished generations early")
 @click.pass_context
-def cli(ctx, benchmark, case_file):
+def cli(ctx, benchmark, case_file, cache_mode, stream):
     """Agent Orchestrator (Runner). Interacts with Agents to author curriculum."""
     ctx.ensure_object(dict)
     
+    if cache_mode:
+        os.environ["LLM_CACHE_MODE"] = cache_mode
+    if stream:
+        os.environ["LLM_STREAM"] = "1"
+    
     if case_file:
         benchmark = True
         
@@ -103,6 +144,21 @@ def cli(ctx, benchmark, case_file):
         school_sandbox = sandbox_dir / "school-content"
         learners_sandbox = sandbox_dir / "learners"
         
+        # Start from a frozen domain snapshot when the case names one
+        domain_root = case_data.get('domain_root')
+        if domain_root and not school_sandbox.exists():
+            from engine.utils.sandbox import materialize_school
+            snapshot = Path(domain_root)
+            if not snapshot.is_absolute():
+                snapshot = case_path.parent / snapshot
+            try:
+                counts = materialize_school(snapshot.resolve(), school_sandbox)
+            except FileNotFoundError as e:
+                console.print(f"[red]{e}[/red]")
+                exit(1)
+            console.print(f"[dim]Linked snapshot {snapshot} ({counts['hardlink'] + counts['reflink']} linked, "
+                          f"{counts['copy']} copied, {counts['ms']}ms)[/dim]")
+        
         school_sandbox.mkdir(parents=True, exist_ok=True)
         (school_sandbox / "domains").mkdir(exist_ok=True)
         (school_sandbox / "projects").mkdir(exist_ok=True)
@@ -147,18 +203,121 @@ def cli(ctx, benchmark, case_file):
     # Initialize writer
     ctx.obj['writer'] = ArtifactWriter(str(ctx.obj['school_root']))
     
+    # One telemetry span per command; agent/LLM/validate/write spans nest under it
+    if ctx.invoked_subcommand not in ("stats", "standin"):
+        ctx.obj['span'] = ctx.with_resource(span(
+            "command",
+            command=ctx.invoked_subcommand,
+            benchmark=benchmark,
+            case_file=case_file,
+            model=ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
+        ))
+    
     # Load prompt version config
     prompts_config_path = PROJECT_ROOT / "benchmarks" / "prompts.yaml"
     if prompts_config_path.exists():
-        ctx.obj['prompts'] = yaml.safe_load(prompts_config_path.read_text()) or {}
+        ctx.obj['prompts_config'] = yaml.safe_load(prompts_config_path.read_text()) or {}
     else:
-        ctx.obj['prompts'] = {}
+        ctx.obj['prompts_config'] = {}
+    # A list of versions is swept by `bench run`; single runs use the first entry
+    ctx.obj['prompts'] = {
+        agent: (version[0] if isinstance(version, list) else version)
+        for agent, version in ctx.obj['prompts_config'].items()
+    }
+
+def _slugify(text):
+    """Turn a free-text goal into a goal-based track ID."""
+    import re
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:60].rstrip("-") or "new_track"
+
+def _module_refs(campaign):
+    """Module IDs referenced by a campaign entry (string or dict refs)."""
+    refs = []
+    for m_ref in campaign.get("modules", None) or []:
+        mid = m_ref.get("id") if isinstance(m_ref, dict) else m_ref
+        if mid:
+            refs.append(mid)
+    return refs
+
+def _find_track_for_goal(resolver, goal):
+    """Return an existing track whose goal matches this one, if any."""
+    wanted = " ".join(goal.lower().split())
+    for tid in sorted(resolver.tracks):
+        track = resolver.tracks[tid]
+        if track.get("learner"):
+            # A learner's pruned registry plan, not shared curriculum
+            continue
+        if " ".join(str(track.get("goal", "")).lower().split()) == wanted:
+            return track
+    return None
+
+def _plan_track_id(goal, learner_id):
+    """ID for a learner's registry plan; never the ID of a shared track."""
+    return f"{_slugify(goal)}_{_slugify(learner_id)}"
+
+def _track_from_plan(plan, goal, resolver, existing=None, learner_id="local_user"):
+    """
+    Build track.yaml data directly from the registry for a covered plan.
+    The plan is pruned for one learner, so it gets its own ID (and a
+    `learner` field) instead of the matching track's.
+    """
+    planned = set(plan.modules)
+    campaigns = []
+    placed = set()
+    
+    if existing:
+        for campaign in existing.get("campaigns", None) or []:
+            if not isinstance(campaign, dict):
+                continue
+            mods = [m for m in _module_refs(campaign) if m in planned]
+            if not mods:
+                continue
+            placed.update(mods)
+            campaigns.append({
+                "id": campaign.get("id"),
+                "title": campaign.get("title"),
+                "description": campaign.get("description", ""),
+                "modules": mods,
+            })
+            
+    # Prerequisites the plan pulled in that no campaign references come first
+    extra = [m for m in plan.modules if m not in placed]
+    if extra:
+        campaigns.insert(0, {
+            "id": "c00_prerequisites" if campaigns else "c01_registry_plan",
+            "title": "Prerequisites" if campaigns else "Registry Plan",
+            "description": "Modules resolved from the existing curriculum registry.",
+            "modules": extra,
+        })
+    
+    return {
+        "id": _plan_track_id(goal, learner_id),
+        "learner": learner_id,
+        "title": (existing or {}).get("title") or goal,
+        "description": (existing or {}).get("description") or "Resolved deterministically from the curriculum registry.",
+        "goal": goal,
+        "domains": sorted({m.split(".")[0] for m in plan.modules}),
+        "campaigns": campaigns,
+        "proposed_modules": [],
+    }
 
 @cli.command("track")
 @click.option("--goal", help="Learning goal (required in production mode)")
+@click.option("--target", "targets", multiple=True, help="Competency or module ID the goal requires (repeatable)")
+@click.option("--force-agent", is_flag=True, help="Always call the Track Agent, even if the registry covers the goal")
 @click.pass_context
-def run_track(ctx, goal):
+def run_track(ctx, goal, targets, force_agent):
     """Generate a Track using the Track Agent."""
+    _generate_track(ctx, goal, targets, force_agent)
+
+def _generate_track(ctx, goal, targets=(), force_agent=False):
+    """
+    Produce track.yaml (registry fast path or Track Agent). Returns the saved
+    path, or None when the learner needs nothing; exits 1 if it cannot be saved.
+    """
+    from engine.resolver.learner import LearnerProfile
+    
     benchmark = ctx.obj['benchmark']
     active_goal = ctx.obj.get('goal') if benchmark else goal
     model = ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
@@ -173,6 +332,54 @@ def run_track(ctx, goal):
     else:
         profile = LearnerProfile({"profile": {"description": "unknown"}})
 
+    # Fast path: resolve the goal against modules already on disk
+    gaps, covered_modules, scope = None, None, None
+    if not force_agent:
+        from engine.resolver.resolver import CurriculumResolver
+        from engine.resolver.planner import GapPlanner
+        resolver = CurriculumResolver([ctx.obj['school_root']])
+        existing = _find_track_for_goal(resolver, active_goal)
+        goal_targets = list(targets)
+        if not goal_targets and existing:
+            for campaign in existing.get("campaigns", None) or []:
+                if isinstance(campaign, dict):
+                    goal_targets.extend(_module_refs(campaign))
+        
+        if goal_targets:
+            planner = GapPlanner(resolver)
+            plan = planner.resolve_modules(goal_targets, profile)
+            scope = planner.subgraph(goal_targets)
+            if plan.covered:
+                if not plan.modules:
+                    console.print("[green]Learner already holds every competency this goal requires. Nothing to plan.[/green]")
+                    return None
+                learner_id = profile.learner_id or learner_state_path.parent.name
+                data = _track_from_plan(plan, active_goal, resolver, existing, learner_id)
+                clash = resolver.get_track(data['id'])
+                if clash and clash.get("learner") != learner_id:
+                    console.print(f"[red]Error: track '{data['id']}' already exists in the curriculum; "
+                                  f"refusing to overwrite it with a learner plan.[/red]")
+                    exit(1)
+                cleaned = yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
+                path = ctx.obj['writer'].write('track', cleaned, data['id'])
+                console.print(f"[green]Registry covers the goal ({len(plan.modules)} modules). Saved track to {path} without an LLM call.[/green]")
+                console.print(cleaned)
+                if benchmark and ctx.obj.get('school_root'):
+                    sandbox_dir = ctx.obj['school_root'].parent
+                    _write_run_log(sandbox_dir, "track", cleaned, metadata={
+                        "model": "registry (no LLM call)",
+                        "goal": active_goal,
+                        "case_file": ctx.obj.get('case_file', 'N/A'),
+                        "saved_to": str(path)
+                    })
+                return path
+            gaps = sorted(plan.unresolved)
+            covered_modules = plan.modules
+            console.print(f"[dim]Registry covers {len(plan.modules)} modules; sending {len(gaps)} uncovered gaps to the Track Agent.[/dim]")
+
+    from engine.schemas.config import RunConfig
+    from engine.agents.track import TrackAgent
+    
     config = RunConfig(
         run_name="runner_track",
         model=model,
@@ -181,9 +388,10 @@ def run_track(ctx, goal):
     )
     
     agent = TrackAgent(config, template_path=ctx.obj['prompts'].get('track', 'track/v2_standard.md'))
-    output = agent.run(active_goal, profile)
+    output = agent.run(active_goal, profile, gaps=gaps, covered_modules=covered_modules, scope=scope)
     cleaned = _clean_code_fences(output)
     
+    path = None
     try:
         data = yaml.safe_load(cleaned)
         tid = data.get('id') or "new_track"
@@ -204,16 +412,24 @@ def run_track(ctx, goal):
                 "model": model,
                 "goal": active_goal,
                 "case_file": ctx.obj.get('case_file', 'N/A'),
-                "saved_to": str(path) if path else "FAILED"
+                "saved_to": str(path) if path else "FAILED",
+                "cache": agent.last_metadata.get("cache", "N/A"),
+                "ttft": agent.last_metadata.get("ttft", "N/A")
             }
         )
         console.print(f"[dim]Run log updated at {sandbox_dir / 'run_log.md'}[/dim]")
+    if path is None:
+        exit(1)
+    return path
 
 @cli.command("campaign")
 @click.option("--track-file", type=click.Path(exists=True), required=True)
 @click.pass_context
 def run_campaign(ctx, track_file):
     """Generate a Campaign using the Campaign Agent."""
+    from engine.schemas.config import RunConfig
+    from engine.agents.campaign import CampaignAgent
+    
     benchmark = ctx.obj['benchmark']
     model = ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
     
@@ -250,6 +466,9 @@ def run_campaign(ctx, track_file):
 @click.pass_context
 def run_module(ctx, campaign_file):
     """Generate a Module using the Module Agent."""
+    from engine.schemas.config import RunConfig
+    from engine.agents.module import ModuleAgent
+    
     benchmark = ctx.obj['benchmark']
     model = ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
     
@@ -288,6 +507,9 @@ def run_module(ctx, campaign_file):
 @click.pass_context
 def run_assignment(ctx, module_id, assignment_id, context):
     """Generate an Assignment using the Assignment Agent."""
+    from engine.schemas.config import RunConfig
+    from engine.agents.assignment import AssignmentAgent
+    
     benchmark = ctx.obj['benchmark']
     model = ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
     
@@ -324,42 +546,551 @@ def run_assignment(ctx, module_id, assignment_id, context):
     console.print(output)
 
 
-def _validate_artifact(artifact_type, content, context=None):
-    from engine.benchmarking.validators import StructuralValidator, VerificationValidator
-    if context is None:
-        context = {}
-    if not content or len(content.strip()) < 10:
-        return False, "Content is empty or too short."
+@cli.command("module-assignments")
+@click.option("--module-id", required=True)
+@click.option("--context", default="", help="Context/Goal for the assignments")
+@click.option("--concurrency", default=5, show_default=True, help="Maximum in-flight LLM requests")
+@click.option("--timeout", default=300.0, show_default=True, help="Per-assignment timeout in seconds")
+@click.pass_context
+def run_module_assignments(ctx, module_id, context, concurrency, timeout):
+    """Generate every Assignment of a Module concurrently."""
+    import asyncio
+    from engine.schemas.config import RunConfig
+    from engine.agents.assignment import AssignmentAgent
+    model = ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
+    
+    from engine.resolver.resolver import CurriculumResolver
+    resolver = CurriculumResolver([ctx.obj['school_root']])
+    module_data = resolver.get_module(module_id)
+    
+    if not module_data:
+        console.print(f"[bold red]Error[/bold red]: Module '{module_id}' not found in `{ctx.obj['school_root']}`.")
+        exit(1)
         
-    if artifact_type in ['track', 'campaign', 'module']:
-        try:
-            data = yaml.safe_load(content)
-            if not isinstance(data, dict):
-                return False, "YAML must be an object."
-            if artifact_type == 'module':
-                req = ['id', 'title', 'assignments', 'requires', 'produces']
-            elif artifact_type == 'campaign':
-                req = ['id', 'title', 'modules']
-            elif artifact_type == 'track':
-                req = ['id', 'title', 'campaigns']
-            missing = [k for k in req if k not in data]
-            if missing:
-                return False, f"Missing keys: {', '.join(missing)}"
-            return True, None
-        except yaml.YAMLError as e:
-            return False, f"Invalid YAML: {e}"
+    assignment_ids = [a for a in module_data.get("assignments", None) or [] if a]
+    if not assignment_ids:
+        console.print(f"[yellow]Module '{module_id}' declares no assignments.[/yellow]")
+        return
+        
+    config = RunConfig(
+        run_name="runner_module_assignments",
+        model=model,
+        learner_state={"knowledge": "resolved"},
+        curriculum={"goal": context or ctx.obj.get("goal", "unknown")}
+    )
+    
+    agent = AssignmentAgent(config)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def generate(assignment_id):
+        async with semaphore:
+            return await asyncio.wait_for(agent.arun(module_data, assignment_id, context), timeout)
+    
+    async def generate_all():
+        tasks = [asyncio.create_task(generate(aid)) for aid in assignment_ids]
+        failed = []
+        # Await in module order so files are written deterministically as each prefix completes
+        for assignment_id, task in zip(assignment_ids, tasks):
+            try:
+                output = await task
+            except asyncio.TimeoutError:
+                console.print(f"[red]{assignment_id}: timed out after {timeout:.0f}s[/red]")
+                failed.append(assignment_id)
+                continue
+            except Exception as e:
+                console.print(f"[red]{assignment_id}: generation failed: {e}[/red]")
+                failed.append(assignment_id)
+                continue
             
-    elif artifact_type == 'assignment':
-        validators = [StructuralValidator(), VerificationValidator()]
-        failures = []
-        for v in validators:
-            if hasattr(v, 'name') and v.name == 'completability': continue
-            res = v.validate(artifact_type, content, context)
-            if not res.passed:
-                failures.extend(res.reasons)
-        if failures:
-            return False, "; ".join(failures)
-    return True, None
+            cleaned = _clean_code_fences(output)
+            is_valid, err = _validate_artifact('assignment', cleaned)
+            if not is_valid:
+                console.print(f"[bold yellow]Validation Warning ({assignment_id}):[/bold yellow] {err}")
+            try:
+                path = ctx.obj['writer'].write('assignment', cleaned, assignment_id, parent_id=module_id)
+                if path:
+                    console.print(f"[green]Saved assignment to {path}[/green]")
+            except Exception as e:
+                console.print(f"[yellow]Failed to save assignment {assignment_id}: {e}[/yellow]")
+                failed.append(assignment_id)
+        return failed
+    
+    failed = asyncio.run(generate_all())
+    done = len(assignment_ids) - len(failed)
+    console.print(f"[bold]Generated {done}/{len(assignment_ids)} assignments for {module_id}.[/bold]")
+    if failed:
+        exit(1)
+
+
+def _save_generated(writer, artifact_type, output, artifact_id=None, parent_id=None):
+    """Clean, validate and write one generated artifact. Returns (path, cleaned)."""
+    cleaned = _clean_code_fences(output)
+    is_valid, err = _validate_artifact(artifact_type, cleaned)
+    if not is_valid:
+        console.print(f"[bold yellow]Validation Warning ({artifact_type} {artifact_id or ''}):[/bold yellow] {err}")
+    if artifact_type != 'assignment' and not artifact_id:
+        data = yaml.safe_load(cleaned)
+        artifact_id = data.get('id') if isinstance(data, dict) else None
+        if not artifact_id:
+            raise ValueError(f"Generated {artifact_type} has no id")
+    return writer.write(artifact_type, cleaned, artifact_id, parent_id=parent_id), cleaned
+
+@cli.command("pipeline")
+@click.option("--goal", help="Learning goal (required in production mode)")
+@click.option("--workers", default=4, show_default=True, help="Parallel generation steps")
+@click.option("--no-assignments", is_flag=True, help="Stop after campaigns and modules")
+@click.pass_context
+def run_pipeline(ctx, goal, workers, no_assignments):
+    """Run track → campaigns → modules → assignments as one scheduled DAG."""
+    from engine.agents.pipeline import Pipeline
+    from engine.agents.assignment import AssignmentAgent
+    from engine.agents.campaign import CampaignAgent
+    from engine.agents.module import ModuleAgent
+    from engine.resolver.resolver import CurriculumResolver
+    from engine.schemas.config import RunConfig
+    from engine.schemas.schema import ModuleProposal
+    from pydantic import ValidationError
+    
+    model = ctx.obj.get('model') or os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
+    active_goal = ctx.obj.get('goal') if ctx.obj['benchmark'] else goal
+    writer = ctx.obj['writer']
+    
+    # The track is the root of the DAG; everything else depends on it
+    track_path = _generate_track(ctx, goal)
+    if not track_path:
+        return
+    track_content = Path(track_path).read_text()
+    track = yaml.safe_load(track_content) or {}
+    
+    def config(step):
+        return RunConfig(
+            run_name=f"runner_pipeline_{step}",
+            model=model,
+            learner_state={"knowledge": "resolved"},
+            curriculum={"goal": active_goal or "unknown"}
+        )
+    
+    def report(result):
+        style = {"ok": "green", "failed": "red", "skipped": "yellow"}[result.status]
+        detail = f" — {result.error}" if result.error else ""
+        console.print(f"[{style}][{result.status.upper()}][/{style}] {result.step_id} ({result.duration:.1f}s){detail}")
+    
+    pipeline = Pipeline(max_workers=workers, on_complete=report)
+    
+    def add_assignments(module_id, module_data, deps):
+        if no_assignments:
+            return
+        for aid in [a for a in module_data.get("assignments", None) or [] if a]:
+            def generate_assignment(aid=aid):
+                output = AssignmentAgent(config("assignment")).run(module_data, aid, active_goal or "")
+                return _save_generated(writer, 'assignment', output, aid, parent_id=module_id)[0]
+            pipeline.add(f"assignment:{module_id}.{aid}", generate_assignment, deps=deps)
+    
+    def reject(step_id, error):
+        # Bad entries surface as failed steps; the rest of the DAG still runs
+        def invalid():
+            raise ValueError(error)
+        pipeline.add(step_id, invalid)
+    
+    campaign_ids = set()
+    for i, campaign in enumerate(track.get("campaigns", None) or []):
+        if not isinstance(campaign, dict):
+            continue
+        entry = f"campaign:campaigns[{i}]"
+        cid = campaign.get("id")
+        if not cid:
+            reject(entry, "Invalid campaign: id is missing")
+            continue
+        if cid in campaign_ids:
+            reject(entry, f"Duplicate campaign: {cid}")
+            continue
+        campaign_ids.add(cid)
+        def generate_campaign(campaign=campaign):
+            target = yaml.safe_dump(campaign, sort_keys=False, allow_unicode=True)
+            output = CampaignAgent(config("campaign")).run(track_content, target_campaign=target)
+            return _save_generated(writer, 'campaign', output)[0]
+        pipeline.add(f"campaign:{cid}", generate_campaign)
+    
+    proposed = set()
+    for i, proposal_data in enumerate(track.get("proposed_modules", None) or []):
+        entry = f"module:proposed_modules[{i}]"
+        if not isinstance(proposal_data, dict):
+            reject(entry, f"Invalid module proposal: expected a mapping, got {type(proposal_data).__name__}")
+            continue
+        try:
+            proposal = ModuleProposal(**proposal_data)
+        except ValidationError as e:
+            problems = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            reject(entry, f"Invalid module proposal: {problems}")
+            continue
+        if proposal.id in proposed:
+            reject(entry, f"Duplicate module proposal: {proposal.id}")
+            continue
+        proposed.add(proposal.id)
+        step_id = f"module:{proposal.id}"
+        def generate_module(proposal=proposal, step_id=step_id):
+            output = ModuleAgent(config("module")).run(proposal)
+            path, cleaned = _save_generated(writer, 'module', output, proposal.id)
+            module_data = yaml.safe_load(cleaned)
+            if not isinstance(module_data, dict):
+                raise ValueError(f"Generated module {proposal.id} is not a mapping")
+            # Fan out into the assignments now that the module declares them
+            add_assignments(proposal.id, module_data, deps=[step_id])
+            return path
+        pipeline.add(step_id, generate_module)
+    
+    # Registry modules the track reuses only need their missing missions
+    resolver = CurriculumResolver([ctx.obj['school_root']])
+    for campaign in track.get("campaigns", None) or []:
+        if not isinstance(campaign, dict):
+            continue
+        for mid in _module_refs(campaign):
+            module_data = resolver.get_module(mid)
+            if mid in proposed or not module_data:
+                continue
+            proposed.add(mid)
+            missing = dict(module_data)
+            missing["assignments"] = [
+                a for a in module_data.get("assignments", None) or []
+                if a and not (writer.root / "domains" / mid.replace('.', '/') / "assignments" / a / "mission.md").exists()
+            ]
+            add_assignments(mid, missing, deps=[])
+    
+    results = pipeline.run()
+    counts = {status: sum(1 for r in results.values() if r.status == status) for status in ("ok", "failed", "skipped")}
+    console.print(f"[bold]Pipeline finished:[/bold] {counts['ok']} ok, {counts['failed']} failed, {counts['skipped']} skipped.")
+    if counts["failed"] or counts["skipped"]:
+        exit(1)
+
+
+@cli.command("stats")
+@click.option("--file", "telemetry_file", type=click.Path(exists=True), help="Telemetry JSONL (default: runs/telemetry.jsonl)")
+@click.option("--json", "as_json", is_flag=True, help="Emit the report as JSON")
+def run_stats(telemetry_file, as_json):
+    """Report p50/p95 latency and tokens per agent, prompt version and step."""
+    import json
+    from rich.table import Table
+    from engine.benchmarking.telemetry import load_spans, summarize
+    
+    spans = load_spans(Path(telemetry_file) if telemetry_file else None)
+    llm_rows = summarize([s for s in spans if s.get("name") == "llm"], ["agent", "prompt_version", "model"])
+    step_rows = summarize([s for s in spans if s.get("name") != "llm"], ["name", "command"])
+    
+    if as_json:
+        click.echo(json.dumps({"llm": llm_rows, "steps": step_rows}, indent=2))
+        return
+    if not spans:
+        console.print("[yellow]No telemetry recorded yet.[/yellow]")
+        return
+    
+    def fmt(value, unit=""):
+        if value is None:
+            return "-"
+        return f"{value:.2f}{unit}" if isinstance(value, float) else f"{value}{unit}"
+    
+    table = Table(title="LLM Calls")
+    for col in ["Agent", "Prompt", "Model", "N", "p50", "p95", "In p50", "Out p50", "Tokens", "Cache Hits", "Retries", "Errors"]:
+        table.add_column(col)
+    for r in llm_rows:
+        table.add_row(str(r["agent"]), str(r["prompt_version"]), str(r["model"]), str(r["count"]),
+                      fmt(r["p50"], "s"), fmt(r["p95"], "s"), fmt(r["prompt_tokens_p50"]), fmt(r["completion_tokens_p50"]),
+                      str(r["total_tokens"]), str(r["cache_hits"]), str(r["retries"]), str(r["errors"]))
+    console.print(table)
+    
+    table = Table(title="Steps")
+    for col in ["Step", "Command", "N", "p50", "p95", "Errors"]:
+        table.add_column(col)
+    for r in step_rows:
+        table.add_row(str(r["name"]), str(r["command"]), str(r["count"]), fmt(r["p50"], "s"), fmt(r["p95"], "s"), str(r["errors"]))
+    console.print(table)
+
+
+@cli.group("bench")
+def bench():
+    """Benchmark case-matrix commands."""
+
+
+@bench.command("run")
+@click.option("--cases", "case_paths", multiple=True, type=click.Path(exists=True),
+              default=[str(PROJECT_ROOT / "benchmarks" / "cases")], show_default=True,
+              help="Case file or directory of case files (repeatable)")
+@click.option("--model", "models", multiple=True, help="Model to run every case against (repeatable; default: each case's model)")
+@click.option("--workers", default=4, show_default=True, help="Parallel jobs (one process and sandbox each)")
+@click.option("--out", "out_dir", type=click.Path(file_okay=False), help="Results directory (default: runs/bench/<timestamp>)")
+@click.option("--json", "as_json", is_flag=True, help="Emit the results table as JSON")
+@click.pass_context
+def run_bench(ctx, case_paths, models, workers, out_dir, as_json):
+    """Run cases × models × prompt versions (from benchmarks/prompts.yaml) in parallel."""
+    import json
+    from rich.table import Table
+    from engine.benchmarking.bench.executor import load_cases, expand_matrix, run_matrix, bench_cache_mode
+    
+    try:
+        cases = load_cases([Path(p) for p in case_paths])
+    except Exception as e:
+        console.print(f"[red]Error loading cases: {e}[/red]")
+        exit(1)
+    jobs = expand_matrix(cases, list(models), ctx.obj['prompts_config'])
+    if not jobs:
+        console.print("[yellow]No benchmark jobs to run.[/yellow]")
+        return
+    
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_dir = Path(out_dir) if out_dir else PROJECT_ROOT / "runs" / "bench" / timestamp
+    if not as_json:
+        console.print(f"[bold blue]Running {len(jobs)} jobs ({len(cases)} cases) on {workers} workers, "
+                      f"cache {bench_cache_mode()} → {out_dir}[/bold blue]")
+    
+    def report(row):
+        if as_json:
+            return
+        style = "green" if row["outcome"] == "pass" else "red"
+        detail = f" — {row['reason']}" if row.get("reason") else ""
+        console.print(f"[{style}][{row['outcome'].upper()}][/{style}] {row['job_id']} ({row.get('duration') or 0:.1f}s){detail}")
+    
+    results = run_matrix(jobs, out_dir, workers=workers, on_result=report)
+    failed = sum(1 for r in results if r["outcome"] != "pass")
+    
+    if as_json:
+        click.echo(json.dumps(results, indent=2, default=str))
+    else:
+        def fmt(value):
+            return "-" if value is None else (f"{value:.2f}" if isinstance(value, float) else str(value))
+        
+        table = Table(title="Benchmark Results")
+        for col in ["Case", "Target", "Model", "Prompt", "Valid", "Outcome", "Latency", "TTFT", "In", "Out", "Plan", "Cache"]:
+            table.add_column(col)
+        for r in results:
+            table.add_row(r["case_id"], r["target"], r["model"], r["prompt_version"],
+                          "yes" if r["passed"] else "no", r["outcome"], fmt(r.get("latency")), fmt(r.get("ttft")),
+                          fmt(r.get("prompt_tokens")), fmt(r.get("completion_tokens")), fmt(r.get("plan_size")),
+                          fmt(r.get("cache")))
+        console.print(table)
+        console.print(f"[bold]{len(results) - failed}/{len(results)} jobs held.[/bold] Results: {out_dir / 'results.jsonl'}")
+    if failed:
+        exit(1)
+
+
+@bench.command("compare")
+@click.option("--baseline", multiple=True, help="Prompts YAML file or agent=version override (repeatable; default: benchmarks/prompts.yaml)")
+@click.option("--candidate", multiple=True, required=True, help="Prompts YAML file or agent=version override (repeatable)")
+@click.option("--cases", "case_paths", multiple=True, type=click.Path(exists=True),
+              default=[str(PROJECT_ROOT / "benchmarks" / "cases")], show_default=True,
+              help="Case file or directory of case files (repeatable)")
+@click.option("--model", "models", multiple=True, help="Model to run every case against (repeatable; default: each case's model)")
+@click.option("--repeat", default=1, show_default=True, help="Runs per case and arm (smooths latency noise)")
+@click.option("--workers", default=4, show_default=True, help="Parallel jobs (one process and sandbox each)")
+@click.option("--out", "out_dir", type=click.Path(file_okay=False), help="Results directory (default: runs/bench/<timestamp>_compare)")
+@click.option("--max-prompt-tokens-pct", type=float, default=10.0, show_default=True, help="Allowed prompt token increase (%)")
+@click.option("--max-completion-tokens-pct", type=float, default=20.0, show_default=True, help="Allowed completion token increase (%)")
+@click.option("--max-latency-pct", type=float, default=25.0, show_default=True, help="Allowed p50 model-call latency increase (%)")
+@click.option("--max-plan-size-pct", type=float, help="Allowed plan size change in either direction (%)")
+@click.option("--max-pass-rate-drop", type=float, default=0.0, show_default=True, help="Allowed validator pass-rate drop (percentage points)")
+@click.option("--json", "as_json", is_flag=True, help="Emit the comparison as JSON")
+@click.pass_context
+def run_bench_compare(ctx, baseline, candidate, case_paths, models, repeat, workers, out_dir,
+                      max_prompt_tokens_pct, max_completion_tokens_pct, max_latency_pct,
+                      max_plan_size_pct, max_pass_rate_drop, as_json):
+    """A/B two prompt configurations on the same cases and gate on regressions."""
+    import json
+    from rich.table import Table
+    from engine.benchmarking.bench.executor import load_cases, run_matrix, bench_cache_mode
+    from engine.benchmarking.bench.compare import Thresholds, build_jobs, compare, load_prompt_config
+    
+    try:
+        cases = load_cases([Path(p) for p in case_paths])
+        base_config = load_prompt_config(list(baseline), ctx.obj['prompts_config'])
+        cand_config = load_prompt_config(list(candidate), ctx.obj['prompts_config'])
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        exit(1)
+    
+    jobs = (build_jobs(cases, list(models), base_config, "baseline", repeat)
+            + build_jobs(cases, list(models), cand_config, "candidate", repeat))
+    if not jobs:
+        console.print("[yellow]No benchmark jobs to run.[/yellow]")
+        return
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_dir = Path(out_dir) if out_dir else PROJECT_ROOT / "runs" / "bench" / f"{timestamp}_compare"
+    if not as_json:
+        changed = {a: f"{base_config[a]} → {cand_config[a]}" for a in base_config if base_config[a] != cand_config[a]}
+        console.print(f"[bold blue]Comparing {changed or 'identical configurations'} over {len(jobs)} jobs "
+                      f"(cache {bench_cache_mode()}) → {out_dir}[/bold blue]")
+    
+    results = run_matrix(jobs, out_dir, workers=workers)
+    thresholds = Thresholds(max_prompt_tokens_pct, max_completion_tokens_pct, max_latency_pct,
+                            max_plan_size_pct, max_pass_rate_drop)
+    report = compare([r for r in results if r["job_id"].startswith("baseline__")],
+                     [r for r in results if r["job_id"].startswith("candidate__")], thresholds)
+    report["baseline_prompts"], report["candidate_prompts"] = base_config, cand_config
+    (out_dir / "comparison.json").write_text(json.dumps(report, indent=2, default=str))
+    
+    if as_json:
+        click.echo(json.dumps(report, indent=2, default=str))
+    else:
+        def fmt(value, pct=False):
+            if value is None:
+                return "-"
+            if pct:
+                return f"{value:+.1f}%"
+            return f"{value:.2f}" if isinstance(value, float) else str(value)
+        
+        table = Table(title="Prompt A/B Comparison")
+        for col in ["Metric", "Baseline", "Candidate", "Delta", "Delta %", "Limit", "Status"]:
+            table.add_column(col)
+        for m in report["metrics"]:
+            status = "[red]REGRESSED[/red]" if m["regressed"] else ("-" if m["limit"] is None else "[green]ok[/green]")
+            table.add_row(m["metric"], fmt(m["baseline"]), fmt(m["candidate"]), fmt(m["delta"]),
+                          fmt(m["delta_pct"], pct=True), fmt(m["limit"]), status)
+        console.print(table)
+        hits = report["baseline_cache_hits"] + report["candidate_cache_hits"]
+        if hits:
+            console.print(f"[yellow]{hits} cached jobs excluded from token and latency metrics.[/yellow]")
+        for violation in report["violations"]:
+            console.print(f"[bold red]Regression:[/bold red] {violation}")
+    if report["violations"]:
+        exit(1)
+
+
+@bench.command("startup")
+@click.option("--runs", default=5, show_default=True, help="Fresh interpreters per entry point")
+@click.option("--budget", "budgets", multiple=True, help="Override a budget as MODULE=MS (repeatable)")
+@click.option("--json", "as_json", is_flag=True, help="Emit the results as JSON")
+def run_bench_startup(runs, budgets, as_json):
+    """Check CLI cold-start import time against its budget (exits 1 on regression)."""
+    import json
+    from rich.table import Table
+    from engine.benchmarking.startup import ENTRY_POINTS, measure, check
+    
+    limits = dict(ENTRY_POINTS)
+    for spec in budgets:
+        module, _, ms = spec.partition("=")
+        limits[module] = float(ms)
+    results = [measure(module, runs=runs) for module in limits]
+    violations = check(results, limits)
+    
+    if as_json:
+        click.echo(json.dumps({"results": results, "budgets": limits, "violations": violations}, indent=2))
+    else:
+        table = Table(title="Cold-start import time")
+        table.add_column("Entry point")
+        table.add_column("Median", justify="right")
+        table.add_column("Budget", justify="right")
+        table.add_column("Eager heavy imports")
+        for r in results:
+            over = r['median_ms'] is not None and r['median_ms'] > limits[r['module']]
+            median = f"{r['median_ms']:.1f}ms"
+            table.add_row(r['module'], f"[red]{median}[/red]" if over else median,
+                          f"{limits[r['module']]:g}ms", ", ".join(r['lazy_violations']) or "-")
+        console.print(table)
+        for v in violations:
+            console.print(f"[bold red]REGRESSION[/bold red] {v}")
+    if violations:
+        exit(1)
+
+
+@cli.command("standin")
+@click.option("--mode", type=click.Choice(["record", "replay", "synth", "auto"]), default="auto", show_default=True,
+              help="record upstream responses, replay cassettes, synthesize artifacts, or replay-then-synthesize")
+@click.option("--cassettes", type=click.Path(file_okay=False), default=str(PROJECT_ROOT / "benchmarks" / "cassettes"),
+              show_default=True, help="Cassette directory")
+@click.option("--upstream", default="https://openrouter.ai/api/v1", show_default=True, help="Upstream API for record mode")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8799, show_default=True)
+@click.option("--latency", default="0", show_default=True, help="Time to first token in ms, as MEAN or MEAN:SD")
+@click.option("--tps", default=0.0, show_default=True, help="Simulated generation speed in tokens/s (0 = instant)")
+@click.option("--completion-tokens", help="Reported completion tokens for synthesized output, as MEAN or MEAN:SD")
+@click.option("--error-rate", default=0.0, show_default=True, help="Fraction of requests answered with a 429")
+@click.option("--seed", default=0, show_default=True, help="Seed for latency/token sampling")
+def run_standin(mode, cassettes, upstream, host, port, latency, tps, completion_tokens, error_rate, seed):
+    """Serve an offline OpenAI-compatible stand-in (set OPENROUTER_BASE_URL to use it)."""
+    from engine.benchmarking.standin import Distribution, StandinBackend, make_server
+    
+    try:
+        backend = StandinBackend(
+            mode=mode,
+            cassette_dir=Path(cassettes),
+            upstream=upstream,
+            latency=Distribution.parse(latency),
+            tokens_per_second=tps,
+            completion_tokens=Distribution.parse(completion_tokens) if completion_tokens else None,
+            error_rate=error_rate,
+            seed=seed,
+        )
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        exit(1)
+    server = make_server(backend, host, port)
+    console.print(f"[bold blue]Stand-in ({mode}) listening.[/bold blue] export OPENROUTER_BASE_URL=http://{host}:{port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@cli.command("gc")
+@click.option("--keep", default=20, show_default=True, help="Always keep this many most recent runs")
+@click.option("--older-than", "older_than", type=float, help="Only delete runs older than this many days")
+@click.option("--dry-run", is_flag=True, help="List what would be deleted")
+def run_gc(keep, older_than, dry_run):
+    """Delete old benchmark sandboxes under runs/ (snapshots are never touched)."""
+    from engine.utils.sandbox import gc_runs
+    
+    removed = gc_runs(PROJECT_ROOT / "runs", keep=keep, older_than_days=older_than, dry_run=dry_run)
+    verb = "Would delete" if dry_run else "Deleted"
+    for path in removed:
+        console.print(f"[dim]{verb} {path}[/dim]")
+    console.print(f"[bold]{verb} {len(removed)} runs.[/bold]")
+
+
+@cli.command("validate")
+@click.option("--root", type=click.Path(exists=True, file_okay=False), help="School root (default: the active school-content)")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 runs inline)")
+@click.option("--no-cache", is_flag=True, help="Re-check every file, ignoring stored results")
+@click.option("--json", "as_json", is_flag=True, help="Print a JSON report (for CI)")
+@click.option("--all", "show_all", is_flag=True, help="List passing files too")
+@click.pass_context
+def run_validate(ctx, root, workers, no_cache, as_json, show_all):
+    """Validate every track, campaign, module and mission in the school tree."""
+    from engine.benchmarking.validators.tree import validate_tree, to_json
+    
+    school_root = Path(root) if root else ctx.obj['school_root']
+    rows, stats = validate_tree(school_root, workers=workers, use_cache=not no_cache)
+    failed = [r for r in rows if not r['passed']]
+    ctx.obj['span'].set(files=len(rows), failed=len(failed), **stats)
+    
+    if as_json:
+        click.echo(to_json(rows, stats))
+    else:
+        from rich.table import Table
+        shown = rows if show_all else failed
+        if shown:
+            table = Table(title=f"Validation: {school_root}")
+            table.add_column("Path")
+            table.add_column("Type")
+            table.add_column("Result")
+            table.add_column("Reason")
+            for r in shown:
+                result = "[green]pass[/green]" if r['passed'] else "[red]fail[/red]"
+                table.add_row(r['path'], r['type'], result, r['reason'] or "")
+            console.print(table)
+        console.print(f"[bold]{len(rows) - len(failed)}/{len(rows)} passed[/bold] "
+                      f"[dim]({stats['checked']} checked, {stats['reused']} unchanged)[/dim]")
+    if failed:
+        exit(1)
+
+
+def _validate_artifact(artifact_type, content, context=None):
+    with span("validate", artifact_type=artifact_type) as s:
+        is_valid, err = _run_validators(artifact_type, content, context)
+        s.set(passed=is_valid, reason=err)
+    return is_valid, err
+
+def _run_validators(artifact_type, content, context=None):
+    from engine.benchmarking.validators import run_validators
+    return run_validators(artifact_type, content, context)
 
 if __name__ == "__main__":
     cli()
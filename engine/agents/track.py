@@ -1,4 +1,5 @@
-from engine.agents.generic import GenericTemplateAgent
+from typing import Iterable, List, Optional
+from engine.agents.generic import GenericTemplateAgent, read_template_text
 from engine.resolver.learner import LearnerProfile
 
 class TrackAgent(GenericTemplateAgent):
@@ -9,27 +10,31 @@ class TrackAgent(GenericTemplateAgent):
     def __init__(self, config, template_path="track/v2_standard.md"):
         super().__init__(config, template_path)
 
-    def run(self, goal: str, learner_profile: LearnerProfile) -> str:
+    def run(self, goal: str, learner_profile: LearnerProfile,
+            gaps: Optional[List[str]] = None, covered_modules: Optional[List[str]] = None,
+            scope: Optional[Iterable[str]] = None) -> str:
         """
         Generate a track.yaml content based on the goal and learner state.
+
+        When the registry already covers part of the goal, `covered_modules`
+        lists the modules to reuse and `gaps` the competencies left to plan,
+        so the prompt only asks the model for what is actually missing.
+        `scope` (the goal's registry subgraph) limits the learner summary to
+        relevant evidence.
         """
-        from pathlib import Path
-        
-        template_path = Path(__file__).parent / "templates" / "track.yaml"
-        if not template_path.exists():
-            raise FileNotFoundError(f"Track template not found: {template_path}")
-            
-        track_template = template_path.read_text()
+        track_template = read_template_text("track.yaml")
         
         # Render Context (user role: dynamic per-request data)
         context_templ = self.env.get_template("shared/context.md")
         context_str = context_templ.render(
             goal=goal,
-            learner_summary=learner_profile.to_prompt_string()
+            learner_summary=learner_profile.to_prompt_string(scope=scope),
+            gaps=gaps or [],
+            covered_modules=covered_modules or []
         )
         
-        # Render Instructions (system role: static agent directives + schema)
-        instructions_str = self.render_prompt(
+        # Render Instructions (system role: static agent directives + schema), once per template
+        instructions_str = self.render_static(
             track_template=track_template
         )
         
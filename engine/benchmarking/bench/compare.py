@@ -0,0 +1,177 @@
+"""
+Prompt-version A/B comparison.
+
+Runs the same cases under a baseline and a candidate prompt configuration
+(see executor.py), then reports per-metric deltas and checks them against
+regression thresholds so prompt changes can be gated on cost and latency.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from engine.benchmarking.bench.executor import expand_matrix, prompt_versions, DEFAULT_PROMPTS
+from engine.benchmarking.bench.schema import Case
+from engine.benchmarking.telemetry import percentile
+
+# (metric, row field, aggregation). Token and latency metrics regress upward.
+# "latency" is the model call alone; job setup and worker spawn are in "duration".
+METRICS = [
+    ("prompt_tokens", "prompt_tokens", "mean"),
+    ("completion_tokens", "completion_tokens", "mean"),
+    ("latency_p50", "latency", "p50"),
+    ("plan_size", "plan_size", "mean"),
+    ("pass_rate", "passed", "rate"),
+]
+
+
+def load_prompt_config(specs: List[str], base: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build a pinned prompt config (one version per agent).
+
+    Each spec is either a YAML file in the benchmarks/prompts.yaml format or
+    an `agent=version` override; overrides apply on top of `base` and files.
+    """
+    config = dict(base)
+    for spec in specs:
+        if "=" in spec and not Path(spec).exists():
+            agent, version = spec.split("=", 1)
+            if agent not in DEFAULT_PROMPTS:
+                raise ValueError(f"Unknown agent '{agent}' in '{spec}'")
+            config[agent] = version
+        else:
+            config.update(yaml.safe_load(Path(spec).read_text()) or {})
+    return {agent: prompt_versions(config, agent)[0] for agent in DEFAULT_PROMPTS}
+
+
+def build_jobs(cases: List[Case], models: List[str], config: Dict[str, str],
+               label: str, repeat: int = 1) -> List[Dict[str, Any]]:
+    """Jobs for one arm of the comparison; `repeat` reruns each job to steady latency."""
+    jobs = []
+    for job in expand_matrix(cases, models, config):
+        for n in range(1, repeat + 1):
+            suffix = f"__r{n}" if repeat > 1 else ""
+            jobs.append({**job, "job_id": f"{label}__{job['job_id']}{suffix}", "label": label})
+    return jobs
+
+
+def _aggregate(rows: List[Dict[str, Any]], field: str, how: str) -> Optional[float]:
+    if how == "rate":
+        return sum(1 for r in rows if r.get(field)) / len(rows) if rows else None
+    values = [r[field] for r in rows if r.get(field) is not None]
+    if not values:
+        return None
+    if how == "p50":
+        return percentile(values, 50)
+    return sum(values) / len(values)
+
+
+# Fields only meaningful for completed live calls; rows answered from the
+# response cache or that failed before the model replied are left out
+LIVE_FIELDS = {"prompt_tokens", "completion_tokens", "latency"}
+
+
+def summarize_runs(rows: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    live = [r for r in rows if r.get("cache") != "hit" and r.get("status") == "ok"]
+    summary = {name: _aggregate(live if field in LIVE_FIELDS else rows, field, how) for name, field, how in METRICS}
+    summary["jobs"] = len(rows)
+    summary["cache_hits"] = sum(1 for r in rows if r.get("cache") == "hit")
+    return summary
+
+
+class Thresholds:
+    """
+    Regression limits. Percentages are relative increases over the baseline;
+    `max_pass_rate_drop` is in percentage points. None disables a gate.
+    """
+
+    def __init__(self, prompt_tokens_pct: Optional[float] = 10.0,
+                 completion_tokens_pct: Optional[float] = 20.0,
+                 latency_pct: Optional[float] = 25.0,
+                 plan_size_pct: Optional[float] = None,
+                 max_pass_rate_drop: Optional[float] = 0.0):
+        self.limits = {
+            "prompt_tokens": prompt_tokens_pct,
+            "completion_tokens": completion_tokens_pct,
+            "latency_p50": latency_pct,
+            "plan_size": plan_size_pct,
+            "pass_rate": max_pass_rate_drop,
+        }
+
+    def check(self, metric: str, baseline: Optional[float], candidate: Optional[float]) -> Optional[str]:
+        """Return a violation message, or None if the metric is within its limit."""
+        limit = self.limits.get(metric)
+        if limit is None or baseline is None or candidate is None:
+            return None
+        if metric == "pass_rate":
+            drop = (baseline - candidate) * 100
+            if drop > limit:
+                return f"pass rate dropped {drop:.1f}pp (limit {limit:g}pp)"
+            return None
+        if metric == "plan_size":
+            # Plans that grow or shrink sharply both signal a behaviour change
+            change = abs(_pct(baseline, candidate) or 0.0)
+            if change > limit:
+                return f"plan size changed {change:.1f}% (limit {limit:g}%)"
+            return None
+        increase = _pct(baseline, candidate)
+        if increase is not None and increase > limit:
+            return f"{metric} up {increase:.1f}% (limit {limit:g}%)"
+        return None
+
+
+def _pct(baseline: Optional[float], candidate: Optional[float]) -> Optional[float]:
+    if baseline is None or candidate is None:
+        return None
+    if baseline == 0:
+        return 0.0 if candidate == 0 else float("inf")
+    return (candidate - baseline) / baseline * 100
+
+
+def compare(baseline_rows: List[Dict[str, Any]], candidate_rows: List[Dict[str, Any]],
+            thresholds: Thresholds) -> Dict[str, Any]:
+    """Overall and per-case deltas plus the list of threshold violations."""
+    base, cand = summarize_runs(baseline_rows), summarize_runs(candidate_rows)
+    metrics = []
+    violations = []
+    for name, _, _ in METRICS:
+        violation = thresholds.check(name, base[name], cand[name])
+        if violation:
+            violations.append(violation)
+        metrics.append({
+            "metric": name,
+            "baseline": base[name],
+            "candidate": cand[name],
+            "delta": None if base[name] is None or cand[name] is None else cand[name] - base[name],
+            "delta_pct": _pct(base[name], cand[name]),
+            "limit": thresholds.limits.get(name),
+            "regressed": violation is not None,
+        })
+
+    def by_case(rows):
+        grouped: Dict[tuple, List[Dict[str, Any]]] = {}
+        for r in rows:
+            grouped.setdefault((r["case_id"], r["model"]), []).append(r)
+        return grouped
+
+    base_cases, cand_cases = by_case(baseline_rows), by_case(candidate_rows)
+    cases = []
+    for key in sorted(set(base_cases) | set(cand_cases)):
+        b, c = summarize_runs(base_cases.get(key, [])), summarize_runs(cand_cases.get(key, []))
+        cases.append({
+            "case_id": key[0],
+            "model": key[1],
+            **{f"{name}_baseline": b[name] for name, _, _ in METRICS},
+            **{f"{name}_candidate": c[name] for name, _, _ in METRICS},
+        })
+
+    return {
+        "baseline_jobs": base["jobs"],
+        "candidate_jobs": cand["jobs"],
+        "baseline_cache_hits": base["cache_hits"],
+        "candidate_cache_hits": cand["cache_hits"],
+        "metrics": metrics,
+        "cases": cases,
+        "violations": violations,
+    }
@@ -0,0 +1,313 @@
+"""
+Case-matrix benchmark executor.
+
+Expands benchmark cases × models × prompt versions into jobs and runs them on
+a process pool. Each job gets its own sandbox (school-content linked from the
+case's snapshot, learner state, telemetry file) and a fresh worker process, so engine config
+read from the environment at import time never leaks between jobs.
+"""
+
+import json
+import os
+import shutil
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from engine.benchmarking.bench.schema import Case
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+# Jobs measure live calls: cached replies would skew latency and token numbers.
+# An explicit LLM_CACHE_MODE (or the runner's --cache-mode) takes precedence.
+BENCH_CACHE_MODE = "bypass"
+
+DEFAULT_PROMPTS = {
+    "track": "track/v2_standard.md",
+    "campaign": "campaign/v1_standard.md",
+    "module": "module/v1_legacy.md",
+    "assignment": "assignment/v1_standard.md",
+}
+
+
+def load_case(path: Path) -> Case:
+    """
+    Load a Case YAML. Legacy runner case files (run_name / learner_state)
+    are adapted into track cases against an empty domain snapshot.
+    """
+    path = Path(path)
+    data = yaml.safe_load(path.read_text()) or {}
+    if "case_id" not in data and "run_name" in data:
+        profile = {}
+        if data.get("learner_state"):
+            profile_path = path.parent / data["learner_state"]
+            if profile_path.exists():
+                profile = yaml.safe_load(profile_path.read_text()) or {}
+        data = {
+            "case_id": data["run_name"],
+            "domain_root": "",
+            "goal": data.get("goal"),
+            "learner_profile": profile,
+            "target": "track",
+            "target_id": data["run_name"],
+            **({"model": data["model"]} if data.get("model") else {}),
+        }
+    if data.get("domain_root"):
+        root = Path(data["domain_root"])
+        if not root.is_absolute():
+            root = path.parent / root if (path.parent / root).exists() else PROJECT_ROOT / root
+        data["domain_root"] = str(root.resolve())
+    return Case(**data)
+
+
+def load_cases(paths: List[Path]) -> List[Case]:
+    """Load case files; directories contribute every *.yaml inside them."""
+    files = []
+    for p in paths:
+        p = Path(p)
+        files.extend(sorted(p.glob("*.yaml")) if p.is_dir() else [p])
+    return [load_case(f) for f in files]
+
+
+def prompt_versions(prompts_config: Dict[str, Any], agent: str) -> List[str]:
+    """Versions to sweep for an agent (prompts.yaml values may be a string or a list)."""
+    value = prompts_config.get(agent) or DEFAULT_PROMPTS[agent]
+    return list(value) if isinstance(value, list) else [value]
+
+
+def expand_matrix(cases: List[Case], models: List[str], prompts_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One job per case × model × prompt version of the case's target agent."""
+    jobs = []
+    for case in cases:
+        for model in models or [case.model]:
+            for version in prompt_versions(prompts_config, case.target):
+                slug = version.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+                job_id = f"{case.case_id}__{model.replace('/', '_')}__{slug}"
+                jobs.append({
+                    "job_id": job_id,
+                    "case": case.model_dump(),
+                    "model": model,
+                    "prompt_version": version,
+                })
+    return jobs
+
+
+def _prepare_sandbox(sandbox: Path, case: Case):
+    from engine.utils.sandbox import materialize_school
+
+    school = sandbox / "school-content"
+    if sandbox.exists():
+        shutil.rmtree(sandbox)
+    if case.domain_root:
+        # Linked, not copied: writes go through ArtifactWriter's atomic replace
+        materialize_school(Path(case.domain_root), school)
+    for sub in ("domains", "projects", "exams"):
+        (school / sub).mkdir(parents=True, exist_ok=True)
+    state_dir = sandbox / "learners" / "local_user"
+    state_dir.mkdir(parents=True, exist_ok=True)
+    (state_dir / "student_state.yaml").write_text(yaml.safe_dump(case.learner_profile, sort_keys=False))
+    return school, state_dir / "student_state.yaml"
+
+
+def _generate(case: Case, model: str, prompt_version: str, school: Path, state_path: Path):
+    """Run the case's target agent once. Returns (agent, output, validation context, parent_id)."""
+    from engine.schemas.config import RunConfig
+    from engine.resolver.learner import LearnerProfile
+    from engine.resolver.resolver import CurriculumResolver
+
+    config = RunConfig(
+        run_name=f"bench_{case.case_id}",
+        model=model,
+        learner_state={"knowledge": "resolved"},
+        curriculum={"goal": case.goal or "unknown"},
+        temperature=case.temperature,
+        max_tokens=case.max_tokens,
+        seed=case.seed,
+    )
+    resolver = CurriculumResolver([school], use_index=False)
+
+    if case.target == "track":
+        from engine.agents.track import TrackAgent
+        agent = TrackAgent(config, template_path=prompt_version)
+        return agent, agent.run(case.goal or case.target_id, LearnerProfile.load(state_path)), {}, None
+
+    if case.target == "campaign":
+        from engine.agents.campaign import CampaignAgent
+        track = resolver.get_track(case.target_id)
+        if track is None:
+            raise LookupError(f"Track '{case.target_id}' not found in the domain snapshot")
+        agent = CampaignAgent(config)
+        agent.template_path = prompt_version
+        return agent, agent.run(Path(track["_path"]).read_text()), {}, None
+
+    if case.target == "module":
+        from engine.agents.module import ModuleAgent
+        from engine.schemas.schema import ModuleProposal
+        agent = ModuleAgent(config, template_path=prompt_version)
+        existing = resolver.get_module(case.target_id)
+        if existing:
+            # Regenerate the contract from its own proposal, as the pipeline does
+            proposal = ModuleProposal(
+                id=case.target_id,
+                title=existing.get("title") or case.target_id,
+                description=existing.get("description") or "",
+                justification=f"Benchmark case {case.case_id}",
+                required_competencies=existing.get("requires") or [],
+                produced_competencies=existing.get("produces") or [],
+            )
+            return agent, agent.run(proposal), {}, None
+        campaign = next((c for c in resolver.campaigns.values()
+                         if case.target_id in str(c.get("modules"))), None)
+        if campaign is None:
+            raise LookupError(f"Module '{case.target_id}' is neither in the domain snapshot nor referenced by a campaign")
+        return agent, agent.run(Path(campaign["_path"]).read_text(), target_id=case.target_id), {}, None
+
+    if case.target == "assignment":
+        from engine.agents.assignment import AssignmentAgent
+        module_id = next((m for m in sorted(resolver.modules, key=len, reverse=True)
+                          if case.target_id.startswith(m + ".")), None)
+        if module_id is None:
+            raise LookupError(f"No module in the domain snapshot owns assignment '{case.target_id}'")
+        assignment_id = case.target_id[len(module_id) + 1:]
+        agent = AssignmentAgent(config)
+        agent.template_path = prompt_version
+        output = agent.run(resolver.get_module(module_id), assignment_id, case.goal or "")
+        return agent, output, {"target_id": module_id}, module_id
+
+    raise ValueError(f"Unknown case target: {case.target}")
+
+
+# What a "plan" counts for each target: modules proposed by a track, modules
+# sequenced by a campaign, assignments declared by a module
+PLAN_KEYS = {"track": "proposed_modules", "campaign": "modules", "module": "assignments"}
+
+
+def _plan_size(target: str, cleaned: str) -> Optional[int]:
+    if target not in PLAN_KEYS:
+        return None
+    try:
+        data = yaml.safe_load(cleaned)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return len(data.get(PLAN_KEYS[target]) or [])
+
+
+def _execute(case: Case, job: Dict[str, Any], school: Path, state_path: Path, sandbox: Path) -> Dict[str, Any]:
+    from engine.agents.runner import _clean_code_fences, _validate_artifact
+    from engine.utils.writer import ArtifactWriter
+
+    agent, output, context, parent_id = _generate(case, job["model"], job["prompt_version"], school, state_path)
+    (sandbox / "output.md").write_text(output or "")
+    # Cleaned as the pipeline saves it; a mission's own code blocks survive
+    cleaned = _clean_code_fences(output)
+    passed, reason = _validate_artifact(case.target, cleaned, context)
+    if passed:
+        artifact_id = case.target_id[len(parent_id) + 1:] if parent_id else None
+        try:
+            ArtifactWriter(str(school)).write(case.target, cleaned, artifact_id, parent_id=parent_id)
+        except Exception as e:
+            passed, reason = False, f"Write failed: {e}"
+    usage = agent.last_metadata.get("usage") or {}
+    return {
+        "status": "ok",
+        "passed": passed,
+        "reason": reason,
+        "plan_size": _plan_size(case.target, cleaned),
+        # The model call alone; imports, sandbox and agent setup are in "duration"
+        "latency": agent.last_metadata.get("latency"),
+        "ttft": agent.last_metadata.get("ttft"),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "cache": agent.last_metadata.get("cache"),
+    }
+
+
+def run_job(job: Dict[str, Any], out_dir: str) -> Dict[str, Any]:
+    """
+    Execute one job in its own sandbox. Runs inside a pool worker; engine
+    modules are imported only after the sandbox environment is in place.
+    """
+    case = Case(**job["case"])
+    sandbox = Path(out_dir) / job["job_id"]
+    school, state_path = _prepare_sandbox(sandbox, case)
+    os.environ["SCHOOL_ROOT"] = str(school)
+    os.environ["STATE_ROOT"] = str(state_path.parent.parent)
+    os.environ["ASCENT_TELEMETRY"] = str(sandbox / "telemetry.jsonl")
+    os.environ["LLM_CACHE_MODE"] = job.get("cache_mode") or BENCH_CACHE_MODE
+
+    row = {
+        "job_id": job["job_id"],
+        "case_id": case.case_id,
+        "target": case.target,
+        "model": job["model"],
+        "prompt_version": job["prompt_version"],
+        "expected_failure": case.expected_failure,
+        "seed": case.seed,
+        "temperature": case.temperature,
+        "max_tokens": case.max_tokens,
+        "sandbox": str(sandbox),
+    }
+    started = time.perf_counter()
+    # Agent chatter goes to the job log, not the shared terminal
+    with open(sandbox / "job.log", "w") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            row.update(_execute(case, job, school, state_path, sandbox))
+        except BaseException as e:
+            (sandbox / "error.txt").write_text(traceback.format_exc())
+            row.update({
+                "status": "error",
+                "passed": False,
+                "reason": f"{type(e).__name__}: {e}",
+            })
+    row["duration"] = round(time.perf_counter() - started, 3)
+    # A job "holds" when its validation outcome matches the case's expectation
+    row["outcome"] = "pass" if row["passed"] != case.expected_failure else "fail"
+    return row
+
+
+def bench_cache_mode() -> str:
+    """Response cache mode for benchmark jobs: LLM_CACHE_MODE if set, else bypass."""
+    return os.getenv("LLM_CACHE_MODE") or BENCH_CACHE_MODE
+
+
+def run_matrix(jobs: List[Dict[str, Any]], out_dir: Path, workers: int = 4,
+               on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+               cache_mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Run jobs on a spawn-based process pool (one fresh worker per job).
+    Jobs use `cache_mode` (default: bench_cache_mode()) for the response cache.
+    """
+    cache_mode = cache_mode or bench_cache_mode()
+    jobs = [{**job, "cache_mode": job.get("cache_mode") or cache_mode} for job in jobs]
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        futures = {pool.submit(run_job, job, str(out_dir)): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed); record it like any other failure
+                row = {"job_id": job["job_id"], "case_id": job["case"]["case_id"], "target": job["case"]["target"],
+                       "model": job["model"], "prompt_version": job["prompt_version"], "status": "error",
+                       "passed": False, "reason": f"{type(e).__name__}: {e}", "outcome": "fail"}
+            results[job["job_id"]] = row
+            if on_result:
+                on_result(row)
+
+    ordered = [results[job["job_id"]] for job in jobs]
+    with open(out_dir / "results.jsonl", "w") as f:
+        for row in ordered:
+            f.write(json.dumps(row, default=str) + "\n")
+    return ordered
@@ -1,7 +1,6 @@
 import sys
 from pathlib import Path
-from engine.cli.validators.structural import StructuralValidator
-from engine.cli.validators.verification import VerificationValidator
+from engine.benchmarking.validators import StructuralValidator, VerificationValidator
 
 def main():
     if len(sys.argv) < 2:
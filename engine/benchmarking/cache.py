@@ -0,0 +1,168 @@
+"""
+Content-addressed response cache for LLM calls.
+
+Entries are keyed on a hash of everything that determines the completion
+(model, system prompt, user prompt, max_tokens, temperature) and stored as
+one JSON file each, alongside the usage metadata of the original call.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+# readwrite: serve hits, store misses
+# readonly:  serve hits, never store
+# refresh:   always call the model, overwrite stored entries
+# bypass:    no reads, no writes
+CACHE_MODES = ("readwrite", "readonly", "refresh", "bypass")
+
+DEFAULT_MAX_MB = 512
+DEFAULT_MAX_AGE_DAYS = 30
+
+# A full sweep stats every entry, so puts only run one when the last sweep is
+# this old or the bytes written since would take the cache past max_bytes
+SWEEP_INTERVAL = 3600
+# Size evictions go down to this fraction of max_bytes, leaving headroom for puts
+EVICT_TO = 0.9
+USAGE_FILENAME = "usage.json"
+
+
+class ResponseCache:
+    """
+    Disk-backed cache with size- and age-based eviction. Sweeps run from
+    put() at most every SWEEP_INTERVAL, or sooner once the running byte
+    count in usage.json passes max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, mode: str = "readwrite",
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+                 max_age: float = DEFAULT_MAX_AGE_DAYS * 86400):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}. Expected one of {', '.join(CACHE_MODES)}")
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @classmethod
+    def from_env(cls, default_dir: Path) -> "ResponseCache":
+        """Build a cache from LLM_CACHE_DIR / LLM_CACHE_MODE / LLM_CACHE_MAX_MB / LLM_CACHE_MAX_AGE_DAYS."""
+        cache_dir = os.getenv("LLM_CACHE_DIR")
+        return cls(
+            Path(cache_dir) if cache_dir else default_dir,
+            mode=os.getenv("LLM_CACHE_MODE", "readwrite"),
+            max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+            max_age=float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)) * 86400,
+        )
+
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt: str, max_tokens: int, temperature: float,
+            seed: Optional[int] = None) -> str:
+        fields = [model, system_prompt, user_prompt, max_tokens, temperature]
+        if seed is not None:
+            # Unseeded requests keep the keys they had before seeds were sent
+            fields.append(seed)
+        payload = json.dumps(
+            fields,
+            ensure_ascii=False, separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    @property
+    def readable(self) -> bool:
+        return self.mode in ("readwrite", "readonly")
+
+    @property
+    def writable(self) -> bool:
+        return self.mode in ("readwrite", "refresh")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry, or None on miss / expiry / non-reading mode."""
+        if not self.readable:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.max_age:
+            if self.writable:
+                path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def put(self, key: str, content: str, usage: Dict[str, Any], model: str):
+        """Store a completion (atomically) and enforce the size/age limits."""
+        if not self.writable:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "model": model,
+            "created_at": time.time(),
+            "content": content,
+            "usage": usage,
+        }
+        raw = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+
+        usage = self._read_usage()
+        if usage is None or time.time() - usage[0] > SWEEP_INTERVAL or usage[1] + len(raw) > self.max_bytes:
+            self.evict()
+        else:
+            # Concurrent writers may lose an increment; the next sweep recounts
+            self._write_usage(usage[0], usage[1] + len(raw))
+
+    def _read_usage(self) -> Optional[Tuple[float, int]]:
+        """(last sweep time, bytes stored as of then plus writes since), if recorded."""
+        try:
+            usage = json.loads((self.cache_dir / USAGE_FILENAME).read_text())
+            return float(usage["swept_at"]), int(usage["bytes"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_usage(self, swept_at: float, total: int):
+        path = self.cache_dir / USAGE_FILENAME
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_text(json.dumps({"swept_at": swept_at, "bytes": total}))
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def evict(self):
+        """Drop expired entries, then, if over max_bytes, the oldest until EVICT_TO of it."""
+        if not self.cache_dir.exists():
+            return
+        now = time.time()
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if now - st.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TO
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= target:
+                    break
+        self._write_usage(now, total)
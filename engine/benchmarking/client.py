@@ -2,13 +2,22 @@
 Shared utilities for the SFP benchmark engine.
 """
 
+import asyncio
 import os
 import sys
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+from engine.benchmarking.cache import ResponseCache
+from engine.benchmarking.streaming import StreamMonitor
+from engine.benchmarking.ratelimit import get_limiter
 
 # ── Paths ───────────────────────────────────────────────────────────────────
 
@@ -25,12 +34,32 @@ PROMPTS_DIR = PKG_DIR / "agents" / "prompts"
 
 RUNS_DIR = ROOT_DIR / "runs"
 CURRICULUM_DIR = ROOT_DIR / "curriculum"
+CACHE_DIR = ROOT_DIR / ".cache" / "llm"
+
+# Overridable so load tests can target a local stub server
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 
 # ── LLM Client ─────────────────────────────────────────────────────────────
 
-def init_client(env_path: Optional[Path] = None) -> OpenAI:
-    """Initialize OpenRouter client."""
+_client_lock = threading.Lock()
+_api_keys: Dict[Optional[Path], str] = {}
+_sync_clients: Dict[str, OpenAI] = {}
+# httpx async pools are bound to the event loop that opened them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+_pool_config = {
+    "max_connections": int(os.getenv("LLM_POOL_MAX_CONNECTIONS", 32)),
+    "max_keepalive_connections": int(os.getenv("LLM_POOL_MAX_KEEPALIVE", 16)),
+    "keepalive_expiry": float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", 60)),
+}
+
+
+def _load_api_key(env_path: Optional[Path] = None) -> str:
+    """Resolve the OpenRouter API key from .env files or engine/key.txt (once per process)."""
+    if env_path in _api_keys:
+        return _api_keys[env_path]
+    
     # Try loading .env from root or engine/
     if env_path:
         load_dotenv(env_path)
@@ -48,13 +77,86 @@ def init_client(env_path: Optional[Path] = None) -> OpenAI:
     if not api_key:
         print("ERROR: Set OPENROUTER_API_KEY in .env")
         sys.exit(1)
-        
-    return OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
+    _api_keys[env_path] = api_key
+    return api_key
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_pool_config["max_connections"],
+        max_keepalive_connections=_pool_config["max_keepalive_connections"],
+        keepalive_expiry=_pool_config["keepalive_expiry"],
     )
 
 
+def configure_pool(max_connections: Optional[int] = None,
+                   max_keepalive_connections: Optional[int] = None,
+                   keepalive_expiry: Optional[float] = None):
+    """Change connection pool limits. Applies to clients created afterwards."""
+    with _client_lock:
+        if max_connections is not None:
+            _pool_config["max_connections"] = max_connections
+        if max_keepalive_connections is not None:
+            _pool_config["max_keepalive_connections"] = max_keepalive_connections
+        if keepalive_expiry is not None:
+            _pool_config["keepalive_expiry"] = keepalive_expiry
+    close_clients()
+
+
+def get_client(env_path: Optional[Path] = None) -> OpenAI:
+    """Process-wide OpenRouter client with a keep-alive connection pool."""
+    api_key = _load_api_key(env_path)
+    with _client_lock:
+        client = _sync_clients.get(api_key)
+        if client is None:
+            client = OpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=api_key,
+                # Retries are owned by the shared rate limiter (see ratelimit.py)
+                max_retries=0,
+                http_client=DefaultHttpxClient(limits=_pool_limits()),
+            )
+            _sync_clients[api_key] = client
+        return client
+
+
+def get_async_client(env_path: Optional[Path] = None) -> AsyncOpenAI:
+    """Shared asyncio client for the running event loop (one pool per loop)."""
+    api_key = _load_api_key(env_path)
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = AsyncOpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=api_key,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(limits=_pool_limits()),
+            )
+            clients[api_key] = client
+        return client
+
+
+def close_clients():
+    """Close pooled sync clients and forget all shared clients."""
+    with _client_lock:
+        for client in _sync_clients.values():
+            client.close()
+        _sync_clients.clear()
+        _async_clients.clear()
+
+
+def init_client(env_path: Optional[Path] = None) -> OpenAI:
+    """Initialize OpenRouter client (shared across agents, see get_client)."""
+    return get_client(env_path)
+
+
+def init_async_client(env_path: Optional[Path] = None) -> AsyncOpenAI:
+    """Initialize an asyncio OpenRouter client (shared per event loop, see get_async_client)."""
+    return get_async_client(env_path)
+
+
 def get_model(override: Optional[str] = None) -> str:
     """Get the model name. CLI override > env var > default."""
     if override:
@@ -62,13 +164,21 @@ def get_model(override: Optional[str] = None) -> str:
     return os.getenv("OPENROUTER_MODEL", "qwen/qwen3-coder-next")
 
 
-def call_agent(client: OpenAI, agent_name: str, system_prompt: str, user_prompt: str, model: str) -> tuple[str, dict]:
-    """Call an agent and return (content, usage).
-    
-    Args:
-        system_prompt: The agent's instruction set (directives, schema, rules).
-        user_prompt:   The dynamic per-request data (goal, learner context).
-    """
+# ── Response Cache ─────────────────────────────────────────────────────────
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache, configured from LLM_CACHE_* env vars."""
+    global _response_cache
+    mode = os.getenv("LLM_CACHE_MODE", "readwrite")
+    if _response_cache is None or _response_cache.mode != mode:
+        _response_cache = ResponseCache.from_env(CACHE_DIR)
+    return _response_cache
+
+
+def _print_header(agent_name: str, model: str, user_prompt: str):
     print(f"\n{'='*60}")
     print(f"  {agent_name.upper()} AGENT")
     print(f"  Model: {model}")
@@ -76,20 +186,61 @@ def call_agent(client: OpenAI, agent_name: str, system_prompt: str, user_prompt:
     print(f"  Context: {user_prompt[:120]}{'...' if len(user_prompt) > 120 else ''}")
     print()
 
-    if os.getenv("MOCK_LLM"):
-        print("  [MOCK] Bypassing OpenAI Call. Returning dummy artifact.")
-        return f"```yaml\nid: mock_{agent_name}\ntitle: Mock title\n```", {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user",   "content": user_prompt},
-        ],
-        temperature=0.0, # Fixed for benchmark stability
-        max_tokens=4096,
-    )
+def _mock_response(agent_name: str, system_prompt: str, user_prompt: str, run_info: Dict[str, Any]) -> tuple[str, dict]:
+    from engine.benchmarking.standin import ArtifactSynthesizer
+    print("  [MOCK] Bypassing OpenAI Call. Returning synthesized artifact.")
+    run_info["cache"] = "bypass"
+    started = time.perf_counter()
+    content = ArtifactSynthesizer().synthesize(agent_name, system_prompt, user_prompt)
+    run_info["latency"] = round(time.perf_counter() - started, 4)
+    return content, {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
 
+def _cached_response(cache: ResponseCache, key: str, run_info: Dict[str, Any]) -> Optional[tuple[str, dict]]:
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    usage_dict = entry.get("usage", {})
+    run_info["cache"] = "hit"
+    print(f"  [CACHE] Hit {key[:12]} ({usage_dict.get('completion_tokens', 0)} tokens saved)")
+    print(f"  Done.\n")
+    return entry["content"], usage_dict
+
+
+def _seed_arg(seed: Optional[int]) -> Dict[str, Any]:
+    return {} if seed is None else {"seed": seed}
+
+
+def _stream_enabled(stream: Optional[bool]) -> bool:
+    if stream is not None:
+        return stream
+    return os.getenv("LLM_STREAM", "").lower() in ("1", "true", "yes")
+
+
+def _finish_stream(cache: ResponseCache, key: str, monitor: StreamMonitor, model: str,
+                   prompt_estimate: int, run_info: Dict[str, Any]) -> tuple[str, dict]:
+    monitor.report(run_info)
+    run_info["latency"] = round(time.perf_counter() - monitor.started, 4)
+    usage_dict = monitor.final_usage(prompt_estimate)
+    if monitor.aborted:
+        # Doomed output is returned for inspection but never cached
+        run_info["cache"] = "skip"
+        print(f"  [STREAM] Aborted early: {monitor.outcome[1]}")
+    else:
+        cache.put(key, monitor.text, usage_dict, model)
+        run_info["cache"] = "miss" if cache.readable else cache.mode
+        if monitor.outcome:
+            print(f"  [STREAM] Stopped early: {monitor.outcome[1]}")
+    ttft = run_info.get("ttft")
+    print(f"  Tokens: {usage_dict['prompt_tokens']} in / {usage_dict['completion_tokens']} out"
+          f"{' (estimated)' if usage_dict.get('estimated') else ''}"
+          f"{f' | TTFT {ttft:.2f}s' if ttft is not None else ''}")
+    print(f"  Done.\n")
+    return monitor.text, usage_dict
+
+
+def _store_response(cache: ResponseCache, key: str, response, model: str, run_info: Dict[str, Any]) -> tuple[str, dict]:
     result = response.choices[0].message.content
     usage = response.usage
     usage_dict = {
@@ -97,7 +248,148 @@ def call_agent(client: OpenAI, agent_name: str, system_prompt: str, user_prompt:
         "completion_tokens": usage.completion_tokens,
         "total_tokens": usage.total_tokens
     }
+    cache.put(key, result, usage_dict, model)
+    run_info["cache"] = "miss" if cache.readable else cache.mode
     print(f"  Tokens: {usage.prompt_tokens} in / {usage.completion_tokens} out")
     print(f"  Done.\n")
     return result, usage_dict
 
+
+def call_agent(client: OpenAI, agent_name: str, system_prompt: str, user_prompt: str, model: str,
+               max_tokens: int = 4096, temperature: float = 0.0, seed: Optional[int] = None,
+               cache: Optional[ResponseCache] = None,
+               run_info: Optional[Dict[str, Any]] = None,
+               stream: Optional[bool] = None) -> tuple[str, dict]:
+    """Call an agent and return (content, usage).
+    
+    Args:
+        system_prompt: The agent's instruction set (directives, schema, rules).
+        user_prompt:   The dynamic per-request data (goal, learner context).
+        seed:          Sampling seed, sent only when set.
+        cache:         Response cache to consult (defaults to the process-wide one).
+        run_info:      Optional dict filled with call details (cache status, TTFT,
+                       latency of the model call itself).
+        stream:        Stream tokens and cut doomed/finished output early
+                       (defaults to the LLM_STREAM env var).
+    """
+    if run_info is None:
+        run_info = {}
+    _print_header(agent_name, model, user_prompt)
+
+    if os.getenv("MOCK_LLM"):
+        return _mock_response(agent_name, system_prompt, user_prompt, run_info)
+
+    cache = cache or get_response_cache()
+    key = cache.key(model, system_prompt, user_prompt, max_tokens, temperature, seed)
+    cached = _cached_response(cache, key, run_info)
+    if cached:
+        return cached
+
+    # Reserve the worst case against the TPM budget; settled after the call
+    limiter = get_limiter(model)
+    est_tokens = (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
+
+    if _stream_enabled(stream):
+        monitor = StreamMonitor(agent_name)
+        # The concurrency slot stays taken until the stream is drained and closed
+        with limiter.streaming(lambda: client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user",   "content": user_prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **_seed_arg(seed),
+            stream=True,
+            stream_options={"include_usage": True},
+        ), est_tokens, run_info) as response:
+            try:
+                for chunk in response:
+                    if not monitor.feed(chunk):
+                        break
+            finally:
+                response.close()
+        result = _finish_stream(cache, key, monitor, model, (len(system_prompt) + len(user_prompt)) // 4, run_info)
+        limiter.settle(est_tokens, result[1]["total_tokens"])
+        return result
+
+    started = time.perf_counter()
+    response = limiter.call(lambda: client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user",   "content": user_prompt},
+        ],
+        temperature=temperature, # Fixed for benchmark stability
+        max_tokens=max_tokens,
+        **_seed_arg(seed),
+    ), est_tokens, run_info)
+    run_info["latency"] = round(time.perf_counter() - started, 4)
+    result = _store_response(cache, key, response, model, run_info)
+    limiter.settle(est_tokens, result[1]["total_tokens"])
+    return result
+
+
+async def acall_agent(client: AsyncOpenAI, agent_name: str, system_prompt: str, user_prompt: str, model: str,
+                      max_tokens: int = 4096, temperature: float = 0.0, seed: Optional[int] = None,
+                      cache: Optional[ResponseCache] = None,
+                      run_info: Optional[Dict[str, Any]] = None,
+                      stream: Optional[bool] = None) -> tuple[str, dict]:
+    """Async counterpart of call_agent, sharing its cache and mock behaviour."""
+    if run_info is None:
+        run_info = {}
+    _print_header(agent_name, model, user_prompt)
+
+    if os.getenv("MOCK_LLM"):
+        return _mock_response(agent_name, system_prompt, user_prompt, run_info)
+
+    cache = cache or get_response_cache()
+    key = cache.key(model, system_prompt, user_prompt, max_tokens, temperature, seed)
+    cached = _cached_response(cache, key, run_info)
+    if cached:
+        return cached
+
+    # Reserve the worst case against the TPM budget; settled after the call
+    limiter = get_limiter(model)
+    est_tokens = (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
+
+    if _stream_enabled(stream):
+        monitor = StreamMonitor(agent_name)
+        async with limiter.astreaming(lambda: client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user",   "content": user_prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **_seed_arg(seed),
+            stream=True,
+            stream_options={"include_usage": True},
+        ), est_tokens, run_info) as response:
+            try:
+                async for chunk in response:
+                    if not monitor.feed(chunk):
+                        break
+            finally:
+                await response.close()
+        result = _finish_stream(cache, key, monitor, model, (len(system_prompt) + len(user_prompt)) // 4, run_info)
+        limiter.settle(est_tokens, result[1]["total_tokens"])
+        return result
+
+    started = time.perf_counter()
+    response = await limiter.acall(lambda: client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user",   "content": user_prompt},
+        ],
+        temperature=temperature, # Fixed for benchmark stability
+        max_tokens=max_tokens,
+        **_seed_arg(seed),
+    ), est_tokens, run_info)
+    run_info["latency"] = round(time.perf_counter() - started, 4)
+    result = _store_response(cache, key, response, model, run_info)
+    limiter.settle(est_tokens, result[1]["total_tokens"])
+    return result
@@ -0,0 +1,257 @@
+"""
+Rate limiting and retry scheduling for LLM calls.
+
+Each model gets a process-wide limiter combining a requests-per-minute and a
+tokens-per-minute token bucket with a concurrency cap. Transient failures
+(429s, 5xx, timeouts, dropped connections) are retried with jittered
+exponential backoff, honouring `Retry-After` when the provider sends it.
+The same limiter serves threads (sync calls) and asyncio tasks.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class TokenBucket:
+    """
+    Continuous-refill bucket. Reservations may drive the level negative, which
+    queues callers fairly: each one waits for the deficit it created.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` and return how many seconds the caller must wait first."""
+        with self._lock:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+            return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float):
+        """Give back an over-reservation (e.g. estimated vs. actual tokens)."""
+        if amount <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", 5)),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0)),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", 60.0)),
+        )
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            return min(self.max_delay, max(retry_after, backoff))
+        return backoff
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ModelLimiter:
+    """RPM + TPM buckets and a concurrency cap for one model."""
+
+    def __init__(self, model: str, rpm: float = 0, tpm: float = 0, max_concurrency: int = 0,
+                 policy: Optional[RetryPolicy] = None):
+        self.model = model
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.policy = policy or RetryPolicy()
+        self.in_flight = 0
+        self._slots = threading.Condition()
+
+    def _reserve(self, est_tokens: int) -> float:
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(est_tokens))
+        return wait
+
+    def settle(self, est_tokens: int, actual_tokens: Optional[int]):
+        """Refund the TPM bucket once real usage is known."""
+        if self.tokens and actual_tokens is not None:
+            self.tokens.refund(est_tokens - actual_tokens)
+
+    def _refund_attempt(self, est_tokens: int):
+        # A failed attempt consumed a request but not its token estimate
+        if self.tokens:
+            self.tokens.refund(est_tokens)
+
+    def _try_slot(self) -> bool:
+        with self._slots:
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                return False
+            self.in_flight += 1
+            return True
+
+    def _release_slot(self):
+        with self._slots:
+            self.in_flight -= 1
+            self._slots.notify()
+
+    def call(self, fn: Callable[[], Any], est_tokens: int, run_info: Optional[Dict[str, Any]] = None,
+             hold_slot: bool = False) -> Any:
+        """
+        Run `fn` under the limits, retrying transient failures. With
+        `hold_slot` the concurrency slot stays taken after success; the caller
+        must release it (see `streaming`).
+        """
+        run_info = run_info if run_info is not None else {}
+        run_info.setdefault("retries", 0)
+        for attempt in range(self.policy.max_retries + 1):
+            time.sleep(self._reserve(est_tokens))
+            with self._slots:
+                while not self._try_slot():
+                    self._slots.wait()
+            succeeded = False
+            try:
+                result = fn()
+                succeeded = True
+                return result
+            except Exception as e:
+                self._refund_attempt(est_tokens)
+                if not is_retryable(e) or attempt == self.policy.max_retries:
+                    raise
+                delay = self.policy.delay(attempt, retry_after(e))
+                run_info["retries"] += 1
+                print(f"  [RETRY] {type(e).__name__}; attempt {attempt + 2} in {delay:.1f}s")
+            finally:
+                if not (succeeded and hold_slot):
+                    self._release_slot()
+            time.sleep(delay)
+
+    @contextmanager
+    def streaming(self, fn: Callable[[], Any], est_tokens: int, run_info: Optional[Dict[str, Any]] = None):
+        """`call` for streamed responses: the slot is held until the block has consumed the stream."""
+        response = self.call(fn, est_tokens, run_info, hold_slot=True)
+        try:
+            yield response
+        finally:
+            self._release_slot()
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], est_tokens: int,
+                    run_info: Optional[Dict[str, Any]] = None, hold_slot: bool = False) -> Any:
+        """Async variant of `call`; shares buckets and slots with sync callers."""
+        run_info = run_info if run_info is not None else {}
+        run_info.setdefault("retries", 0)
+        for attempt in range(self.policy.max_retries + 1):
+            await asyncio.sleep(self._reserve(est_tokens))
+            while not self._try_slot():
+                await asyncio.sleep(0.05)
+            succeeded = False
+            try:
+                result = await fn()
+                succeeded = True
+                return result
+            except Exception as e:
+                self._refund_attempt(est_tokens)
+                if not is_retryable(e) or attempt == self.policy.max_retries:
+                    raise
+                delay = self.policy.delay(attempt, retry_after(e))
+                run_info["retries"] += 1
+                print(f"  [RETRY] {type(e).__name__}; attempt {attempt + 2} in {delay:.1f}s")
+            finally:
+                if not (succeeded and hold_slot):
+                    self._release_slot()
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def astreaming(self, fn: Callable[[], Awaitable[Any]], est_tokens: int,
+                         run_info: Optional[Dict[str, Any]] = None):
+        """Async variant of `streaming`."""
+        response = await self.acall(fn, est_tokens, run_info, hold_slot=True)
+        try:
+            yield response
+        finally:
+            self._release_slot()
+
+
+_limiters: Dict[str, ModelLimiter] = {}
+_limiters_lock = threading.Lock()
+_overrides: Dict[str, Dict[str, float]] = {}
+
+
+def configure_limits(model: str, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                     max_concurrency: Optional[int] = None):
+    """Override env defaults for one model. Takes effect for new limiters."""
+    with _limiters_lock:
+        override = _overrides.setdefault(model, {})
+        if rpm is not None:
+            override["rpm"] = rpm
+        if tpm is not None:
+            override["tpm"] = tpm
+        if max_concurrency is not None:
+            override["max_concurrency"] = max_concurrency
+        _limiters.pop(model, None)
+
+
+def get_limiter(model: str) -> ModelLimiter:
+    """Process-wide limiter for a model (LLM_RPM / LLM_TPM / LLM_MAX_CONCURRENCY)."""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            override = _overrides.get(model, {})
+            limiter = ModelLimiter(
+                model,
+                rpm=override.get("rpm", float(os.getenv("LLM_RPM", 120))),
+                tpm=override.get("tpm", float(os.getenv("LLM_TPM", 0))),
+                max_concurrency=int(override.get("max_concurrency", os.getenv("LLM_MAX_CONCURRENCY", 8))),
+                policy=RetryPolicy.from_env(),
+            )
+            _limiters[model] = limiter
+        return limiter
@@ -0,0 +1,495 @@
+"""
+Offline stand-in for the OpenRouter API.
+
+A local OpenAI-compatible `/chat/completions` endpoint for load tests and
+benchmarks that must not touch the network:
+
+    record:  forward each request upstream and save the response as a cassette
+    replay:  serve cassettes only (a miss is a 404)
+    synth:   synthesize a schema-valid artifact from engine/agents/templates/*.yaml
+    auto:    replay when a cassette exists, synthesize otherwise
+
+Cassettes are keyed like the response cache (model, prompts, max_tokens,
+temperature), so a recorded run replays byte-for-byte. Latency and reported
+token counts are drawn from configurable distributions, seeded per request,
+which keeps load tests deterministic. Point the runner at it with
+OPENROUTER_BASE_URL=http://127.0.0.1:<port>/v1.
+"""
+
+import ast
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import yaml
+
+from engine.benchmarking.cache import ResponseCache
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "agents" / "templates"
+STANDIN_MODES = ("record", "replay", "synth", "auto")
+
+ASSIGNMENT_VERBS = ["identify", "trace", "construct", "transform", "apply"]
+
+
+class Distribution:
+    """Normal distribution clipped at zero, written as "MEAN" or "MEAN:SD"."""
+
+    def __init__(self, mean: float, sd: float = 0.0):
+        self.mean = mean
+        self.sd = sd
+
+    @classmethod
+    def parse(cls, spec: str) -> "Distribution":
+        mean, _, sd = str(spec).partition(":")
+        return cls(float(mean), float(sd or 0))
+
+    def sample(self, rng: random.Random) -> float:
+        if not self.sd:
+            return max(0.0, self.mean)
+        return max(0.0, rng.gauss(self.mean, self.sd))
+
+    def __repr__(self):
+        return f"{self.mean:g}:{self.sd:g}"
+
+
+def _slug(text: str, limit: int = 4) -> str:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    stop = {"i", "want", "to", "learn", "how", "the", "a", "an", "of", "and", "using", "with", "in", "for"}
+    picked = [w for w in words if w not in stop][:limit] or ["topic"]
+    return "_".join(picked)
+
+
+def _section(text: str, header: str) -> Optional[str]:
+    """Body of a `# header` section, up to the next top-level header."""
+    match = re.search(rf"^# {re.escape(header)}[^\n]*\n(.*?)(?=^# |\Z)", text, re.MULTILINE | re.DOTALL)
+    return match.group(1) if match else None
+
+
+def _bullets(text: Optional[str]) -> List[str]:
+    return re.findall(r"^\s*- (\S+)\s*$", text or "", re.MULTILINE)
+
+
+def _line_value(text: str, label: str) -> Optional[str]:
+    match = re.search(rf"^(?:- \*\*)?{re.escape(label)}(?:\*\*)?:\s*(.+)$", text, re.MULTILINE)
+    return match.group(1).strip() if match else None
+
+
+def _fenced(data: Dict[str, Any]) -> str:
+    return "```yaml\n" + yaml.safe_dump(data, sort_keys=False, allow_unicode=True) + "```\n"
+
+
+class ArtifactSynthesizer:
+    """
+    Builds plausible, validator-passing artifacts from the prompts the agents
+    send. Key order and nesting follow the YAML templates the agents hand the
+    model, so synthesized output exercises the same parsing paths as real
+    output.
+    """
+
+    def __init__(self, templates_dir: Path = TEMPLATES_DIR):
+        self.templates_dir = Path(templates_dir)
+        self._templates: Dict[str, Dict[str, Any]] = {}
+
+    def template(self, name: str) -> Dict[str, Any]:
+        if name not in self._templates:
+            path = self.templates_dir / f"{name}.yaml"
+            data = yaml.safe_load(path.read_text()) if path.exists() else None
+            self._templates[name] = data if isinstance(data, dict) else {}
+        return self._templates[name]
+
+    def _shaped(self, name: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Template keys first (in template order), then any extras."""
+        shape = self.template(name)
+        ordered = {k: values[k] for k in shape if k in values}
+        ordered.update({k: v for k, v in values.items() if k not in ordered})
+        return ordered
+
+    @staticmethod
+    def detect(system_prompt: str, user_prompt: str) -> str:
+        """Infer the artifact type (agent name) from the rendered prompts."""
+        if user_prompt.startswith("Assignment ID:"):
+            return "assignment"
+        if "# Module Proposal" in system_prompt or "Select the implementation target" in system_prompt:
+            return "module"
+        if "# Source Track Artifact" in system_prompt:
+            return "campaign"
+        if "# Project Objective" in user_prompt:
+            return "track"
+        return "unknown"
+
+    def synthesize(self, artifact_type: str, system_prompt: str, user_prompt: str) -> str:
+        builder = getattr(self, f"_{artifact_type}", None)
+        if builder is None:
+            return "SKIP: stand-in server cannot synthesize this request.\n"
+        return builder(system_prompt, user_prompt)
+
+    def _track(self, system_prompt: str, user_prompt: str) -> str:
+        goal = _line_value(user_prompt, "Goal") or "Unspecified goal"
+        slug = _slug(goal)
+        covered = _bullets(_section(user_prompt, "Existing Registry Coverage"))
+        gaps = _bullets(_section(user_prompt, "Uncovered Gaps"))
+        if not gaps and not covered:
+            gaps = [f"computing.fundamentals.{slug}.construct"]
+
+        proposals = []
+        previous: List[str] = []
+        for comp in gaps:
+            parts = comp.split(".")
+            module_id = ".".join(parts[:3]) if len(parts) >= 4 else comp
+            proposals.append({
+                "id": module_id,
+                "title": module_id.rsplit(".", 1)[-1].replace("_", " ").title(),
+                "description": f"Closes the gap {comp}.",
+                "justification": "No existing module produces this competency.",
+                "required_competencies": previous,
+                "produced_competencies": [comp],
+            })
+            previous = [comp]
+
+        modules = covered + [p["id"] for p in proposals]
+        entry_keys = list((self.template("track").get("campaigns") or [{}])[0])
+        campaigns = []
+        for i in range(0, len(modules), 3):
+            n = i // 3 + 1
+            entry = {
+                "id": f"c{n:02d}_{slug}",
+                "title": f"Part {n}: {goal[:40]}",
+                "description": f"Modules {i + 1}-{min(i + 3, len(modules))} of the path.",
+                "modules": modules[i:i + 3],
+            }
+            campaigns.append({k: entry[k] for k in entry_keys if k in entry} or entry)
+
+        return _fenced(self._shaped("track", {
+            "id": slug,
+            "title": goal[:60],
+            "description": f"Synthesized track for: {goal}",
+            "goal": goal,
+            "domains": sorted({m.split(".")[0] for m in modules}) or ["computing"],
+            "campaigns": campaigns,
+            "proposed_modules": proposals,
+        }))
+
+    def _campaign(self, system_prompt: str, user_prompt: str) -> str:
+        target = None
+        block = _section(system_prompt, "Target Campaign")
+        if block:
+            try:
+                target = yaml.safe_load(block)
+            except yaml.YAMLError:
+                target = None
+        if not isinstance(target, dict):
+            try:
+                track = yaml.safe_load(user_prompt)
+            except yaml.YAMLError:
+                track = None
+            campaigns = track.get("campaigns") if isinstance(track, dict) else None
+            target = campaigns[0] if campaigns and isinstance(campaigns[0], dict) else {}
+
+        campaign_id = target.get("id") or "c01_synthesized"
+        title = target.get("title") or campaign_id.replace("_", " ").title()
+        module_ids = [m for m in target.get("modules") or [] if isinstance(m, str)]
+        return _fenced(self._shaped("campaign", {
+            "name": title,
+            "id": campaign_id,
+            "title": title,
+            "description": target.get("description") or f"Synthesized campaign {campaign_id}.",
+            "sub_goal": target.get("description") or title,
+            "modules": [{"id": m, "description": f"Work through {m}."} for m in module_ids],
+            "invariants": [f"Each module in {campaign_id} is completed in order."],
+        }))
+
+    def _module(self, system_prompt: str, user_prompt: str) -> str:
+        def literal_list(label):
+            value = _line_value(system_prompt, label)
+            try:
+                parsed = ast.literal_eval(value) if value else []
+            except (ValueError, SyntaxError):
+                parsed = []
+            return [str(c) for c in parsed] if isinstance(parsed, list) else []
+
+        module_id = _line_value(system_prompt, "ID")
+        if not module_id:
+            match = re.search(r"implementation target: \*\*(.+?)\*\*", system_prompt)
+            module_id = match.group(1) if match and match.group(1) != "NEXT_AVAILABLE" else "computing.fundamentals.synthesized"
+        produces = literal_list("Produced") or [f"{module_id}.apply"]
+        concept = module_id.rsplit(".", 1)[-1]
+        return _fenced(self._shaped("module", {
+            "id": module_id,
+            "title": _line_value(system_prompt, "Title") or concept.replace("_", " ").title(),
+            "description": _line_value(system_prompt, "Description") or f"Synthesized module {module_id}.",
+            "version": 1,
+            "requires": literal_list("Prerequisites"),
+            "produces": produces,
+            "assignments": [f"a{i:02d}_{verb}_{concept}" for i, verb in enumerate(ASSIGNMENT_VERBS, 1)],
+        }))
+
+    def _assignment(self, system_prompt: str, user_prompt: str) -> str:
+        assignment_id = _line_value(user_prompt, "Assignment ID") or "a01_synthesized"
+        goal = _line_value(user_prompt, "Goal") or "the module goal"
+        return (
+            f"# Mission: {assignment_id}\n\n"
+            f"## Context\nThis step builds toward: {goal}\n\n"
+            f"## Challenge\nImplement `solve()` for {assignment_id}.\n\n"
+            "## Requirements\n- `solve()` returns the expected value.\n\n"
+            "## Invariants\n- Inputs are not mutated.\n\n"
+            "## Verification\n```python\nfrom solution import solve\n\nassert solve() is not None\n```\n\n"
+            "## Reflection\nWhich assumption did the verification script rely on?\n"
+        )
+
+
+class CassetteStore:
+    """Recorded responses, one JSON file per request key."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, request: Dict[str, Any], content: str, usage: Dict[str, Any], latency: float):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "recorded_at": time.time(),
+            "request": request,
+            "content": content,
+            "usage": usage,
+            "latency": latency,
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False, indent=1))
+        os.replace(tmp, path)
+
+
+class StandinBackend:
+    """Resolves one chat request to (content, usage, simulated timing)."""
+
+    def __init__(self, mode: str = "auto", cassette_dir: Optional[Path] = None,
+                 upstream: Optional[str] = None,
+                 latency: Distribution = Distribution(0),
+                 tokens_per_second: float = 0.0,
+                 completion_tokens: Optional[Distribution] = None,
+                 error_rate: float = 0.0, seed: int = 0,
+                 synthesizer: Optional[ArtifactSynthesizer] = None):
+        if mode not in STANDIN_MODES:
+            raise ValueError(f"Unknown stand-in mode: {mode}. Expected one of {', '.join(STANDIN_MODES)}")
+        if mode in ("record", "replay") and cassette_dir is None:
+            raise ValueError(f"Mode '{mode}' needs a cassette directory")
+        if mode == "record" and not upstream:
+            raise ValueError("Mode 'record' needs an upstream base URL")
+        self.mode = mode
+        self.cassettes = CassetteStore(cassette_dir) if cassette_dir else None
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.seed = seed
+        self.synthesizer = synthesizer or ArtifactSynthesizer()
+        self._http = httpx.Client(timeout=600) if mode == "record" else None
+
+    @staticmethod
+    def request_key(body: Dict[str, Any]) -> str:
+        system, user = _prompts(body)
+        return ResponseCache.key(body.get("model", ""), system, user,
+                                 body.get("max_tokens", 4096), body.get("temperature", 0.0), body.get("seed"))
+
+    def rng(self, key: str) -> random.Random:
+        return random.Random(f"{self.seed}:{key}")
+
+    def should_fail(self, rng: random.Random) -> bool:
+        return self.error_rate > 0 and rng.random() < self.error_rate
+
+    def complete(self, body: Dict[str, Any], authorization: Optional[str]) -> Optional[Tuple[str, Dict[str, int]]]:
+        """Return (content, usage), or None when replay has no cassette."""
+        key = self.request_key(body)
+        system, user = _prompts(body)
+
+        if self.mode == "record":
+            return self._record(key, body, authorization)
+
+        if self.mode in ("replay", "auto") and self.cassettes:
+            entry = self.cassettes.get(key)
+            if entry:
+                return entry["content"], entry["usage"]
+        if self.mode == "replay":
+            return None
+
+        artifact_type = self.synthesizer.detect(system, user)
+        content = self.synthesizer.synthesize(artifact_type, system, user)
+        prompt_tokens = (len(system) + len(user)) // 4
+        if self.completion_tokens:
+            completion = int(self.completion_tokens.sample(self.rng(key + ":tokens")))
+        else:
+            completion = max(1, len(content) // 4)
+        return content, {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion,
+            "total_tokens": prompt_tokens + completion,
+        }
+
+    def _record(self, key: str, body: Dict[str, Any], authorization: Optional[str]) -> Tuple[str, Dict[str, int]]:
+        # Always record the non-streamed form; the server re-streams it if asked
+        upstream_body = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+        headers = {"Authorization": authorization} if authorization else {}
+        started = time.perf_counter()
+        response = self._http.post(f"{self.upstream}/chat/completions", json=upstream_body, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        latency = time.perf_counter() - started
+        content = data["choices"][0]["message"]["content"]
+        usage = {k: data.get("usage", {}).get(k, 0) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
+        self.cassettes.put(key, upstream_body, content, usage, latency)
+        return content, usage
+
+    def delays(self, key: str, completion_tokens: int) -> Tuple[float, float]:
+        """(time to first token, generation time) in seconds."""
+        ttft = self.latency.sample(self.rng(key + ":latency")) / 1000.0
+        generation = completion_tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+        return ttft, generation
+
+
+def _prompts(body: Dict[str, Any]) -> Tuple[str, str]:
+    system, user = "", ""
+    for message in body.get("messages") or []:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        if message.get("role") == "system":
+            system = content
+        elif message.get("role") == "user":
+            user = content
+    return system, user
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    backend: StandinBackend = None
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/health"):
+            self._json(200, {"status": "ok", "mode": self.backend.mode})
+        else:
+            self._json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        backend = self.backend
+        key = backend.request_key(body)
+
+        if backend.should_fail(backend.rng(key + f":{time.monotonic_ns()}")):
+            self._json(429, {"error": {"message": "Injected rate limit", "type": "rate_limit"}},
+                       headers={"Retry-After": "0.1"})
+            return
+
+        try:
+            result = backend.complete(body, self.headers.get("Authorization"))
+        except httpx.HTTPError as e:
+            self._json(502, {"error": {"message": f"Upstream failed: {e}"}})
+            return
+        if result is None:
+            self._json(404, {"error": {"message": f"No cassette for request {key[:12]}", "type": "cassette_miss"}})
+            return
+
+        content, usage = result
+        ttft, generation = backend.delays(key, usage.get("completion_tokens", 0))
+        completion_id = f"chatcmpl-standin-{key[:16]}"
+        model = body.get("model", "standin")
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            self._stream(completion_id, model, content, usage if include_usage else None, ttft, generation)
+            return
+
+        time.sleep(ttft + generation)
+        self._json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, completion_id: str, model: str, content: str, usage: Optional[Dict[str, int]],
+                ttft: float, generation: float):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(choices, extra=None):
+            chunk = {"id": completion_id, "object": "chat.completion.chunk",
+                     "created": int(time.time()), "model": model, "choices": choices}
+            chunk.update(extra or {})
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        pieces = re.findall(r"\S*\s*", content)[:-1] or [content]
+        per_piece = generation / len(pieces)
+        time.sleep(ttft)
+        try:
+            for piece in pieces:
+                send([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+                if per_piece:
+                    time.sleep(per_piece)
+            send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if usage:
+                send([], {"usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cut the stream early (see streaming.StreamMonitor)
+            pass
+
+
+def make_server(backend: StandinBackend, host: str = "127.0.0.1", port: int = 8799,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """Build (but do not start) a threaded stand-in server."""
+    handler = type("StandinHandler", (_Handler,), {"backend": backend, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(backend: StandinBackend, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve in a daemon thread; returns the server and its /v1 base URL."""
+    server = make_server(backend, host, port, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
@@ -0,0 +1,80 @@
+"""
+Cold-start budget for the CLI entry points.
+
+Each entry point is imported in a fresh interpreter under `python -X importtime`.
+A check fails when the median cumulative import time of the entry module
+exceeds its budget, or when it pulls in a module that only generating
+commands should load (the LLM client stack, pydantic, rich).
+Interpreter and site start-up are excluded, so numbers are comparable
+across environments with different site-packages.
+"""
+
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# Entry module -> budget in ms (cumulative import time of that module)
+ENTRY_POINTS = {
+    "engine.agents.runner": 150.0,
+    "engine.cli.__main__": 50.0,
+}
+
+# Top-level packages that must stay lazy at import time
+LAZY_PACKAGES = ("openai", "httpx", "jinja2", "pydantic", "dotenv", "rich")
+
+
+def _parse_importtime(stderr: str):
+    """Yield (package name, cumulative µs) from -X importtime output."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        yield parts[2].strip(), int(parts[1])
+
+
+def measure(module: str, runs: int = 5, python: Optional[str] = None) -> Dict[str, Any]:
+    """Import `module` in `runs` fresh interpreters (after one warm-up for bytecode)."""
+    python = python or sys.executable
+    samples: List[float] = []
+    loaded = set()
+    for n in range(runs + 1):
+        proc = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+        cumulative = None
+        seen = set()
+        for name, us in _parse_importtime(proc.stderr):
+            if name == "site":
+                # Everything so far was interpreter/site start-up, not ours
+                seen.clear()
+                continue
+            seen.add(name.split(".")[0])
+            if name == module:
+                cumulative = us
+        loaded |= seen
+        if n and cumulative is not None:
+            samples.append(cumulative / 1000)
+    return {
+        "module": module,
+        "runs": [round(s, 1) for s in samples],
+        "median_ms": round(statistics.median(samples), 1) if samples else None,
+        "lazy_violations": sorted(p for p in LAZY_PACKAGES if p in loaded),
+    }
+
+
+def check(results: List[Dict[str, Any]], budgets: Dict[str, float]) -> List[str]:
+    """Violation messages for results over budget or importing lazy packages."""
+    violations = []
+    for r in results:
+        budget = budgets.get(r["module"])
+        if budget is not None and r["median_ms"] is not None and r["median_ms"] > budget:
+            violations.append(f"{r['module']}: {r['median_ms']:.1f}ms import (budget {budget:g}ms)")
+        if r["lazy_violations"]:
+            violations.append(f"{r['module']}: imports {', '.join(r['lazy_violations'])} at startup")
+    return violations
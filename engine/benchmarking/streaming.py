@@ -0,0 +1,205 @@
+"""
+Streaming support for LLM calls.
+
+Consumes completion deltas as they arrive, extracts the fenced artifact body
+incrementally and runs cheap structural checks while the stream is still in
+flight, so doomed or already-finished generations can be cut short.
+"""
+
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+YAML_ARTIFACTS = ("track", "campaign", "module")
+
+REQUIRED_KEYS = {
+    "module": ["id", "title", "assignments", "requires", "produces"],
+    "campaign": ["id", "title", "modules"],
+    "track": ["id", "title", "campaigns"],
+}
+
+MISSION_HEADERS = ["Context", "Challenge", "Requirements", "Invariants", "Verification", "Reflection"]
+
+_FENCE_OPEN = re.compile(r"```(\w+)?[ \t]*\n")
+_YAML_LINE = re.compile(r"^(#|---|[A-Za-z_][\w\-]*\s*:)")
+_TOP_LEVEL_KEY = re.compile(r"^([A-Za-z_][\w\-]*)\s*:", re.MULTILINE)
+
+
+class FenceExtractor:
+    """
+    Incrementally tracks the first fenced code block in a stream, mirroring
+    the runner's `_clean_code_fences` (first fence wins, else the raw text).
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.language: Optional[str] = None
+        self._body_start: Optional[int] = None
+        self._body_end: Optional[int] = None
+
+    def feed(self, chunk: str):
+        self.text += chunk
+        if self._body_start is None:
+            # Rescan only the new tail plus enough overlap for a split "```lang\n"
+            match = _FENCE_OPEN.search(self.text, max(0, len(self.text) - len(chunk) - 32))
+            if match:
+                self.language = match.group(1)
+                self._body_start = match.end()
+        if self._body_start is not None and self._body_end is None:
+            # Only the newly arrived tail (plus a small overlap) can close the fence
+            search_from = max(self._body_start, len(self.text) - len(chunk) - 3)
+            end = self.text.find("```", search_from)
+            if end != -1:
+                self._body_end = end
+
+    @property
+    def opened(self) -> bool:
+        return self._body_start is not None
+
+    @property
+    def closed(self) -> bool:
+        return self._body_end is not None
+
+    @property
+    def body(self) -> str:
+        """Best current view of the artifact body."""
+        if self._body_start is None:
+            return self.text
+        return self.text[self._body_start:self._body_end]
+
+
+# A check returns None to continue, or (action, reason) where action is
+# "stop" (the useful output is complete) or "abort" (the output is doomed).
+StreamCheck = Callable[[FenceExtractor], Optional[Tuple[str, str]]]
+
+
+def _refusal(fx: FenceExtractor) -> Optional[Tuple[str, str]]:
+    head = fx.text[:256].lstrip()
+    if head.startswith(("REFUSE:", "SKIP:")) and "\n" in head:
+        return ("stop", head.split(":", 1)[0].lower())
+    return None
+
+
+def _yaml_fence_closed(artifact_type: str) -> StreamCheck:
+    def check(fx: FenceExtractor) -> Optional[Tuple[str, str]]:
+        # Everything after the first closing fence is discarded by the cleaner anyway
+        if not fx.closed:
+            return None
+        missing = missing_keys(artifact_type, fx.body)
+        if missing:
+            return ("abort", f"Missing keys: {', '.join(missing)}")
+        return ("stop", "fence closed")
+    return check
+
+
+def _yaml_shape() -> StreamCheck:
+    judged = False
+
+    def check(fx: FenceExtractor) -> Optional[Tuple[str, str]]:
+        # Prose before a fence is fine; judge only the fenced body's first full line
+        nonlocal judged
+        if judged or not fx.opened:
+            return None
+        body = fx.body.lstrip()
+        if "\n" not in body:
+            return None
+        judged = True
+        first = body.split("\n", 1)[0].strip()
+        if not _YAML_LINE.match(first):
+            return ("abort", f"artifact does not start as YAML: {first[:60]!r}")
+        return None
+    return check
+
+
+def _mission_headers(budget: int = 2500) -> StreamCheck:
+    judged = False
+
+    def check(fx: FenceExtractor) -> Optional[Tuple[str, str]]:
+        # Judged once, as soon as the output crosses the budget
+        nonlocal judged
+        if judged or len(fx.text) < budget:
+            return None
+        judged = True
+        lowered = fx.text.lower()
+        if not any(h.lower() in lowered for h in MISSION_HEADERS):
+            return ("abort", f"no mission section headers within {budget} chars")
+        return None
+    return check
+
+
+def structural_checks(artifact_type: str) -> List[StreamCheck]:
+    """Cheap in-flight checks for an artifact type (agent name)."""
+    checks: List[StreamCheck] = [_refusal]
+    if artifact_type in YAML_ARTIFACTS:
+        checks += [_yaml_shape(), _yaml_fence_closed(artifact_type)]
+    elif artifact_type == "assignment":
+        checks.append(_mission_headers())
+    return checks
+
+
+def missing_keys(artifact_type: str, body: str) -> List[str]:
+    """Required top-level keys absent from a (possibly partial) YAML body."""
+    present = set(_TOP_LEVEL_KEY.findall(body))
+    return [k for k in REQUIRED_KEYS.get(artifact_type, []) if k not in present]
+
+
+class StreamMonitor:
+    """Feeds deltas through the extractor and checks; records timing."""
+
+    def __init__(self, artifact_type: str, checks: Optional[List[StreamCheck]] = None):
+        self.artifact_type = artifact_type
+        self.extractor = FenceExtractor()
+        self.checks = structural_checks(artifact_type) if checks is None else checks
+        self.started = time.perf_counter()
+        self.ttft: Optional[float] = None
+        self.outcome: Optional[Tuple[str, str]] = None
+        self.usage: Optional[Dict[str, int]] = None
+
+    def feed(self, chunk) -> bool:
+        """Consume one streamed chunk. Returns False when the stream should be cut."""
+        if getattr(chunk, "usage", None):
+            self.usage = {
+                "prompt_tokens": chunk.usage.prompt_tokens,
+                "completion_tokens": chunk.usage.completion_tokens,
+                "total_tokens": chunk.usage.total_tokens,
+            }
+        if not getattr(chunk, "choices", None):
+            return True
+        delta = chunk.choices[0].delta.content or ""
+        if not delta:
+            return True
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.started
+        self.extractor.feed(delta)
+        for check in self.checks:
+            outcome = check(self.extractor)
+            if outcome:
+                self.outcome = outcome
+                return False
+        return True
+
+    @property
+    def text(self) -> str:
+        return self.extractor.text
+
+    @property
+    def aborted(self) -> bool:
+        return bool(self.outcome and self.outcome[0] == "abort")
+
+    def final_usage(self, prompt_estimate: int) -> Dict[str, int]:
+        """Provider usage if the stream reported it, else a local estimate."""
+        if self.usage:
+            return self.usage
+        completion = max(1, len(self.text) // 4) if self.text else 0
+        return {
+            "prompt_tokens": prompt_estimate,
+            "completion_tokens": completion,
+            "total_tokens": prompt_estimate + completion,
+            "estimated": True,
+        }
+
+    def report(self, run_info: Dict) -> None:
+        run_info["stream"] = True
+        run_info["ttft"] = round(self.ttft, 4) if self.ttft is not None else None
+        if self.outcome:
+            run_info["stream_" + ("aborted" if self.aborted else "stopped")] = self.outcome[1]
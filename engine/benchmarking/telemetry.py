@@ -0,0 +1,151 @@
+"""
+Structured telemetry for generation runs.
+
+Every runner command, agent render, LLM call, validation and write emits a
+span: one JSON line appended to the telemetry file with its duration and
+whatever attributes the step knows (agent, prompt version, model, tokens,
+cache status, retries, TTFT). Spans nest through a context variable, so an
+LLM span points at the command that issued it.
+
+The file defaults to runs/telemetry.jsonl and can be moved (or disabled with
+"off") through ASCENT_TELEMETRY.
+"""
+
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+DEFAULT_TELEMETRY_PATH = ROOT_DIR / "runs" / "telemetry.jsonl"
+
+# One ID per process so spans from a single runner invocation group together
+RUN_ID = uuid.uuid4().hex[:12]
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("telemetry_span", default=None)
+_write_lock = threading.Lock()
+
+
+def telemetry_path() -> Optional[Path]:
+    value = os.getenv("ASCENT_TELEMETRY")
+    if value and value.lower() in ("off", "0", "false", "none"):
+        return None
+    return Path(value) if value else DEFAULT_TELEMETRY_PATH
+
+
+class Span:
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:12]
+        self.parent = parent
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is open."""
+        self.attrs.update({k: v for k, v in attrs.items() if v is not None})
+
+
+def emit(record: Dict[str, Any]):
+    """Append one JSON record to the telemetry file."""
+    path = telemetry_path()
+    if path is None:
+        return
+    line = json.dumps(record, default=str)
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line + "\n")
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """Time a step and emit it as a span on exit (errors included)."""
+    parent = _current.get()
+    current = Span(name, parent, {k: v for k, v in attrs.items() if v is not None})
+    # Child spans inherit the issuing command so reports can group by it
+    if parent and "command" in parent.attrs:
+        current.attrs.setdefault("command", parent.attrs["command"])
+    token = _current.set(current)
+    started = time.perf_counter()
+    status, error = "ok", None
+    try:
+        yield current
+    except BaseException as e:
+        if isinstance(e, SystemExit) and not e.code:
+            raise
+        status, error = "error", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        record = {
+            "ts": datetime.now().isoformat(),
+            "run_id": RUN_ID,
+            "span_id": current.span_id,
+            "parent_id": parent.span_id if parent else None,
+            "name": name,
+            "duration": round(time.perf_counter() - started, 6),
+            "status": status,
+        }
+        if error:
+            record["error"] = error
+        record.update(current.attrs)
+        emit(record)
+
+
+def load_spans(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Read all spans, skipping torn or malformed lines."""
+    path = path or telemetry_path() or DEFAULT_TELEMETRY_PATH
+    spans = []
+    if not path.exists():
+        return spans
+    with open(path) as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(spans: List[Dict[str, Any]], group_by: List[str]) -> List[Dict[str, Any]]:
+    """Aggregate latency/token/cache/retry stats per distinct `group_by` tuple."""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for s in spans:
+        groups.setdefault(tuple(s.get(k) or "-" for k in group_by), []).append(s)
+
+    rows = []
+    for key in sorted(groups, key=lambda k: tuple(str(x) for x in k)):
+        items = groups[key]
+        durations = [s["duration"] for s in items if "duration" in s]
+        prompt = [s["prompt_tokens"] for s in items if s.get("prompt_tokens") is not None]
+        completion = [s["completion_tokens"] for s in items if s.get("completion_tokens") is not None]
+        row = dict(zip(group_by, key))
+        row.update({
+            "count": len(items),
+            "errors": sum(1 for s in items if s.get("status") == "error"),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "prompt_tokens_p50": percentile(prompt, 50),
+            "completion_tokens_p50": percentile(completion, 50),
+            "total_tokens": sum(prompt) + sum(completion),
+            "cache_hits": sum(1 for s in items if s.get("cache") == "hit"),
+            "retries": sum(s.get("retries") or 0 for s in items),
+        })
+        rows.append(row)
+    return rows
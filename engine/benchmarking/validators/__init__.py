@@ -1,7 +1,11 @@
 from .structural import StructuralValidator
 from .verification import VerificationValidator
+from .suite import run_validators, register, suite_version
 
 __all__ = [
     "StructuralValidator",
-    "VerificationValidator"
+    "VerificationValidator",
+    "run_validators",
+    "register",
+    "suite_version"
 ]
@@ -17,7 +17,12 @@ class ValidationResult:
 class BaseValidator(ABC):
     """
     Base class for all benchmark validators.
+
+    Bump `version` whenever a validator's rules change, so stored results
+    (see tree.py) are re-checked.
     """
+    version = "1"
+
     @property
     @abstractmethod
     def name(self) -> str:
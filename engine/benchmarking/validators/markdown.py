@@ -0,0 +1,158 @@
+"""
+Single-pass Markdown parser for mission validation.
+
+Splits a mission into a section tree (ATX headers and bold pseudo-headers),
+records fenced code blocks with their languages and every bold span, in one
+scan over the lines. Parsed documents are cached by content hash, so any
+number of validators can query the same mission without rescanning it.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Set
+
+_HEADING = re.compile(r"^(#+)\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(`{3,}|~{3,})\s*([\w+\-.#]*)")
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_BOLD_LINE = re.compile(r"^\s*\*\*(.+?)\*\*\s*:?\s*$")
+
+# Missions the agent declined to write start with one of these directives
+DIRECTIVES = ("SKIP:", "REFUSE:")
+
+CACHE_SIZE = 2048
+
+
+class CodeBlock:
+    def __init__(self, language: str, line: int):
+        self.language = language.lower()
+        self.line = line
+        self.lines: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+class Section:
+    """A header (level 1+), bold pseudo-header, or the document root (level 0)."""
+
+    def __init__(self, title: str, level: int, line: int, kind: str = "heading",
+                 parent: Optional["Section"] = None):
+        self.title = title
+        self.level = level
+        self.line = line
+        self.kind = kind
+        self.parent = parent
+        self.children: List["Section"] = []
+        self.code_blocks: List[CodeBlock] = []
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class MarkdownDocument:
+    """Queryable result of one parse."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.root = Section("", 0, 0, kind="root")
+        self.sections: List[Section] = []
+        self.code_blocks: List[CodeBlock] = []
+        self.bold_terms: Set[str] = set()
+        self.directive: Optional[str] = next((d[:-1] for d in DIRECTIVES if content.startswith(d)), None)
+        self._parse()
+        self._titles = [s.title.lower() for s in self.sections if s.kind == "heading"]
+
+    def _parse(self):
+        current = self.root
+        block: Optional[CodeBlock] = None
+        fence = ""
+        for n, line in enumerate(self.content.split("\n"), 1):
+            if block is not None:
+                stripped = line.strip()
+                if stripped.startswith(fence) and stripped.strip(fence[0]) == "":
+                    block = None
+                else:
+                    block.lines.append(line)
+                continue
+
+            match = _FENCE.match(line)
+            if match:
+                fence = match.group(1)
+                block = CodeBlock(match.group(2), n)
+                current.code_blocks.append(block)
+                self.code_blocks.append(block)
+                continue
+
+            match = _HEADING.match(line)
+            if match:
+                level = len(match.group(1))
+                while current.level >= level and current.parent is not None:
+                    current = current.parent
+                current = self._add(Section(match.group(2), level, n, parent=current))
+                continue
+
+            if "**" in line:
+                self.bold_terms.update(t.strip().lower() for t in _BOLD.findall(line))
+                match = _BOLD_LINE.match(line)
+                if match:
+                    # A bold-only line opens a pseudo-section under the nearest real header
+                    owner = current if current.kind != "bold" else current.parent
+                    current = self._add(Section(match.group(1).strip(), owner.level + 1, n, kind="bold", parent=owner))
+
+    def _add(self, section: Section) -> Section:
+        section.parent.children.append(section)
+        self.sections.append(section)
+        return section
+
+    def has_header(self, name: str) -> bool:
+        """A header whose text contains `name`, or a bold `**name**` (case-insensitive)."""
+        name = name.lower()
+        return name in self.bold_terms or any(name in title for title in self._titles)
+
+    def has_heading(self, name: str) -> bool:
+        """Like has_header, but only real `#` headers count."""
+        name = name.lower()
+        return any(name in title for title in self._titles)
+
+    def find(self, name: str) -> Optional[Section]:
+        """First section (header or pseudo-header) whose title contains `name`."""
+        name = name.lower()
+        return next((s for s in self.sections if name in s.title.lower()), None)
+
+    def has_code(self, language: str) -> bool:
+        """A fenced block whose info string starts with `language` (```python, ```python3)."""
+        language = language.lower()
+        return any(b.language.startswith(language) for b in self.code_blocks)
+
+    @property
+    def code_languages(self) -> Set[str]:
+        return {b.language for b in self.code_blocks if b.language}
+
+
+_cache: "OrderedDict[str, MarkdownDocument]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_markdown(content: str) -> MarkdownDocument:
+    """Parse once per distinct content (LRU, keyed by content hash)."""
+    key = content_hash(content)
+    with _cache_lock:
+        doc = _cache.get(key)
+        if doc is not None:
+            _cache.move_to_end(key)
+            return doc
+    doc = MarkdownDocument(content)
+    with _cache_lock:
+        _cache[key] = doc
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return doc
@@ -1,6 +1,6 @@
 from engine.benchmarking.validators.base import BaseValidator, ValidationResult
+from engine.benchmarking.validators.markdown import parse_markdown
 from typing import Dict, Any
-import re
 
 class StructuralValidator(BaseValidator):
     """
@@ -14,7 +14,8 @@ class StructuralValidator(BaseValidator):
         if artifact_type != "assignment":
             return ValidationResult(self.name, True)
             
-        if any(content.startswith(x) for x in ["SKIP:", "REFUSE:"]):
+        doc = parse_markdown(content)
+        if doc.directive:
             return ValidationResult(self.name, True)
             
         requested_headers = [
@@ -26,13 +27,9 @@ class StructuralValidator(BaseValidator):
             "Reflection"
         ]
         
-        missing = []
-        for h in requested_headers:
-            # Look for '# ... Header' or '**Header**'
-            pattern = rf"(^#+\s+.*{h})|(\*\*{h}\*\*)"
-            if not re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
-                missing.append(h)
-                
+        # Look for '# ... Header' or '**Header**'
+        missing = [h for h in requested_headers if not doc.has_header(h)]
+
         if missing:
             return ValidationResult(self.name, False, [f"Missing headers: {', '.join(missing)}"])
             
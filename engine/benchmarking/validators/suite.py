@@ -0,0 +1,76 @@
+"""
+The registered validator suite.
+
+`run_validators` is the single entry point used after generation (runner),
+by benchmarks and by bulk validation of the school tree.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import yaml
+
+from engine.benchmarking.validators.base import BaseValidator
+from engine.benchmarking.validators.markdown import parse_markdown
+from engine.benchmarking.validators.structural import StructuralValidator
+from engine.benchmarking.validators.verification import VerificationValidator
+
+# Required top-level keys of the YAML artifacts
+REQUIRED_KEYS = {
+    "module": ["id", "title", "assignments", "requires", "produces"],
+    "campaign": ["id", "title", "modules"],
+    "track": ["id", "title", "campaigns"],
+}
+
+# Bump when run_validators' own checks (REQUIRED_KEYS, emptiness) change
+RULES_VERSION = 1
+
+VALIDATORS: List[Type[BaseValidator]] = [StructuralValidator, VerificationValidator]
+
+
+def register(cls: Type[BaseValidator]) -> Type[BaseValidator]:
+    """Add a validator to the suite run on assignments (usable as a decorator)."""
+    if cls not in VALIDATORS:
+        VALIDATORS.append(cls)
+    return cls
+
+
+def suite_version() -> str:
+    """Fingerprint of the rules and every registered validator's version."""
+    parts = [f"rules:{RULES_VERSION}"] + [f"{cls.__name__}:{cls.version}" for cls in VALIDATORS]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def run_validators(artifact_type: str, content: str, context: Optional[Dict[str, Any]] = None) -> Tuple[bool, Optional[str]]:
+    """Returns (passed, reason); reason joins every failure with '; '."""
+    if context is None:
+        context = {}
+    if not content or len(content.strip()) < 10:
+        return False, "Content is empty or too short."
+
+    if artifact_type in REQUIRED_KEYS:
+        try:
+            data = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            return False, f"Invalid YAML: {e}"
+        if not isinstance(data, dict):
+            return False, "YAML must be an object."
+        missing = [k for k in REQUIRED_KEYS[artifact_type] if k not in data]
+        if missing:
+            return False, f"Missing keys: {', '.join(missing)}"
+        return True, None
+
+    if artifact_type == 'assignment':
+        # One parse; every validator below queries the same cached section tree
+        parse_markdown(content)
+        failures = []
+        for cls in VALIDATORS:
+            v = cls()
+            if v.name == 'completability':
+                continue
+            res = v.validate(artifact_type, content, context)
+            if not res.passed:
+                failures.extend(res.reasons)
+        if failures:
+            return False, "; ".join(failures)
+    return True, None
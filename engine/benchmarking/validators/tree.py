@@ -0,0 +1,227 @@
+"""
+Bulk validation of a school tree.
+
+Walks domains/ and projects/ for tracks, campaigns, modules and missions,
+runs the validator suite on each in a process pool, and stores results in
+an SQLite file next to the content. A result is reused while the file's
+content hash, its validation context and the suite version are unchanged,
+so repeat runs only re-check what was edited.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from engine.benchmarking.validators.suite import run_validators, suite_version
+
+RESULTS_FILENAME = ".validation_results.sqlite"
+
+ARTIFACT_FILES = {
+    "track.yaml": "track",
+    "campaign.yaml": "campaign",
+    "module.yaml": "module",
+    "mission.md": "assignment",
+}
+
+# Files handed to a worker per task; large enough to amortize pickling
+BATCH_SIZE = 256
+
+
+def discover(school_root: Path) -> Iterator[Tuple[str, Path, str]]:
+    """
+    Yield (artifact_type, path, target_id) for every artifact under
+    domains/ and projects/. A mission's target_id is its module's ID,
+    derived from the directory layout ArtifactWriter uses.
+    """
+    school_root = Path(school_root)
+    domains = school_root / "domains"
+    for top in (domains, school_root / "projects"):
+        if not top.is_dir():
+            continue
+        for root, dirs, files in os.walk(top):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for f in sorted(files):
+                artifact_type = ARTIFACT_FILES.get(f)
+                if artifact_type is None:
+                    continue
+                path = Path(root) / f
+                target_id = ""
+                if artifact_type == "assignment" and path.parent.parent.name == "assignments":
+                    module_dir = path.parent.parent.parent
+                    try:
+                        target_id = ".".join(module_dir.relative_to(domains).parts)
+                    except ValueError:
+                        pass
+                yield artifact_type, path, target_id
+
+
+def _validate_batch(batch: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+    """Pool worker: read, hash and validate each (artifact_type, path, target_id)."""
+    rows = []
+    for artifact_type, path, target_id in batch:
+        try:
+            raw = Path(path).read_bytes()
+            st = os.stat(path)
+        except OSError as e:
+            rows.append({"path": path, "type": artifact_type, "target_id": target_id,
+                         "passed": False, "reason": f"Unreadable: {e}", "sha256": None})
+            continue
+        context = {"target_id": target_id} if target_id else {}
+        passed, reason = run_validators(artifact_type, raw.decode("utf-8", errors="replace"), context)
+        rows.append({
+            "path": path,
+            "type": artifact_type,
+            "target_id": target_id,
+            "passed": passed,
+            "reason": reason,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        })
+    return rows
+
+
+class ResultStore:
+    """
+    SQLite-backed validation results, keyed by absolute path and checked
+    against (mtime, size) first and the content hash second, like RegistryIndex.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " suite TEXT NOT NULL,"
+            " target_id TEXT NOT NULL,"
+            " passed INTEGER NOT NULL,"
+            " reason TEXT)"
+        )
+        return conn
+
+    def clear(self):
+        if self.db_path.exists():
+            self.db_path.unlink()
+
+
+def validate_tree(school_root: Path, workers: Optional[int] = None, use_cache: bool = True,
+                  store_path: Optional[Path] = None,
+                  on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Validate every artifact in the tree. Returns (rows, stats); rows are in
+    discovery order with paths relative to `school_root`, and stats counts
+    checked / reused / dropped entries.
+    """
+    school_root = Path(school_root).resolve()
+    store = ResultStore(store_path or school_root / RESULTS_FILENAME)
+    suite = suite_version()
+    stats = {"checked": 0, "reused": 0, "dropped": 0}
+
+    conn = store._connect()
+    try:
+        stored = {}
+        if use_cache:
+            stored = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    "SELECT path, mtime_ns, size, sha256, suite, target_id, passed, reason FROM results")
+            }
+
+        found = list(discover(school_root))
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[str, str, str]] = []
+        refreshed = []
+        for artifact_type, path, target_id in found:
+            key = str(path)
+            row = stored.get(key)
+            if row and row[3] == suite and row[4] == target_id:
+                mtime_ns, size, digest = row[0], row[1], row[2]
+                try:
+                    st = path.stat()
+                except OSError:
+                    st = None
+                if st and (st.st_mtime_ns != mtime_ns or st.st_size != size):
+                    # Touched or re-checked-out: reuse only if the bytes are the same
+                    try:
+                        raw = path.read_bytes()
+                    except OSError:
+                        raw = None
+                    if raw is not None and hashlib.sha256(raw).hexdigest() == digest:
+                        refreshed.append((st.st_mtime_ns, st.st_size, key))
+                    else:
+                        st = None
+                if st:
+                    results[key] = {"path": key, "type": artifact_type, "target_id": target_id,
+                                    "passed": bool(row[5]), "reason": row[6], "cached": True}
+                    stats["reused"] += 1
+                    if on_result:
+                        on_result(results[key])
+                    continue
+            pending.append((artifact_type, key, target_id))
+
+        batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+        if len(batches) > 1 and workers != 1:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            batch_results = pool.map(_validate_batch, batches)
+        else:
+            pool = None
+            batch_results = map(_validate_batch, batches)
+        try:
+            for rows in batch_results:
+                for r in rows:
+                    r["cached"] = False
+                    results[r["path"]] = r
+                    stats["checked"] += 1
+                    if r["sha256"] is not None:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (r["path"], r["mtime_ns"], r["size"], r["sha256"], suite,
+                             r["target_id"], int(r["passed"]), r["reason"]),
+                        )
+                    if on_result:
+                        on_result(r)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        conn.executemany("UPDATE results SET mtime_ns = ?, size = ? WHERE path = ?", refreshed)
+        # Forget files that are gone from the tree
+        present = {str(path) for _, path, _ in found}
+        stale = [(p,) for p, in conn.execute("SELECT path FROM results") if p not in present]
+        conn.executemany("DELETE FROM results WHERE path = ?", stale)
+        stats["dropped"] = len(stale)
+        conn.commit()
+    finally:
+        conn.close()
+
+    ordered = []
+    for _, path, _ in found:
+        row = dict(results[str(path)])
+        for k in ("sha256", "mtime_ns", "size"):
+            row.pop(k, None)
+        row["path"] = os.path.relpath(row["path"], school_root)
+        ordered.append(row)
+    return ordered, stats
+
+
+def to_json(rows: List[Dict[str, Any]], stats: Dict[str, int]) -> str:
+    failed = [r for r in rows if not r["passed"]]
+    return json.dumps({
+        "suite": suite_version(),
+        "total": len(rows),
+        "passed": len(rows) - len(failed),
+        "failed": len(failed),
+        **stats,
+        "results": rows,
+    }, indent=2)
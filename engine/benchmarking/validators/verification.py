@@ -1,6 +1,6 @@
 from engine.benchmarking.validators.base import BaseValidator, ValidationResult
+from engine.benchmarking.validators.markdown import parse_markdown
 from typing import Dict, Any
-import re
 
 class VerificationValidator(BaseValidator):
     """
@@ -14,18 +14,19 @@ class VerificationValidator(BaseValidator):
         if artifact_type != "assignment":
             return ValidationResult(self.name, True)
             
-        if any(content.startswith(x) for x in ["SKIP:", "REFUSE:"]):
+        doc = parse_markdown(content)
+        if doc.directive:
             return ValidationResult(self.name, True)
             
         reasons = []
         
         # Look for a verification header flexibly
-        if not re.search(r"^#+\s+.*Verification", content, re.IGNORECASE | re.MULTILINE):
+        if not doc.has_heading("Verification"):
             reasons.append("Missing 'Verification' section header.")
             
         # For computing domains, we strongly prefer a python block or a clear script reference
         if "computing" in context.get("target_id", ""):
-            if "```python" not in content and "verification.py" not in content.lower():
+            if not doc.has_code("python") and "verification.py" not in content.lower():
                 reasons.append("Computing assignment missing executable verification artifacts.")
         
         if reasons:
@@ -3,7 +3,6 @@ CLI - Argument parsing and command routing.
 """
 
 import argparse
-from .commands import cmd_status
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -28,6 +27,73 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Specific module or campaign ID"
     )
+    status_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Log every module and campaign as it loads"
+    )
+    
+    # cohort command
+    cohort_parser = subparsers.add_parser("cohort", help="Show class dashboard and gap heatmap for all learners")
+    cohort_parser.add_argument(
+        "--state-root",
+        type=str,
+        help="Directory of <learner_id>/student_state.yaml (default: STATE_ROOT)"
+    )
+    cohort_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count; 1 runs inline)"
+    )
+    cohort_parser.add_argument(
+        "--out",
+        type=str,
+        help="Write CSV tables (per learner, learner x module, distributions, gaps) here"
+    )
+    cohort_parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Rows to print per table"
+    )
+    
+    # ledger command
+    ledger_parser = subparsers.add_parser("ledger", help="Sync, record and compact the learner ledger")
+    ledger_actions = ledger_parser.add_subparsers(dest="action", required=True)
+    for action, help_text in [
+        ("import", "Import edited student_state.yaml files into the ledger"),
+        ("export", "Write the ledger back to student_state.yaml files"),
+    ]:
+        action_parser = ledger_actions.add_parser(action, help=help_text)
+        action_parser.add_argument(
+            "--learner",
+            type=str,
+            help="Learner ID (default: every learner under STATE_ROOT)"
+        )
+    record_parser = ledger_actions.add_parser("record", help="Append one evidence entry")
+    record_parser.add_argument("--learner", type=str, default="local_user", help="Learner ID")
+    record_parser.add_argument(
+        "--tier",
+        choices=["tier_1_claims", "tier_2_practiced", "tier_3_verified", "evidence"],
+        default="tier_2_practiced",
+        help="Section the entry belongs to"
+    )
+    record_parser.add_argument("--key", type=str, required=True, help="Assignment or competency ID")
+    record_parser.add_argument("--score", type=float, help="Score to store with the entry")
+    record_parser.add_argument("--source", type=str, default="cli_submit", help="Who recorded the entry")
+    rollups_parser = ledger_actions.add_parser("rollups", help="Update materialized progress counters")
+    rollups_parser.add_argument(
+        "--learner",
+        type=str,
+        help="Learner ID (default: every learner in the ledger)"
+    )
+    rollups_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute from scratch instead of applying new evidence"
+    )
+    ledger_actions.add_parser("compact", help="Drop superseded ledger events")
     
     return parser
 
@@ -37,8 +103,16 @@ def main():
     parser = create_parser()
     args = parser.parse_args()
     
+    # Commands import their loaders (yaml, config) only when they run
     if args.command == "status":
+        from .commands import cmd_status
         cmd_status(args)
+    elif args.command == "cohort":
+        from .commands import cmd_cohort
+        cmd_cohort(args)
+    elif args.command == "ledger":
+        from .commands import cmd_ledger
+        cmd_ledger(args)
     else:
         parser.print_help()
 
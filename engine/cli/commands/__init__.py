@@ -3,5 +3,7 @@ Commands package - Orchestrates loaders + core, formats output.
 """
 
 from .status import cmd_status
+from .cohort import cmd_cohort
+from .ledger import cmd_ledger
 
-__all__ = ["cmd_status"]
+__all__ = ["cmd_status", "cmd_cohort", "cmd_ledger"]
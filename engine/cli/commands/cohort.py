@@ -0,0 +1,124 @@
+"""
+Cohort command - Class Dashboard and Gap Heatmap across every learner.
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+from engine import config
+
+from ..loaders import scan_modules, load_catalog
+from ..loaders.state.cohort import stream_cohort
+from ..core import format_progress
+from ..core.cohort import CohortStats, BUCKETS
+
+
+def cmd_cohort(args):
+    """Stream all learner states under STATE_ROOT into cohort statistics."""
+    print("\n=== Class Dashboard ===\n")
+
+    state_root = Path(args.state_root) if args.state_root else config.STATE_ROOT
+    if not state_root.is_dir():
+        print(f"[FATAL] State root does not exist: {state_root}")
+        print("[HINT] Is STATE_ROOT configured correctly?")
+        sys.exit(1)
+
+    catalog = load_catalog()
+    modules = scan_modules(catalog)
+    module_ids = list(modules)
+    competencies = sorted({c for mod in catalog.modules.values() for c in mod.get("produces", None) or []})
+    stats = CohortStats(module_ids, (len(set(a)) for a in modules.values()), competencies)
+
+    out = Path(args.out) if args.out else None
+    learner_file = matrix_file = None
+    if out:
+        out.mkdir(parents=True, exist_ok=True)
+        learner_file = open(out / "learner_progress.csv", "w", newline="")
+        matrix_file = open(out / "learner_modules.csv", "w", newline="")
+    try:
+        learners = csv.writer(learner_file) if learner_file else None
+        matrix = csv.writer(matrix_file) if matrix_file else None
+        if learners:
+            learners.writerow(["learner_id", "completed", "competencies_held", "error"])
+            matrix.writerow(["learner_id", "module_id", "completed", "total"])
+
+        # Rows are written as they arrive; nothing per-learner is retained
+        rows = stream_cohort(state_root, config.SCHOOL_ROOT, module_ids, competencies,
+                             workers=args.workers)
+        for learner_id, error, module_row, held, completed in rows:
+            if error:
+                stats.add_error(learner_id, error)
+                if learners:
+                    learners.writerow([learner_id, 0, 0, error])
+                continue
+            stats.add(module_row, held, completed)
+            if learners:
+                learners.writerow([learner_id, completed, len(held), ""])
+                matrix.writerows((learner_id, module_ids[m], done, stats.totals[m]) for m, done in module_row)
+    finally:
+        for f in (learner_file, matrix_file):
+            if f:
+                f.close()
+
+    print(f"[OK] Streamed {stats.learners} learner states from {state_root}")
+    for learner_id, error in stats.errors:
+        print(f"[ERR] Failed to load {learner_id}: {error}")
+
+    if out:
+        _write_tables(out, stats)
+        print(f"[OK] Wrote cohort tables to {out}")
+
+    _show_dashboard(stats, args.top)
+    _show_heatmap(stats, args.top)
+    print()
+
+
+def _write_tables(out, stats):
+    """Per-module distribution and per-competency gap tables."""
+    with open(out / "module_distribution.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["module_id", "assignments", *BUCKETS, "mean_progress"])
+        for module_id, total, counts, mean in stats.module_distribution():
+            writer.writerow([module_id, total, *counts, f"{mean:.4f}"])
+    with open(out / "competency_gaps.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["competency", "missing", "missing_fraction"])
+        for cid, missing, fraction in stats.gaps():
+            writer.writerow([cid, missing, f"{fraction:.4f}"])
+
+
+def _show_dashboard(stats, top):
+    """Class-level summary and the modules most learners have started."""
+    summary = stats.summary()
+    print("\n--- Class Dashboard ---\n")
+    print(f"Learners: {summary['learners']}")
+    print(f"  Mean completed assignments: {summary['mean_completed']:.1f}")
+    print(f"  Mean modules finished: {summary['mean_modules_finished']:.1f}")
+    print(f"  Modules started by anyone: {summary['modules_started']} / {summary['modules']}")
+
+    started = [row for row in stats.module_distribution() if row[2][0] < stats.learners]
+    if started:
+        started.sort(key=lambda r: (r[2][0], r[0]))
+        print("\n  Module completion (learners per bucket):")
+        print("    " + " ".join(f"{b:>7}" for b in BUCKETS) + "    mean  module")
+        for module_id, _, counts, mean in started[:top]:
+            print("    " + " ".join(f"{c:>7}" for c in counts) + f" {format_progress(mean):>7}  {module_id}")
+        if len(started) > top:
+            print(f"    ... {len(started) - top} more (see --out)")
+
+
+def _show_heatmap(stats, top):
+    """The competencies most of the class is missing."""
+    print("\n--- Gap Heatmap ---\n")
+    if not stats.learners:
+        print("No learner states found.")
+        return
+    gaps = [g for g in stats.gaps() if g[1]]
+    if not gaps:
+        print("No gaps: every learner holds every produced competency.")
+        return
+    for cid, missing, fraction in gaps[:top]:
+        print(f"  {format_progress(fraction)} missing {cid} ({missing}/{stats.learners})")
+    if len(gaps) > top:
+        print(f"  ... {len(gaps) - top} more (see --out)")
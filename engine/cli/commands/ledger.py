@@ -0,0 +1,99 @@
+"""
+Ledger command - Sync, record and compact the learner ledger.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+from engine import config
+from engine.config import get_learner_state_path
+from engine.resolver.ledger import LedgerStore
+from engine.resolver.rollups import ProgressRollups, compact_ledger
+
+from ..loaders import load_catalog
+from ..loaders.state.cohort import iter_state_files
+
+
+def cmd_ledger(args):
+    """Dispatch `ledger <action>`."""
+    store = LedgerStore.at(config.STATE_ROOT)
+    if args.action == "import":
+        _import(store, args.learner)
+    elif args.action == "export":
+        _export(store, args.learner)
+    elif args.action == "record":
+        _record(store, args)
+    elif args.action == "rollups":
+        _rollups(store, args)
+    elif args.action == "compact":
+        # Keeps events each learner's progress rollups have not folded in yet
+        removed = compact_ledger(store)
+        print(f"[OK] Compacted ledger: {removed} superseded events removed")
+
+
+def _learners(store, learner_id):
+    """The requested learner, or every learner with a state file or ledger entries."""
+    if learner_id:
+        return [learner_id]
+    found = {p.parent.name for p in iter_state_files(config.STATE_ROOT)} if config.STATE_ROOT.is_dir() else set()
+    return sorted(found | set(store.learner_ids()))
+
+
+def _import(store, learner_id):
+    imported = unchanged = 0
+    for lid in _learners(store, learner_id):
+        state_path = get_learner_state_path(lid)
+        if not state_path.exists():
+            if learner_id:
+                print(f"[FATAL] State file does not exist: {state_path}")
+                sys.exit(1)
+            continue
+        try:
+            if store.sync_yaml(lid, state_path):
+                imported += 1
+            else:
+                unchanged += 1
+        except Exception as e:
+            print(f"[ERR] Failed to import {state_path}: {e}")
+    print(f"[OK] Imported {imported} state files ({unchanged} unchanged) into {store.db_path}")
+
+
+def _export(store, learner_id):
+    learners = _learners(store, learner_id)
+    for lid in learners:
+        state_path = get_learner_state_path(lid)
+        if state_path.exists():
+            # Keep hand edits made since the last sync
+            store.sync_yaml(lid, state_path)
+        store.export_yaml(lid, state_path)
+    print(f"[OK] Exported {len(learners)} learners to {config.STATE_ROOT}")
+
+
+def _record(store, args):
+    state_path = get_learner_state_path(args.learner)
+    if state_path.exists():
+        store.sync_yaml(args.learner, state_path)
+    if args.tier == "tier_1_claims":
+        payload = None
+    else:
+        payload = {
+            "completed_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "source": args.source,
+        }
+        if args.score is not None:
+            payload["score"] = args.score
+    store.record(args.learner, args.tier, args.key, payload, source=args.source)
+    # Only the scopes containing this assignment change
+    ProgressRollups(store, load_catalog()).refresh([args.learner])
+    print(f"[OK] Recorded {args.tier} {args.key} for {args.learner}")
+
+
+def _rollups(store, args):
+    rollups = ProgressRollups(store, load_catalog())
+    learners = [args.learner] if args.learner else None
+    if args.rebuild:
+        n = rollups.rebuild(learners)
+        print(f"[OK] Rebuilt progress rollups for {n} learners (catalog {rollups.scope_map.version})")
+    else:
+        stats = rollups.refresh(learners)
+        print(f"[OK] Progress rollups: {stats['updated']} learners updated, {stats['rebuilt']} rebuilt")
@@ -2,70 +2,75 @@
 Status command - Display progress status.
 """
 
-from ..loaders import scan_modules, scan_campaigns, load_ledger
-from ..core import compute_progress, format_progress
+from ..loaders import scan_modules, scan_campaigns, load_catalog, load_ledger, load_progress
+from ..core import format_progress, ProgressIndex
 
 
 def cmd_status(args):
     """Display progress status based on scope."""
     print("\n=== Scholar Status ===\n")
     
-    # Load all data
-    modules = scan_modules()
-    campaigns = scan_campaigns()
-    completed = load_ledger()
+    # Load all data (one walk of the school tree serves both scans)
+    verbose = getattr(args, "verbose", False)
+    catalog = load_catalog()
+    modules = scan_modules(catalog, verbose=verbose)
+    campaigns = scan_campaigns(catalog, verbose=verbose)
+    # Precomputed counters from the ledger rollups; recount only without them
+    done = load_progress(catalog)
+    if done is None:
+        done = _recount(modules, campaigns, load_ledger())
     
     print("\n--- Progress Report ---\n")
     
     # Compute based on scope
     if args.scope == "total":
-        _show_total_progress(modules, completed)
+        _show_total_progress(modules, done["total"])
     elif args.scope == "module":
-        _show_module_progress(args.id, modules, completed)
+        _show_module_progress(args.id, modules, done["module"])
     elif args.scope == "campaign":
-        _show_campaign_progress(args.id, campaigns, completed)
+        _show_campaign_progress(args.id, campaigns, done["campaign"])
     
     print()
 
 
-def _show_total_progress(modules, completed):
+def _recount(modules, campaigns, completed):
+    """Counters in load_progress's shape, counted from a completed set."""
+    done = {}
+    for kind, scopes in (("module", modules), ("campaign", campaigns)):
+        index = ProgressIndex(scopes)
+        done[kind] = {sid: n for sid, n in zip(index.scope_ids, index.done(completed)) if n}
+    done["total"] = {"total": ProgressIndex(modules).union_counts(completed)[0]}
+    return done
+
+
+def _show_total_progress(modules, done_by_scope):
     """Show total progress across all modules."""
-    all_assignments = set()
-    for assignments in modules.values():
-        all_assignments.update(assignments)
-    
-    progress = compute_progress(all_assignments, completed)
+    done = done_by_scope.get("total", 0)
+    total = len(set().union(*modules.values()))
+    progress = done / total if total else 0.0
     print(f"Total Progress: {format_progress(progress)}")
-    print(f"  Completed: {len(all_assignments & completed)} / {len(all_assignments)}")
+    print(f"  Completed: {done} / {total}")
 
 
-def _show_module_progress(module_id, modules, completed):
-    """Show progress for a specific module or all modules."""
-    if module_id and module_id in modules:
-        relevant = set(modules[module_id])
-        progress = compute_progress(relevant, completed)
-        print(f"Module [{module_id}]: {format_progress(progress)}")
-        print(f"  Completed: {len(relevant & completed)} / {len(relevant)}")
+def _show_scope_progress(label, scope_id, scopes, done_by_scope):
+    """Show progress for one scope, or every scope."""
+    if scope_id and scope_id in scopes:
+        done, total = done_by_scope.get(scope_id, 0), len(set(scopes[scope_id]))
+        progress = done / total if total else 0.0
+        print(f"{label} [{scope_id}]: {format_progress(progress)}")
+        print(f"  Completed: {done} / {total}")
     else:
-        # Show all modules
-        for mid, assignments in modules.items():
-            relevant = set(assignments)
-            progress = compute_progress(relevant, completed)
-            done = len(relevant & completed)
-            print(f"  {mid}: {format_progress(progress)} ({done}/{len(relevant)})")
+        for sid, assignments in scopes.items():
+            done, total = done_by_scope.get(sid, 0), len(set(assignments))
+            progress = done / total if total else 0.0
+            print(f"  {sid}: {format_progress(progress)} ({done}/{total})")
 
 
-def _show_campaign_progress(campaign_id, campaigns, completed):
+def _show_module_progress(module_id, modules, done_by_scope):
+    """Show progress for a specific module or all modules."""
+    _show_scope_progress("Module", module_id, modules, done_by_scope)
+
+
+def _show_campaign_progress(campaign_id, campaigns, done_by_scope):
     """Show progress for a specific campaign or all campaigns."""
-    if campaign_id and campaign_id in campaigns:
-        relevant = set(campaigns[campaign_id])
-        progress = compute_progress(relevant, completed)
-        print(f"Campaign [{campaign_id}]: {format_progress(progress)}")
-        print(f"  Completed: {len(relevant & completed)} / {len(relevant)}")
-    else:
-        # Show all campaigns
-        for cid, assignments in campaigns.items():
-            relevant = set(assignments)
-            progress = compute_progress(relevant, completed)
-            done = len(relevant & completed)
-            print(f"  {cid}: {format_progress(progress)} ({done}/{len(relevant)})")
+    _show_scope_progress("Campaign", campaign_id, campaigns, done_by_scope)
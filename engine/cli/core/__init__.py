@@ -2,6 +2,6 @@
 Core package - Pure logic, no I/O.
 """
 
-from .progress import compute_progress, format_progress
+from .progress import compute_progress, format_progress, ProgressIndex
 
-__all__ = ["compute_progress", "format_progress"]
+__all__ = ["compute_progress", "format_progress", "ProgressIndex"]
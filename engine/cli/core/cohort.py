@@ -0,0 +1,95 @@
+"""
+Cohort aggregation - Pure streaming statistics, no I/O.
+
+Learners arrive one sparse row at a time (non-zero module completion
+counts, held competency columns). Only per-module histograms and
+per-competency counters are kept, so memory is O(modules + competencies)
+however many learners stream through.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+# Completion buckets for a module, by percentage of its assignments done
+BUCKETS = ("0%", "1-24%", "25-49%", "50-74%", "75-99%", "100%")
+
+
+def bucket(done: int, total: int) -> int:
+    """Index into BUCKETS for `done` of `total` assignments."""
+    if total <= 0 or done <= 0:
+        return 0
+    if done >= total:
+        return 5
+    return 1 + min(3, done * 4 // total)
+
+
+class CohortStats:
+    """
+    Accumulates a cohort's Class Dashboard and Gap Heatmap.
+
+    Args:
+        module_ids: Module column order
+        totals: Assignment count per module, aligned with module_ids
+        competencies: Competency column order
+    """
+
+    def __init__(self, module_ids: List[str], totals: Iterable[int], competencies: List[str]):
+        self.module_ids = module_ids
+        self.totals = list(totals)
+        self.competencies = competencies
+        self.learners = 0
+        self.errors: List[Tuple[str, str]] = []
+        # Learners with done > 0, per module (the rest are in the 0% bucket)
+        self._histogram = [[0] * len(BUCKETS) for _ in module_ids]
+        self._done_sum = [0] * len(module_ids)
+        self._held = [0] * len(competencies)
+        self._completed_sum = 0
+
+    def add(self, module_row: Iterable[Tuple[int, int]], held: Iterable[int], completed: int):
+        """Fold in one learner's sparse row."""
+        self.learners += 1
+        self._completed_sum += completed
+        totals, histogram, done_sum = self.totals, self._histogram, self._done_sum
+        for m, done in module_row:
+            histogram[m][bucket(done, totals[m])] += 1
+            done_sum[m] += done
+        for c in held:
+            self._held[c] += 1
+
+    def add_error(self, learner_id: str, error: str):
+        self.errors.append((learner_id, error))
+
+    @property
+    def mean_completed(self) -> float:
+        return self._completed_sum / self.learners if self.learners else 0.0
+
+    def module_distribution(self) -> Iterable[Tuple[str, int, List[int], float]]:
+        """(module_id, assignments, learners per bucket, mean progress) per module."""
+        n = self.learners
+        for m, module_id in enumerate(self.module_ids):
+            counts = list(self._histogram[m])
+            counts[0] = n - sum(counts[1:])
+            total = self.totals[m]
+            mean = self._done_sum[m] / (n * total) if n and total else 0.0
+            yield module_id, total, counts, mean
+
+    def gaps(self) -> List[Tuple[str, int, float]]:
+        """(competency, learners missing it, fraction missing), most missing first."""
+        n = self.learners
+        rows = [(cid, n - held, (n - held) / n if n else 0.0)
+                for cid, held in zip(self.competencies, self._held)]
+        rows.sort(key=lambda r: (-r[1], r[0]))
+        return rows
+
+    def summary(self) -> Dict[str, float]:
+        """Class-level figures for the dashboard header."""
+        distribution = list(self.module_distribution())
+        started = sum(1 for _, _, counts, _ in distribution if counts[0] < self.learners)
+        finished = [counts[5] for _, total, counts, _ in distribution if total]
+        return {
+            "learners": self.learners,
+            "errors": len(self.errors),
+            "modules": len(self.module_ids),
+            "modules_started": started,
+            "mean_completed": self.mean_completed,
+            "mean_modules_finished": sum(finished) / self.learners if self.learners else 0.0,
+        }
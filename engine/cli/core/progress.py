@@ -5,7 +5,9 @@ The fundamental formula:
     progress = |Relevant ∩ Completed| / |Relevant|
 """
 
-from typing import Set
+from array import array
+from itertools import repeat
+from typing import Dict, Iterable, List, Set, Tuple
 
 
 def compute_progress(relevant: Set[str], completed: Set[str]) -> float:
@@ -29,3 +31,84 @@ def compute_progress(relevant: Set[str], completed: Set[str]) -> float:
 def format_progress(progress: float) -> str:
     """Format progress as percentage string."""
     return f"{progress * 100:.1f}%"
+
+
+class ProgressIndex:
+    """
+    Progress for many scopes (modules, campaigns) at once.
+
+    The scopes form a sparse assignments × scopes incidence matrix, stored
+    as flat arrays of (assignment, scope) entries plus an index from each
+    assignment to its last entry. Counting a learner is one sparse
+    matrix-vector product driven by the completed set:
+
+        done[scope] = |{a in Completed : a in scope}|
+
+    which costs O(|Completed| × scopes per assignment) however many scopes
+    exist. Build once per curriculum and reuse it across learners.
+    """
+
+    def __init__(self, scopes: Dict[str, Iterable[str]]):
+        self.scope_ids: List[str] = list(scopes)
+        self.totals = array("l")
+        flat: List[str] = []
+        owners: List[int] = []
+        for s, assignments in enumerate(scopes.values()):
+            # A scope counts each assignment once, as set(assignments) did
+            relevant = set(assignments)
+            self.totals.append(len(relevant))
+            flat.extend(relevant)
+            owners.extend(repeat(s, len(relevant)))
+        # assignment -> one of its entries (its last), built in bulk
+        self._entry: Dict[str, int] = dict(zip(flat, range(len(flat))))
+        self._owners = array("l", owners)
+        # Assignments shared between scopes (campaigns reuse modules' ones):
+        # indexed entry -> the other scopes containing it
+        self._shared: Dict[int, List[int]] = {}
+        if len(self._entry) != len(flat):
+            entry = self._entry
+            for pos, a, owner in zip(range(len(flat)), flat, owners):
+                head = entry[a]
+                if head != pos:
+                    self._shared.setdefault(head, []).append(owner)
+
+    def done(self, completed: Iterable[str]) -> List[int]:
+        """Completed-assignment count per scope, aligned with scope_ids."""
+        counts = [0] * len(self.scope_ids)
+        entry, owners, shared = self._entry, self._owners, self._shared
+        for a in set(completed):
+            pos = entry.get(a)
+            if pos is not None:
+                counts[owners[pos]] += 1
+                for s in shared.get(pos, ()):
+                    counts[s] += 1
+        return counts
+
+    def done_sparse(self, completed: Iterable[str]) -> Dict[int, int]:
+        """{scope position: completed count} for scopes with any progress."""
+        counts: Dict[int, int] = {}
+        entry, owners, shared = self._entry, self._owners, self._shared
+        for a in set(completed):
+            pos = entry.get(a)
+            if pos is not None:
+                s = owners[pos]
+                counts[s] = counts.get(s, 0) + 1
+                for s in shared.get(pos, ()):
+                    counts[s] = counts.get(s, 0) + 1
+        return counts
+
+    def counts(self, completed: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        """{scope: (completed, total)} for every scope."""
+        return dict(zip(self.scope_ids, zip(self.done(completed), self.totals)))
+
+    def progress(self, completed: Iterable[str]) -> Dict[str, float]:
+        """{scope: |Relevant ∩ Completed| / |Relevant|} for every scope."""
+        return {
+            scope: (done / total if total else 0.0)
+            for scope, (done, total) in self.counts(completed).items()
+        }
+
+    def union_counts(self, completed: Iterable[str]) -> Tuple[int, int]:
+        """(completed, total) over the union of all scopes."""
+        entry = self._entry
+        return sum(1 for a in set(completed) if a in entry), len(entry)
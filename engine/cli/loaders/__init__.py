@@ -6,7 +6,7 @@ Subpackages:
   - state: ledger (from /learner_state)
 """
 
-from .curriculum import scan_modules, scan_campaigns
-from .state import load_ledger
+from .curriculum import scan_modules, scan_campaigns, load_catalog
+from .state import load_ledger, load_progress
 
-__all__ = ["scan_modules", "scan_campaigns", "load_ledger"]
+__all__ = ["scan_modules", "scan_campaigns", "load_catalog", "load_ledger", "load_progress"]
@@ -2,7 +2,7 @@
 Curriculum loaders - Load structure from /domains and /projects.
 """
 
-from .modules import scan_modules
+from .modules import scan_modules, load_catalog
 from .campaigns import scan_campaigns
 
-__all__ = ["scan_modules", "scan_campaigns"]
+__all__ = ["scan_modules", "scan_campaigns", "load_catalog"]
@@ -3,44 +3,46 @@ Module loader - Scans /domains for module.yaml files.
 """
 
 import sys
-import yaml
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from engine.config import DOMAINS_PATH, SCHOOL_ROOT
+from engine import config
+from engine.resolver.catalog import Catalog, get_catalog
 
 
-def scan_modules() -> Dict[str, List[str]]:
+def load_catalog() -> Catalog:
+    """The shared single-pass scan of SCHOOL_ROOT (domains/ and projects/)."""
+    return get_catalog([config.SCHOOL_ROOT])
+
+
+def scan_modules(catalog: Optional[Catalog] = None, verbose: bool = False) -> Dict[str, List[str]]:
     """
     Scan all module.yaml files in /domains.
     Returns: {module_id: [assignment_ids]}
     
     Strict validation: exits if domains path doesn't exist.
+    Per-module lines are printed only when `verbose`.
     """
-    modules = {}
+    domains_path = config.DOMAINS_PATH
     
-    if not DOMAINS_PATH.exists():
-        print(f"[FATAL] Domains path does not exist: {DOMAINS_PATH}")
-        print(f"[HINT] Expected school root: {SCHOOL_ROOT}")
+    if not domains_path.exists():
+        print(f"[FATAL] Domains path does not exist: {domains_path}")
+        print(f"[HINT] Expected school root: {config.SCHOOL_ROOT}")
         print("[HINT] Is SCHOOL_ROOT configured correctly?")
         sys.exit(1)
     
-    for module_yaml in DOMAINS_PATH.rglob("module.yaml"):
-        try:
-            with open(module_yaml) as f:
-                manifest = yaml.safe_load(f)
-            
-            module_id = manifest.get("id")
-            assignments = manifest.get("assignments", [])
-            
-            if module_id:
-                # Resolve local names to full IDs
-                full_ids = [f"{module_id}.{a}" for a in assignments]
-                modules[module_id] = full_ids
-                print(f"[OK] Loaded module: {module_id} ({len(full_ids)} assignments)")
-        except Exception as e:
-            print(f"[ERR] Failed to load {module_yaml}: {e}")
+    catalog = catalog or load_catalog()
+    for path, error in catalog.errors.items():
+        if path.name == "module.yaml":
+            print(f"[ERR] Failed to load {path}: {error}")
+    
+    modules = catalog.module_assignments
+    if verbose:
+        for module_id, full_ids in modules.items():
+            print(f"[OK] Loaded module: {module_id} ({len(full_ids)} assignments)")
     
     if not modules:
         print("[WARN] No modules found. Create module.yaml files in /domains.")
+    else:
+        print(f"[OK] Loaded {len(modules)} modules")
     
     return modules
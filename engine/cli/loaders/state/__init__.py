@@ -2,6 +2,7 @@
 State loaders - Load learner state from /learner_state.
 """
 
-from .ledger import load_ledger
+from .ledger import load_ledger, completed_assignments
+from .progress import load_progress
 
-__all__ = ["load_ledger"]
+__all__ = ["load_ledger", "completed_assignments", "load_progress"]
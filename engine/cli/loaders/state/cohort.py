@@ -0,0 +1,116 @@
+"""
+Cohort loader - Streams every learner under STATE_ROOT through the ledger.
+
+Each learner is reduced, in a worker process, to one sparse row: the
+per-module completed counts that are non-zero and the indices of the
+competencies the learner holds. Workers sync each student_state.yaml into
+the ledger first, so evidence recorded with `ledger record` is counted.
+Only the rows travel back to the parent.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Per-process state built once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def iter_state_files(state_root: Path) -> Iterator[Path]:
+    """STATE_ROOT/<learner_id>/student_state.yaml, in directory order."""
+    with os.scandir(state_root) as entries:
+        for entry in entries:
+            if entry.is_dir() and not entry.name.startswith("."):
+                path = Path(entry.path) / "student_state.yaml"
+                if path.is_file():
+                    yield path
+
+
+def _init_worker(state_root: str, school_root: str, module_ids: List[str], competencies: List[str]):
+    from engine.cli.core.progress import ProgressIndex
+    from engine.resolver.catalog import get_catalog
+    from engine.resolver.ledger import LedgerStore
+    from engine.resolver.planner import GapPlanner
+    from engine.resolver.resolver import CurriculumResolver
+
+    catalog = get_catalog([Path(school_root)])
+    planner = GapPlanner(CurriculumResolver([Path(school_root)]))
+    comp_index = {cid: i for i, cid in enumerate(planner.competency_ids)}
+    # Columns follow the parent's module order, not this process's scan order
+    _worker["modules"] = ProgressIndex({m: catalog.module_assignments.get(m, []) for m in module_ids})
+    _worker["planner"] = planner
+    _worker["ledger"] = LedgerStore.at(Path(state_root))
+    # Planner bit -> column in the cohort's competency list
+    _worker["columns"] = {comp_index[c]: col for col, c in enumerate(competencies) if c in comp_index}
+
+
+def scan_learner(path: str) -> Tuple[str, Optional[str], List[Tuple[int, int]], List[int], int]:
+    """
+    Reduce one state file to (learner_id, error, [(module column, done)],
+    [held competency columns], completed assignment count).
+    """
+    from engine.resolver.learner import LearnerProfile
+
+    learner_id = Path(path).parent.name
+    store = _worker["ledger"]
+    try:
+        store.sync_yaml(learner_id, Path(path))
+        state = store.load_state(learner_id)
+        completed = store.completed(learner_id)
+    except Exception as e:
+        return learner_id, str(e), [], [], 0
+
+    module_row = list(_worker["modules"].done_sparse(completed).items())
+    # Evidence (level >= 2) counts as practice when closing modules
+    known = _worker["planner"].known(LearnerProfile({**state, "tier_2_practiced": dict.fromkeys(completed, True)}))
+    columns = _worker["columns"]
+    held = [columns[bit] for bit in known if bit in columns]
+    return learner_id, None, module_row, held, len(completed)
+
+
+def stream_cohort(state_root: Path, school_root: Path, module_ids: List[str], competencies: List[str],
+                  workers: Optional[int] = None, chunksize: int = 64) -> Iterator[tuple]:
+    """
+    Yield scan_learner rows for every learner, in completion order.
+
+    Workers receive paths lazily, so at most a few chunks of rows are in
+    flight however large the cohort is. `workers=1` runs inline.
+    """
+    paths = (str(p) for p in iter_state_files(state_root))
+    workers = workers or os.cpu_count() or 1
+    init_args = (str(state_root), str(school_root), module_ids, competencies)
+    if workers == 1:
+        _init_worker(*init_args)
+        yield from map(scan_learner, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                             initializer=_init_worker, initargs=init_args) as pool:
+        yield from _bounded_map(pool, paths, chunksize, workers * 4)
+
+
+def _bounded_map(pool: ProcessPoolExecutor, items: Iterator[str], chunksize: int, max_pending: int) -> Iterator[tuple]:
+    """pool.map over chunks, never submitting more than `max_pending` chunks ahead."""
+    def chunks():
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    pending = deque()
+    for chunk in chunks():
+        pending.append(pool.submit(_scan_chunk, chunk))
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _scan_chunk(paths: List[str]) -> List[tuple]:
+    return [scan_learner(p) for p in paths]
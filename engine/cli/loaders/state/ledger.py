@@ -1,11 +1,26 @@
 """
-Ledger loader - Loads learner progress from student_state.yaml.
+Ledger loader - Loads learner progress from the learner ledger,
+synced from student_state.yaml when the file has been edited.
 """
 
+import sqlite3
 import yaml
-from typing import Set
+from typing import Any, Dict, Set
 
 from engine.config import get_learner_state_path
+from engine.resolver.ledger import ledger_for
+
+
+def completed_assignments(state: Dict[str, Any]) -> Set[str]:
+    """
+    Assignment IDs a state counts as completed (level >= 2): the `evidence`
+    section of the 4-tier model plus `tier_2_practiced` of the 3-tier files.
+    """
+    completed = set((state.get("evidence", None) or {}).keys())
+    practiced = state.get("tier_2_practiced", None) or {}
+    if isinstance(practiced, dict):
+        completed.update(practiced.keys())
+    return completed
 
 
 def load_ledger(learner_id: str = "local_user") -> Set[str]:
@@ -24,12 +39,15 @@ def load_ledger(learner_id: str = "local_user") -> Set[str]:
         return set()
     
     try:
-        with open(state_path) as f:
-            state = yaml.safe_load(f) or {}
-        
-        # New 4-tier model: progress is based on 'evidence' section
-        evidence = state.get("evidence", {})
-        completed = set(evidence.keys())
+        store, ledger_id = ledger_for(state_path)
+        try:
+            store.sync_yaml(ledger_id, state_path)
+            completed = store.completed(ledger_id)
+        except sqlite3.Error as e:
+            print(f"[WARN] Learner ledger unavailable ({e}); reading {state_path.name}")
+            with open(state_path) as f:
+                state = yaml.safe_load(f) or {}
+            completed = completed_assignments(state)
         
         print(f"[OK] Loaded student_state: {len(completed)} practiced assignments")
         return completed
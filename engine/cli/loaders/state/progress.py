@@ -0,0 +1,39 @@
+"""
+Progress loader - Reads precomputed progress counters from the ledger rollups.
+"""
+
+import sqlite3
+from typing import Dict, Optional
+
+from engine.config import get_learner_state_path
+from engine.resolver.catalog import Catalog
+from engine.resolver.ledger import ledger_for
+from engine.resolver.rollups import ProgressRollups
+
+
+def load_progress(catalog: Catalog, learner_id: str = "local_user") -> Optional[Dict[str, Dict[str, int]]]:
+    """
+    Load a learner's completed-assignment counters per scope.
+    Returns: {kind: {scope_id: completed}} for module, campaign, domain and
+    total; scopes without progress are absent.
+
+    Edits to student_state.yaml and newly recorded evidence are folded in
+    first. Returns None when there is no state file or the ledger is
+    unusable, so callers fall back to load_ledger.
+    """
+    state_path = get_learner_state_path(learner_id)
+    if not state_path.exists():
+        return None
+
+    try:
+        store, ledger_id = ledger_for(state_path)
+        store.sync_yaml(ledger_id, state_path)
+        rollups = ProgressRollups(store, catalog)
+        rollups.refresh([ledger_id])
+        counters = rollups.counters(ledger_id)
+
+        print(f"[OK] Loaded student_state: {rollups.completed_count(ledger_id)} practiced assignments")
+        return counters
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"[WARN] Progress rollups unavailable ({e}); recounting")
+        return None
@@ -1,5 +1,9 @@
 """
 Configuration - All paths and constants.
+
+SCHOOL_ROOT, STATE_ROOT and the paths under them are read from the
+environment when accessed, not at import, so entry points that set
+SCHOOL_ROOT / STATE_ROOT (runner sandboxes, bench workers) are always seen.
 """
 
 from pathlib import Path
@@ -8,21 +12,24 @@ import os
 # The Engine Root (where this code lives)
 ENGINE_ROOT = Path(__file__).parent
 
-# The School Root (Immutable Curriculum)
-# Default to ../school-content
-school_env = os.getenv("SCHOOL_ROOT")
-SCHOOL_ROOT = Path(school_env) if school_env else ENGINE_ROOT.parent / "school-content"
 
-# The State Root (Mutable Learner Data)
-# Default to ../learners
-state_env = os.getenv("STATE_ROOT")
-STATE_ROOT = Path(state_env) if state_env else ENGINE_ROOT.parent / "learners"
+def __getattr__(name: str) -> Path:
+    # The School Root (Immutable Curriculum), default ../school-content
+    if name == "SCHOOL_ROOT":
+        school_env = os.getenv("SCHOOL_ROOT")
+        return Path(school_env) if school_env else ENGINE_ROOT.parent / "school-content"
+    # The State Root (Mutable Learner Data), default ../learners
+    if name == "STATE_ROOT":
+        state_env = os.getenv("STATE_ROOT")
+        return Path(state_env) if state_env else ENGINE_ROOT.parent / "learners"
+    # Curriculum Paths
+    if name == "DOMAINS_PATH":
+        return __getattr__("SCHOOL_ROOT") / "domains"
+    if name == "PROJECTS_PATH":
+        return __getattr__("SCHOOL_ROOT") / "projects"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Curriculum Paths
-DOMAINS_PATH = SCHOOL_ROOT / "domains"
-PROJECTS_PATH = SCHOOL_ROOT / "projects"
 
 # Helper to get a specific learner's state file
 def get_learner_state_path(learner_id: str = "local_user") -> Path:
-    return STATE_ROOT / learner_id / "student_state.yaml"
-
+    return __getattr__("STATE_ROOT") / learner_id / "student_state.yaml"
@@ -0,0 +1,184 @@
+"""
+Curriculum Catalog.
+
+One scan of the school tree, shared by everything in a process that needs
+the curriculum structure: CurriculumResolver, the status CLI loaders and
+the runner. Files are parsed through the RegistryIndex, so a warm scan
+only stats them.
+
+Catalogs are cached per root; ArtifactWriter invalidates the cache when it
+writes, so later lookups in the same process see new artifacts. Parsed
+artifacts are shared between consumers and must be treated as read-only.
+"""
+
+import hashlib
+import json
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from engine.resolver.index import RegistryIndex, INDEX_FILENAME, parse_yaml_many
+
+
+class Catalog:
+    """Every curriculum YAML under the roots, parsed once and categorized."""
+
+    def __init__(self, roots: List[Path], index_path: Optional[Path] = None,
+                 use_index: bool = True, workers: Optional[int] = None):
+        self.roots = [Path(r) for r in roots]
+        self.workers = workers
+        # Parsed artifacts by file (with `_path` set), in scan order
+        self.artifacts: Dict[Path, Dict[str, Any]] = {}
+        self.errors: Dict[Path, Exception] = {}
+        self.index_error: Optional[Exception] = None
+
+        # Categorized by content, as CurriculumResolver always has
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self.campaigns: Dict[str, Dict[str, Any]] = {}
+        self.tracks: Dict[str, Dict[str, Any]] = {}
+
+        self.index: Optional[RegistryIndex] = None
+        if use_index and self.roots:
+            self.index = RegistryIndex(index_path or self.roots[0] / INDEX_FILENAME)
+        self._load()
+
+    def _scan_paths(self) -> List[Path]:
+        """Collect every candidate yaml file under the roots."""
+        paths = []
+        for root in self.roots:
+            if not root.exists():
+                continue
+            for yaml_path in root.rglob("*.yaml"):
+                if "learner_state" in str(yaml_path):
+                    continue
+                paths.append(yaml_path)
+        return paths
+
+    def _parse_all(self, paths: List[Path]) -> Dict[Path, Any]:
+        """Parse files, going through the on-disk index when available."""
+        if self.index:
+            try:
+                return self.index.load(paths, [r for r in self.roots if r.exists()], workers=self.workers)
+            except Exception as e:
+                self.index_error = e
+
+        raws: Dict[Path, Any] = {}
+        for yaml_path in paths:
+            try:
+                raws[yaml_path] = yaml_path.read_bytes()
+            except OSError as e:
+                raws[yaml_path] = e
+        readable = [p for p, raw in raws.items() if isinstance(raw, bytes)]
+        parsed = dict(zip(readable, parse_yaml_many([raws[p] for p in readable], self.workers)))
+        return {p: parsed.get(p, raws[p]) for p in paths}
+
+    def _load(self):
+        for yaml_path, data in self._parse_all(self._scan_paths()).items():
+            if isinstance(data, Exception):
+                self.errors[yaml_path] = data
+                continue
+            if not data or not isinstance(data, dict):
+                continue
+
+            data["_path"] = yaml_path
+            self.artifacts[yaml_path] = data
+
+            artifact_id = data.get("id")
+            if not artifact_id:
+                continue
+            if "assignments" in data or "produces" in data:
+                self.modules[artifact_id] = data
+            elif "modules" in data and "sub_goal" in data:
+                self.campaigns[artifact_id] = data
+            elif "campaigns" in data and "goal" in data:
+                self.tracks[artifact_id] = data
+
+    def _files(self, filename: str, subdir: str) -> List[Tuple[Path, Any]]:
+        """(path, parsed or Exception) for `filename` files under <root>/<subdir>, in scan order."""
+        tops = [r / subdir for r in self.roots]
+        found = []
+        for path, data in list(self.artifacts.items()) + list(self.errors.items()):
+            if path.name == filename and any(top in path.parents for top in tops):
+                found.append((path, data))
+        return found
+
+    @cached_property
+    def module_assignments(self) -> Dict[str, List[str]]:
+        """module.yaml files under domains/: {module_id: [full assignment IDs]}."""
+        modules = {}
+        for _, manifest in self._files("module.yaml", "domains"):
+            if isinstance(manifest, dict) and manifest.get("id"):
+                module_id = manifest["id"]
+                modules[module_id] = [f"{module_id}.{a}" for a in manifest.get("assignments", None) or []]
+        return modules
+
+    @cached_property
+    def campaign_assignments(self) -> Dict[str, List[str]]:
+        """
+        campaign.yaml files under projects/: {campaign_id: [assignment IDs]},
+        the campaign's own assignments followed by those of its modules.
+        """
+        campaigns = {}
+        for _, manifest in self._files("campaign.yaml", "projects"):
+            if not isinstance(manifest, dict) or not manifest.get("id"):
+                continue
+            assignments = list(manifest.get("assignments", None) or [])
+            for mid in self._module_refs(manifest):
+                assignments.extend(self.module_assignments.get(mid, []))
+            campaigns[manifest["id"]] = assignments
+        return campaigns
+
+    @cached_property
+    def missing_module_refs(self) -> List[Tuple[str, str]]:
+        """(campaign_id, module_id) for campaign.yaml references to unknown modules."""
+        missing = []
+        for _, manifest in self._files("campaign.yaml", "projects"):
+            if isinstance(manifest, dict) and manifest.get("id"):
+                missing.extend((manifest["id"], mid) for mid in self._module_refs(manifest)
+                               if mid not in self.module_assignments)
+        return missing
+
+    @staticmethod
+    def _module_refs(manifest: Dict[str, Any]) -> List[Any]:
+        # Handle both string IDs and dict objects
+        return [m.get("id") if isinstance(m, dict) else m for m in manifest.get("modules", None) or []]
+
+    @cached_property
+    def version(self) -> str:
+        """
+        Fingerprint of the progress-relevant structure (which assignments
+        each module and campaign contains). Unchanged by edits that do not
+        move assignments between scopes.
+        """
+        payload = json.dumps([sorted(self.module_assignments.items()), sorted(self.campaign_assignments.items())],
+                             separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+_shared: Dict[tuple, Catalog] = {}
+_shared_lock = threading.Lock()
+
+
+def get_catalog(roots: List[Path], index_path: Optional[Path] = None,
+                use_index: bool = True, workers: Optional[int] = None) -> Catalog:
+    """The process-wide catalog for these roots, scanning only on first use or after invalidate()."""
+    key = (tuple(str(Path(r).resolve()) for r in roots), str(index_path) if index_path else None, use_index)
+    with _shared_lock:
+        catalog = _shared.get(key)
+        if catalog is None:
+            catalog = Catalog(roots, index_path=index_path, use_index=use_index, workers=workers)
+            _shared[key] = catalog
+        return catalog
+
+
+def invalidate(path: Optional[Path] = None):
+    """Forget cached catalogs whose roots contain `path` (all of them when None)."""
+    with _shared_lock:
+        if path is None:
+            _shared.clear()
+            return
+        target = Path(path).resolve()
+        for key in list(_shared):
+            if any(target == Path(r) or Path(r) in target.parents or target in Path(r).parents for r in key[0]):
+                del _shared[key]
@@ -0,0 +1,225 @@
+"""
+Registry Index.
+Persistent on-disk cache of parsed curriculum YAML, so the resolver only
+re-parses files that are new or changed since the last scan.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+import yaml
+
+# Bump when the stored payload format changes; older rows are discarded.
+# 2: JSON payloads (1 stored pickles, which would run code from a planted index).
+INDEX_VERSION = 2
+
+INDEX_FILENAME = ".registry_index.sqlite"
+
+# Below this many files to parse, a process pool costs more than it saves
+PARALLEL_PARSE_MIN = 256
+
+# libyaml's loader accepts the same documents as SafeLoader, several times faster
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Payloads are JSON; YAML timestamps are stored as {_TIMESTAMP: [kind, isoformat]}
+_TIMESTAMP = "__yaml_timestamp__"
+
+
+def _encode(data: Any) -> Any:
+    """JSON-ready copy of parsed YAML. Raises TypeError for values JSON cannot round-trip."""
+    if data is None or isinstance(data, (str, bool, int, float)):
+        return data
+    if isinstance(data, list):
+        return [_encode(v) for v in data]
+    if isinstance(data, dict):
+        if _TIMESTAMP in data or not all(isinstance(k, str) for k in data):
+            raise TypeError("mapping keys do not round-trip through JSON")
+        return {k: _encode(v) for k, v in data.items()}
+    # datetime before date: it is a subclass
+    if isinstance(data, datetime.datetime):
+        return {_TIMESTAMP: ["datetime", data.isoformat()]}
+    if isinstance(data, datetime.date):
+        return {_TIMESTAMP: ["date", data.isoformat()]}
+    raise TypeError(f"{type(data).__name__} does not round-trip through JSON")
+
+
+def _decode_timestamp(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and _TIMESTAMP in obj:
+        kind, value = obj[_TIMESTAMP]
+        cls = datetime.datetime if kind == "datetime" else datetime.date
+        return cls.fromisoformat(value)
+    return obj
+
+
+def _dumps(data: Any) -> Optional[str]:
+    """Serialized payload, or None when the data cannot be stored faithfully."""
+    try:
+        return json.dumps(_encode(data), ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError, RecursionError):
+        return None
+
+
+def _loads(payload: str) -> Any:
+    if _TIMESTAMP in payload:
+        return json.loads(payload, object_hook=_decode_timestamp)
+    return json.loads(payload)
+
+
+def _parse_one(raw: bytes) -> Any:
+    try:
+        return yaml.load(raw, Loader=_LOADER)
+    except Exception as e:
+        # YAML error classes do not survive pickling back from a worker
+        return ValueError(str(e))
+
+
+def parse_yaml_many(raws: List[bytes], workers: Optional[int] = None) -> List[Any]:
+    """
+    Parse YAML documents; failures come back as Exception values.
+
+    Large batches fan out to a process pool (`workers` processes, default
+    CPU count); `workers=1` or a single CPU parses inline.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(raws) < PARALLEL_PARSE_MIN:
+        parsed = []
+        for raw in raws:
+            try:
+                parsed.append(yaml.load(raw, Loader=_LOADER))
+            except Exception as e:
+                parsed.append(e)
+        return parsed
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        return list(pool.map(_parse_one, raws, chunksize=max(1, len(raws) // (workers * 4))))
+
+
+class RegistryIndex:
+    """
+    SQLite-backed snapshot of parsed YAML artifacts.
+
+    Rows are keyed by absolute path and validated against (mtime, size).
+    When the stat changes but the content hash does not (e.g. a `touch` or a
+    fresh checkout), the cached payload is reused without parsing.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.parsed = 0
+        self.reused = 0
+        self.dropped = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " payload BLOB)"
+        )
+        return conn
+
+    def load(self, yaml_paths: Iterable[Path], scopes: Iterable[Path],
+             workers: Optional[int] = None) -> Dict[Path, Optional[Dict[str, Any]]]:
+        """
+        Return {path: parsed_data} for every path, re-parsing only what changed.
+
+        Rows under `scopes` that no longer exist on disk are dropped. Parse
+        errors propagate per file (as `Exception` values) so the caller can
+        warn exactly as it would without the index. Changed files are parsed
+        in one batch (see parse_yaml_many for `workers`).
+        """
+        results: Dict[Path, Any] = {}
+        scope_prefixes = [str(Path(s).resolve()) for s in scopes]
+
+        conn = self._connect()
+        try:
+            rows = {
+                path: (mtime_ns, size, digest, version, payload)
+                for path, mtime_ns, size, digest, version, payload
+                in conn.execute("SELECT path, mtime_ns, size, sha256, version, payload FROM artifacts")
+            }
+            seen = set()
+            # (yaml_path, key, stat, raw, digest) of files that need parsing
+            misses = []
+
+            for yaml_path in yaml_paths:
+                key = str(Path(yaml_path).resolve())
+                seen.add(key)
+                try:
+                    st = yaml_path.stat()
+                except OSError as e:
+                    results[yaml_path] = e
+                    continue
+
+                row = rows.get(key)
+                if row and row[3] == INDEX_VERSION and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                    results[yaml_path] = _loads(row[4])
+                    self.reused += 1
+                    continue
+
+                try:
+                    raw = yaml_path.read_bytes()
+                except OSError as e:
+                    results[yaml_path] = e
+                    continue
+                digest = hashlib.sha256(raw).hexdigest()
+
+                if row and row[3] == INDEX_VERSION and row[2] == digest:
+                    data = _loads(row[4])
+                    self.reused += 1
+                    results[yaml_path] = data
+                    self._store(conn, key, st, digest, data)
+                else:
+                    # Placeholder keeps results in input order
+                    results[yaml_path] = None
+                    misses.append((yaml_path, key, st, raw, digest))
+
+            parsed = parse_yaml_many([m[3] for m in misses], workers)
+            for (yaml_path, key, st, _, digest), data in zip(misses, parsed):
+                results[yaml_path] = data
+                if isinstance(data, Exception):
+                    continue
+                self.parsed += 1
+                self._store(conn, key, st, digest, data)
+
+            # Drop rows for deleted files (only within the scanned scopes)
+            stale = [
+                p for p in rows
+                if p not in seen and any(p == s or p.startswith(s + os.sep) for s in scope_prefixes)
+            ]
+            conn.executemany("DELETE FROM artifacts WHERE path = ?", [(p,) for p in stale])
+            self.dropped += len(stale)
+            conn.commit()
+        finally:
+            conn.close()
+
+        return results
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, key: str, st: os.stat_result, digest: str, data: Any):
+        payload = _dumps(data)
+        if payload is None:
+            # Not representable as JSON (e.g. !!binary, non-string keys): parse it every time
+            conn.execute("DELETE FROM artifacts WHERE path = ?", (key,))
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+            (key, st.st_mtime_ns, st.st_size, digest, INDEX_VERSION, payload),
+        )
+
+    def clear(self):
+        """Remove the on-disk index entirely."""
+        if self.db_path.exists():
+            self.db_path.unlink()
@@ -3,15 +3,67 @@ Learner State Management.
 Handles loading and querying of learner competencies.
 """
 
+import os
+import re
+import sqlite3
 import yaml
 from pathlib import Path
-from typing import Set, Dict, Any, List
+from typing import Set, Dict, Any, List, Iterable, Optional, Tuple
+
+from engine.resolver.ledger import ledger_for
+
+# Upper bound for the learner section of a prompt (LEARNER_SUMMARY_MAX_TOKENS)
+DEFAULT_SUMMARY_TOKENS = 1500
+
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local token estimate. Dotted IDs split into many short BPE pieces, so count
+    word/number/punctuation runs and never report less than chars/4.
+    """
+    return max(len(text) // 4, len(_TOKEN_PIECES.findall(text)))
+
+
+def _in_scope(entry: str, scope: Set[str], scope_prefixes: Set[str]) -> bool:
+    """An entry is relevant if it names, contains, or sits under a scope ID."""
+    if entry in scope_prefixes:
+        return True
+    parts = entry.split(".")
+    return any(".".join(parts[:n]) in scope for n in range(1, len(parts)))
+
+
+def _groups(entries: List[str], depth: int) -> Dict[str, List[str]]:
+    """Entries keyed by their first `depth` segments (shorter entries by themselves)."""
+    groups: Dict[str, List[str]] = {}
+    for e in entries:
+        parts = e.split(".")
+        key = ".".join(parts[:depth]) if len(parts) > depth else e
+        groups.setdefault(key, []).append(e)
+    return groups
+
+
+def _collapse(entries: List[str], depth: int, label: str) -> List[str]:
+    """Fold entries sharing their first `depth` segments into `prefix.* (N label)`."""
+    groups = _groups(entries, depth)
+    lines = []
+    for key in sorted(groups):
+        members = groups[key]
+        if len(members) > 1:
+            lines.append(f"{key}.* ({len(members)} {label})")
+        else:
+            lines.append(members[0])
+    return lines
 
 class LearnerProfile:
     """Represents the current state of a learner (mocks or real)."""
     
     def __init__(self, data: Dict[str, Any] = None):
         self._data = data or {}
+        # Set by load() when the state is backed by a LedgerStore
+        self._ledger = None
+        self.learner_id: Optional[str] = None
         
         # V2: 3-Tier Competence Model
         self.tier_1_claims: List[str] = self._data.get("tier_1_claims", []) or []
@@ -30,14 +82,35 @@ class LearnerProfile:
             self.tier_1_claims = self._data.get("competencies", [])
 
     @classmethod
-    def load(cls, path: Path) -> "LearnerProfile":
+    def load(cls, path: Path, use_ledger: bool = True) -> "LearnerProfile":
+        """
+        Load a learner's state. Files in the STATE_ROOT/<learner_id>/ layout
+        go through the learner ledger, which re-parses them only after an edit.
+        """
         if not path.exists():
             raise FileNotFoundError(f"Learner state file not found: {path}")
+        located = ledger_for(path) if use_ledger else None
+        if located:
+            store, learner_id = located
+            try:
+                store.sync_yaml(learner_id, path)
+                profile = cls(store.load_state(learner_id))
+                profile._ledger, profile.learner_id = store, learner_id
+                return profile
+            except sqlite3.Error:
+                # Read-only or locked-out state dirs still load from the file
+                pass
         data = yaml.safe_load(path.read_text())
         return cls(data)
 
     def has_competency(self, competency_id: str) -> bool:
         """Check if a competency is known at ANY tier."""
+        if self._ledger is not None:
+            # Indexed lookup; also sees evidence recorded since load(). Legacy
+            # `competencies` synced before they were imported as claims are
+            # still in tier_1_claims.
+            return (self._ledger.has_competency(self.learner_id, competency_id)
+                    or competency_id in self.tier_1_claims)
         if competency_id in self.tier_3_verified:
             return True
         if competency_id in self.tier_2_practiced:
@@ -46,40 +119,120 @@ class LearnerProfile:
             return True
         return False
 
-    def to_prompt_string(self) -> str:
-        """Convert state to a prompt-friendly summary."""
-        sections = []
+    def to_prompt_string(self, scope: Optional[Iterable[str]] = None, max_tokens: Optional[int] = None) -> str:
+        """
+        Convert state to a prompt-friendly summary.
+
+        `scope` (competency/module IDs of the goal's registry subgraph) drops
+        unrelated evidence. If the summary still exceeds `max_tokens`
+        (default LEARNER_SUMMARY_MAX_TOKENS), shared dotted prefixes are
+        collapsed a level at a time across all tiers, and only then are the
+        weakest tiers cut.
+        Small, unscoped profiles render exactly as a full listing.
+        """
+        if max_tokens is None:
+            max_tokens = int(os.getenv("LEARNER_SUMMARY_MAX_TOKENS", DEFAULT_SUMMARY_TOKENS))
+        
+        # (header lines, entries, collapse label, omitted by scope), strongest evidence first
+        tiers: List[Tuple[List[str], List[str], str, int]] = []
+        scope_set = set(scope) if scope is not None else None
+        scope_prefixes: Set[str] = set()
+        for sid in scope_set or ():
+            parts = sid.split(".")
+            scope_prefixes.update(".".join(parts[:n]) for n in range(1, len(parts) + 1))
+        
+        for header, entries, label in [
+            (["# Tier 3 — VERIFIED Competencies (Exam-Proven Mastery):",
+              "These concepts are PROVEN. DO NOT reteach them."],
+             sorted(self.tier_3_verified.keys()), "verified"),
+            (["# Tier 2 — PRACTICED Assignments (Completed Work):",
+              "These assignments have been submitted. The learner has exposure to these topics."],
+             sorted(self.tier_2_practiced.keys()), "practiced"),
+            (["# Tier 1 — SELF-REPORTED Claims (Unverified):",
+              "The learner CLAIMS to know these. Trust for skipping intro material, but do not treat as proven."],
+             sorted(c for c in self.tier_1_claims if c), "claimed"),
+        ]:
+            if not entries:
+                continue
+            kept = entries if scope_set is None else [e for e in entries if _in_scope(e, scope_set, scope_prefixes)]
+            tiers.append((header, kept, label, len(entries) - len(kept)))
+        
+        def render(tier_lines: List[List[str]]) -> str:
+            sections = []
+            if self.knowledge_desc:
+                sections.append(f"Profile Description: {self.knowledge_desc}")
+            for (header, _, _, omitted), lines in zip(tiers, tier_lines):
+                body = [f"  - {line}" for line in lines]
+                if omitted:
+                    body.append(f"  - ({omitted} entries unrelated to this goal omitted)")
+                if body:
+                    sections.append("\n".join(header + body))
+            if not tiers:
+                sections.append("No prior knowledge reported. Treat as a complete beginner.")
+            elif not any(kept for _, kept, _, _ in tiers):
+                sections.append("No prior knowledge relevant to this goal. Treat as a beginner for it.")
+            return "\n\n".join(sections)
+        
+        tier_lines = [kept for _, kept, _, _ in tiers]
+        text = render(tier_lines)
+        if estimate_tokens(text) <= max_tokens:
+            return text
         
-        # Description
-        if self.knowledge_desc:
-            sections.append(f"Profile Description: {self.knowledge_desc}")
+        # Collapse shared prefixes until the budget holds: one level at a time
+        # across all tiers, weakest tier first within a level, so verified
+        # evidence keeps its detail longest without crushing the other tiers
+        deepest = [max((len(e.split(".")) for e in kept), default=1) for _, kept, _, _ in tiers]
+        depths = list(deepest)
         
-        # Tier 3: Verified (strongest evidence)
-        if self.tier_3_verified:
-            lines = ["# Tier 3 — VERIFIED Competencies (Exam-Proven Mastery):"]
-            lines.append("These concepts are PROVEN. DO NOT reteach them.")
-            for comp in sorted(self.tier_3_verified.keys()):
-                lines.append(f"  - {comp}")
-            sections.append("\n".join(lines))
-            
-        # Tier 2: Practiced  
-        if self.tier_2_practiced:
-            lines = ["# Tier 2 — PRACTICED Assignments (Completed Work):"]
-            lines.append("These assignments have been submitted. The learner has exposure to these topics.")
-            for comp in sorted(self.tier_2_practiced.keys()):
-                lines.append(f"  - {comp}")
-            sections.append("\n".join(lines))
-            
-        # Tier 1: Claims
-        if self.tier_1_claims:
-            lines = ["# Tier 1 — SELF-REPORTED Claims (Unverified):"]
-            lines.append("The learner CLAIMS to know these. Trust for skipping intro material, but do not treat as proven.")
-            for comp in sorted(self.tier_1_claims):
-                lines.append(f"  - {comp}")
-            sections.append("\n".join(lines))
+        fitted = False
+        for depth in range(max(deepest, default=1) - 1, 0, -1):
+            for i in reversed(range(len(tiers))):
+                if depths[i] > depth:
+                    depths[i] = depth
+                    tier_lines[i] = _collapse(tiers[i][1], depth, tiers[i][2])
+                    if estimate_tokens(render(tier_lines)) <= max_tokens:
+                        fitted = True
+                        break
+            if fitted:
+                break
+        if fitted:
+            # The last level may overshoot: give detail back, strongest tier
+            # first, one collapsed group at a time while the budget holds
+            for i in range(len(tiers)):
+                _, kept, label, _ = tiers[i]
+                while depths[i] < deepest[i]:
+                    groups = _groups(kept, depths[i])
+                    blocks = [_collapse(groups[key], depths[i], label) for key in sorted(groups)]
+                    expanded_all = True
+                    for b, key in enumerate(sorted(groups)):
+                        if len(groups[key]) == 1:
+                            continue
+                        trial = blocks[:b] + [_collapse(groups[key], depths[i] + 1, label)] + blocks[b + 1:]
+                        lines = [line for block in trial for line in block]
+                        if estimate_tokens(render(tier_lines[:i] + [lines] + tier_lines[i + 1:])) > max_tokens:
+                            expanded_all = False
+                            continue
+                        blocks = trial
+                        tier_lines[i] = lines
+                    if not expanded_all:
+                        break
+                    depths[i] += 1
+            return render(tier_lines)
         
-        if not self.tier_1_claims and not self.tier_2_practiced and not self.tier_3_verified:
-            sections.append("No prior knowledge reported. Treat as a complete beginner.")
-            
-        return "\n\n".join(sections)
+        # Still over: truncate the weakest tiers first, keeping as many lines as fit
+        for i in reversed(range(len(tier_lines))):
+            full = tier_lines[i]
+            lo, hi = 0, len(full)
+            while lo < hi:
+                n = (lo + hi + 1) // 2
+                tier_lines[i] = full[:n] + [f"... ({len(full) - n} more not shown)"]
+                if estimate_tokens(render(tier_lines)) <= max_tokens:
+                    lo = n
+                else:
+                    hi = n - 1
+            tier_lines[i] = full if lo == len(full) else full[:lo] + [f"... ({len(full) - lo} more not shown)"]
+            text = render(tier_lines)
+            if estimate_tokens(text) <= max_tokens:
+                break
+        return text
 
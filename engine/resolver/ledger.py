@@ -0,0 +1,403 @@
+"""
+Learner Ledger.
+
+SQLite store (WAL mode) for learner evidence, shared by every learner under
+a STATE_ROOT. Writes are appended to an event log and folded, in the same
+transaction, into an indexed table of current entries, so concurrent
+grading workers can record evidence without rewriting a YAML file and
+readers look entries up by learner, tier and competency without parsing.
+
+student_state.yaml stays the hand-editable format. sync_yaml() imports a
+file only when it changed since the last import or export, and applies
+just the edits made to it (a three-way diff against the last synced
+snapshot), so evidence recorded in the ledger meanwhile is kept.
+export_yaml() writes the current state back in the same layout; YAML
+comments are not preserved.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+LEDGER_FILENAME = ".ledger.sqlite"
+
+# Bump when the schema changes; older ledgers are rebuilt from their YAML files.
+LEDGER_VERSION = 1
+
+# Sections of student_state.yaml held as ledger entries (tier_1_claims is a list)
+SECTIONS = ("tier_1_claims", "tier_2_practiced", "tier_3_verified", "evidence")
+
+# Sections has_competency consults, as LearnerProfile always has
+COMPETENCY_SECTIONS = ("tier_1_claims", "tier_2_practiced", "tier_3_verified")
+
+# Sections whose keys count as completed assignments (level >= 2)
+COMPLETED_SECTIONS = ("evidence", "tier_2_practiced")
+
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _dump(payload: Any) -> Optional[str]:
+    # YAML timestamps come back as strings on export, as the files quote them anyway
+    return None if payload is None else json.dumps(payload, sort_keys=True, default=str)
+
+
+def _load(payload: Optional[str]) -> Any:
+    return None if payload is None else json.loads(payload)
+
+
+def _flatten(doc: Dict[str, Any]) -> Dict[Tuple[str, str], Optional[str]]:
+    """{(section, key): serialized payload} for the ledger sections of a state document."""
+    flat = {}
+    for section in SECTIONS:
+        value = doc.get(section, None) or {}
+        if section == "tier_1_claims" and not value:
+            # Legacy files list claims under `competencies`, as LearnerProfile reads them
+            value = doc.get("competencies", None) or []
+        if section == "tier_1_claims":
+            for claim in value if isinstance(value, list) else []:
+                if claim:
+                    flat[(section, str(claim))] = None
+        elif isinstance(value, dict):
+            for key, payload in value.items():
+                flat[(section, str(key))] = _dump(payload)
+    return flat
+
+
+class LedgerStore:
+    """Append-only evidence events plus an indexed view of current entries."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._ready = False
+
+    @classmethod
+    def at(cls, state_root: Path) -> "LedgerStore":
+        """The ledger shared by every learner under `state_root`."""
+        return cls(Path(state_root) / LEDGER_FILENAME)
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        A connection to the ledger, schema in place. Autocommit: writers
+        open BEGIN IMMEDIATE themselves and wait on the lock.
+        """
+        if self._ready:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            return conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        # WAL is persistent; readers never block the appending writer
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != LEDGER_VERSION:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != LEDGER_VERSION:
+                for table in ("events", "entries", "documents"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(
+                    "CREATE TABLE events ("
+                    " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " learner_id TEXT NOT NULL,"
+                    " section TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " payload TEXT,"
+                    " op TEXT NOT NULL,"
+                    " source TEXT NOT NULL,"
+                    " recorded_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE entries ("
+                    " learner_id TEXT NOT NULL,"
+                    " section TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " payload TEXT,"
+                    " seq INTEGER NOT NULL,"
+                    " PRIMARY KEY (learner_id, section, key)) WITHOUT ROWID"
+                )
+                # Competency / assignment -> learners, for class-wide lookups
+                conn.execute("CREATE INDEX entries_by_key ON entries (key, section)")
+                conn.execute(
+                    "CREATE TABLE documents ("
+                    " learner_id TEXT PRIMARY KEY,"
+                    " path TEXT NOT NULL,"
+                    " mtime_ns INTEGER NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " sha256 TEXT NOT NULL,"
+                    " snapshot TEXT NOT NULL)"
+                )
+                conn.execute(f"PRAGMA user_version = {LEDGER_VERSION}")
+            conn.execute("COMMIT")
+        # A learner's events in order, for consumers that follow the log (rollups)
+        conn.execute("CREATE INDEX IF NOT EXISTS events_by_learner ON events (learner_id, seq)")
+        self._ready = True
+        return conn
+
+    # --- Writes ---
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, learner_id: str, changes: Iterable[Tuple[str, str, Optional[str], str]],
+               source: str) -> int:
+        """Append (section, key, payload, op) events and fold them into entries."""
+        now = time.time()
+        n = 0
+        for section, key, payload, op in changes:
+            if section not in SECTIONS:
+                raise ValueError(f"Unknown ledger section: {section}")
+            seq = conn.execute(
+                "INSERT INTO events (learner_id, section, key, payload, op, source, recorded_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (learner_id, section, key, payload, op, source, now),
+            ).lastrowid
+            if op == "put":
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                             (learner_id, section, key, payload, seq))
+            else:
+                conn.execute("DELETE FROM entries WHERE learner_id = ? AND section = ? AND key = ?",
+                             (learner_id, section, key))
+            n += 1
+        return n
+
+    def record(self, learner_id: str, section: str, key: str, payload: Any = None, source: str = "ledger") -> int:
+        """Record one piece of evidence; returns the number of events appended."""
+        return self.record_many(learner_id, [(section, key, payload)], source=source)
+
+    def record_many(self, learner_id: str, entries: Iterable[Tuple[str, str, Any]], source: str = "ledger") -> int:
+        """Record several (section, key, payload) entries in one transaction."""
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            n = self._apply(conn, learner_id, ((s, k, _dump(p), "put") for s, k, p in entries), source)
+            conn.execute("COMMIT")
+            return n
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def remove(self, learner_id: str, section: str, key: str, source: str = "ledger") -> int:
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            n = self._apply(conn, learner_id, [(section, key, None, "delete")], source)
+            conn.execute("COMMIT")
+            return n
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # --- Reads ---
+
+    def has_competency(self, learner_id: str, competency_id: str) -> bool:
+        """Known at ANY tier (claimed, practiced or verified)."""
+        conn = self.connect()
+        try:
+            row = conn.execute(
+                f"SELECT 1 FROM entries WHERE learner_id = ? AND key = ?"
+                f" AND section IN ({','.join('?' * len(COMPETENCY_SECTIONS))}) LIMIT 1",
+                (learner_id, competency_id, *COMPETENCY_SECTIONS),
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    def entries(self, learner_id: str, section: Optional[str] = None) -> List[Tuple[str, str, Any]]:
+        """(section, key, payload) for a learner, optionally one section, in recording order."""
+        conn = self.connect()
+        try:
+            if section:
+                rows = conn.execute("SELECT section, key, payload FROM entries"
+                                    " WHERE learner_id = ? AND section = ? ORDER BY seq", (learner_id, section))
+            else:
+                rows = conn.execute("SELECT section, key, payload FROM entries"
+                                    " WHERE learner_id = ? ORDER BY seq", (learner_id,))
+            return [(s, k, _load(p)) for s, k, p in rows]
+        finally:
+            conn.close()
+
+    def completed(self, learner_id: str) -> Set[str]:
+        """Completed assignment IDs: `evidence` plus `tier_2_practiced` keys."""
+        conn = self.connect()
+        try:
+            rows = conn.execute(
+                f"SELECT key FROM entries WHERE learner_id = ?"
+                f" AND section IN ({','.join('?' * len(COMPLETED_SECTIONS))})",
+                (learner_id, *COMPLETED_SECTIONS),
+            )
+            return {key for key, in rows}
+        finally:
+            conn.close()
+
+    def learners_with(self, key: str, section: Optional[str] = None) -> List[str]:
+        """Learners holding `key` (in `section`, or any section)."""
+        conn = self.connect()
+        try:
+            if section:
+                rows = conn.execute("SELECT DISTINCT learner_id FROM entries WHERE key = ? AND section = ?",
+                                    (key, section))
+            else:
+                rows = conn.execute("SELECT DISTINCT learner_id FROM entries WHERE key = ?", (key,))
+            return sorted(lid for lid, in rows)
+        finally:
+            conn.close()
+
+    def learner_ids(self) -> List[str]:
+        conn = self.connect()
+        try:
+            rows = conn.execute("SELECT learner_id FROM documents UNION SELECT DISTINCT learner_id FROM entries")
+            return sorted(lid for lid, in rows)
+        finally:
+            conn.close()
+
+    def load_state(self, learner_id: str) -> Dict[str, Any]:
+        """
+        The learner's state in student_state.yaml layout: the last synced
+        document with its ledger sections replaced by the current entries.
+        """
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT snapshot FROM documents WHERE learner_id = ?", (learner_id,)).fetchone()
+            rows = conn.execute("SELECT section, key, payload FROM entries WHERE learner_id = ? ORDER BY seq",
+                                (learner_id,)).fetchall()
+        finally:
+            conn.close()
+        return self._compose(json.loads(row[0]) if row else {}, rows)
+
+    @staticmethod
+    def _compose(snapshot: Dict[str, Any], rows: Iterable[Tuple[str, str, Optional[str]]]) -> Dict[str, Any]:
+        sections: Dict[str, Any] = {}
+        for section, key, payload in rows:
+            if section == "tier_1_claims":
+                sections.setdefault(section, []).append(key)
+            else:
+                sections.setdefault(section, {})[key] = _load(payload)
+        doc = {}
+        for key, value in snapshot.items():
+            if key in SECTIONS:
+                doc[key] = sections.pop(key, [] if key == "tier_1_claims" else {})
+            else:
+                doc[key] = value
+        # Sections first recorded through the ledger go last, in canonical order
+        for section in SECTIONS:
+            if section in sections:
+                doc[section] = sections[section]
+        return doc
+
+    # --- YAML interchange ---
+
+    def sync_yaml(self, learner_id: str, path: Path, force: bool = False) -> bool:
+        """
+        Import edits made to `path` since it was last synced. Unchanged files
+        cost one stat. Returns True when the file was (re)imported.
+        """
+        path = Path(path)
+        st = path.stat()
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT mtime_ns, size, sha256, snapshot FROM documents WHERE learner_id = ?",
+                               (learner_id,)).fetchone()
+            if row and not force and (row[0], row[1]) == (st.st_mtime_ns, st.st_size):
+                return False
+
+            raw = path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            conn.execute("BEGIN IMMEDIATE")
+            # Another process may have imported while we waited for the lock
+            row = conn.execute("SELECT mtime_ns, size, sha256, snapshot FROM documents WHERE learner_id = ?",
+                               (learner_id,)).fetchone()
+            if row and not force and row[2] == digest:
+                conn.execute("UPDATE documents SET mtime_ns = ?, size = ? WHERE learner_id = ?",
+                             (st.st_mtime_ns, st.st_size, learner_id))
+                conn.execute("COMMIT")
+                return False
+
+            doc = yaml.load(raw, Loader=_LOADER) or {}
+            if not isinstance(doc, dict):
+                raise ValueError(f"{path} is not a mapping")
+            before = _flatten(json.loads(row[3])) if row else {}
+            after = _flatten(doc)
+            changes = [(s, k, p, "put") for (s, k), p in after.items() if (s, k) not in before or before[(s, k)] != p]
+            changes += [(s, k, None, "delete") for (s, k) in before if (s, k) not in after]
+            self._apply(conn, learner_id, changes, source="yaml")
+            conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                         (learner_id, str(path), st.st_mtime_ns, st.st_size, digest,
+                          json.dumps(doc, default=str)))
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def export_yaml(self, learner_id: str, path: Path) -> Dict[str, Any]:
+        """Write the learner's current state to `path` (atomically) and mark it synced."""
+        path = Path(path)
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT snapshot FROM documents WHERE learner_id = ?", (learner_id,)).fetchone()
+            rows = conn.execute("SELECT section, key, payload FROM entries WHERE learner_id = ? ORDER BY seq",
+                                (learner_id,)).fetchall()
+            doc = self._compose(json.loads(row[0]) if row else {}, rows)
+            raw = yaml.safe_dump(doc, sort_keys=False, allow_unicode=True).encode("utf-8")
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+            st = path.stat()
+            conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                         (learner_id, str(path), st.st_mtime_ns, st.st_size,
+                          hashlib.sha256(raw).hexdigest(), json.dumps(doc, default=str)))
+            conn.execute("COMMIT")
+            return doc
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def compact(self) -> int:
+        """
+        Drop events superseded by a later one for the same entry. Returns
+        events removed. With progress rollups in the ledger, use
+        rollups.compact_ledger(), which keeps events they have not read.
+        """
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            removed = conn.execute("DELETE FROM events WHERE seq NOT IN (SELECT seq FROM entries)").rowcount
+            conn.execute("COMMIT")
+            conn.execute("VACUUM")
+            return removed
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+def ledger_for(state_path: Path) -> Optional[Tuple[LedgerStore, str]]:
+    """
+    (store, learner_id) for a file in the STATE_ROOT/<learner_id>/student_state.yaml
+    layout; None for state files kept anywhere else.
+    """
+    state_path = Path(state_path)
+    if state_path.name != "student_state.yaml":
+        return None
+    return LedgerStore.at(state_path.parent.parent), state_path.parent.name
@@ -0,0 +1,283 @@
+"""
+Gap Planner.
+Deterministic, AI-free planning over the requires/produces graph:
+
+    compute_delta(goal, learner_state) -> missing competencies
+    resolve_modules(goal, learner_state) -> minimal, topologically ordered modules
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, List, Set, Iterable, Optional
+
+from engine.resolver.learner import LearnerProfile
+from engine.resolver.resolver import CurriculumResolver
+
+
+class Bitset:
+    """Fixed-size bitset over interned integer IDs."""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, size: int):
+        self._bits = bytearray((size + 7) >> 3)
+
+    def add(self, i: int):
+        self._bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, i: int) -> bool:
+        return bool(self._bits[i >> 3] >> (i & 7) & 1)
+
+    def __iter__(self):
+        """Set IDs in ascending order, skipping empty bytes."""
+        for byte_index, byte in enumerate(self._bits):
+            if byte:
+                base = byte_index << 3
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + bit
+
+
+class Plan:
+    """Result of a planning pass."""
+
+    def __init__(self, targets: List[str], modules: List[str], missing: Set[str],
+                 unresolved: Set[str], cyclic: Optional[List[str]] = None):
+        self.targets = targets
+        self.modules = modules          # Topologically ordered module IDs
+        self.missing = missing          # Competencies the learner must acquire
+        self.unresolved = unresolved    # Missing competencies no module produces
+        self.cyclic = cyclic or []      # Modules left over by a dependency cycle
+
+    @property
+    def covered(self) -> bool:
+        """True when the registry alone closes every gap."""
+        return not self.unresolved
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "targets": self.targets,
+            "modules": self.modules,
+            "missing": sorted(self.missing),
+            "unresolved": sorted(self.unresolved),
+            "cyclic": self.cyclic,
+        }
+
+
+class GapPlanner:
+    """
+    Computes the minimal module set that closes a learner's gap to a goal.
+
+    Competency and module IDs are interned to dense integers once per
+    registry; planning then walks integer adjacency lists with bitsets for
+    the known / covered / queued frontiers, so a pass is linear in the size
+    of the subgraph it touches.
+
+    A module ID is also treated as a competency produced by that module, so
+    `requires` entries may name either (mirroring CurriculumResolver).
+    """
+
+    def __init__(self, resolver: CurriculumResolver):
+        self.resolver = resolver
+        self._comp_ids: List[str] = []
+        self._comp_index: Dict[str, int] = {}
+        self._prefix_index: Optional[Dict[str, List[int]]] = None
+
+        self._module_ids: List[str] = sorted(resolver.modules)
+        self._module_index: Dict[str, int] = {mid: i for i, mid in enumerate(self._module_ids)}
+        self._produces: List[List[int]] = []
+        self._requires: List[List[int]] = []
+        self._assignments: List[List[str]] = []
+        self._producers: List[List[int]] = []
+
+        for mid in self._module_ids:
+            mod = resolver.modules[mid]
+            produced = [self._intern(mid)] + [self._intern(c) for c in mod.get("produces", None) or []]
+            self._produces.append(sorted(set(produced)))
+            self._requires.append(sorted({self._intern(r) for r in mod.get("requires", None) or []}))
+            self._assignments.append([f"{mid}.{a}" for a in mod.get("assignments", None) or []])
+
+        for mi, produced in enumerate(self._produces):
+            for ci in produced:
+                self._producers[ci].append(mi)
+
+    def _intern(self, comp_id: str) -> int:
+        ci = self._comp_index.get(comp_id)
+        if ci is None:
+            ci = len(self._comp_ids)
+            self._comp_index[comp_id] = ci
+            self._comp_ids.append(comp_id)
+            self._producers.append([])
+        return ci
+
+    def _prefixes(self) -> Dict[str, List[int]]:
+        """Dotted prefix -> competency indices under it (built lazily)."""
+        if self._prefix_index is None:
+            index: Dict[str, List[int]] = {}
+            for ci, cid in enumerate(self._comp_ids):
+                parts = cid.split(".")
+                for n in range(1, len(parts) + 1):
+                    index.setdefault(".".join(parts[:n]), []).append(ci)
+            self._prefix_index = index
+        return self._prefix_index
+
+    def known(self, learner: LearnerProfile, trust_claims: bool = False) -> Bitset:
+        """
+        Competencies the learner already holds.
+
+        Tier 3 keys close the competency (or whole dotted cluster) they name,
+        and a verified module closes everything it produces. A module whose
+        assignments all appear in Tier 2 counts as practiced. Tier 1 claims
+        are only trusted when `trust_claims` is set.
+        """
+        known = Bitset(len(self._comp_ids))
+        evidence = set(learner.tier_3_verified) | set(learner.tier_2_practiced)
+        if trust_claims:
+            evidence.update(c for c in learner.tier_1_claims if c)
+
+        prefixes = self._prefixes()
+        for key in evidence:
+            for ci in prefixes.get(key, ()):
+                known.add(ci)
+            mi = self._module_index.get(key)
+            if mi is not None:
+                for ci in self._produces[mi]:
+                    known.add(ci)
+
+        # Only modules owning a practiced assignment can be fully practiced
+        practiced = set(learner.tier_2_practiced)
+        touched = set()
+        for key in practiced:
+            parts = key.split(".")
+            for n in range(1, len(parts)):
+                mi = self._module_index.get(".".join(parts[:n]))
+                if mi is not None:
+                    touched.add(mi)
+        for mi in touched:
+            assignments = self._assignments[mi]
+            if assignments and all(a in practiced for a in assignments):
+                for ci in self._produces[mi]:
+                    known.add(ci)
+        return known
+
+    @property
+    def competency_ids(self) -> List[str]:
+        """Interned competency IDs; ID i is bit i of known()."""
+        return self._comp_ids
+
+    def compute_delta(self, targets: Iterable[str], learner: LearnerProfile, trust_claims: bool = False) -> Set[str]:
+        """Target competencies the learner does not yet hold."""
+        known = self.known(learner, trust_claims)
+        return {
+            t for t in targets
+            if t not in self._comp_index or self._comp_index[t] not in known
+        }
+
+    def resolve_modules(self, targets: Iterable[str], learner: LearnerProfile, trust_claims: bool = False) -> Plan:
+        """
+        Select the fewest modules whose `produces` cover every missing target,
+        expanding transitive `requires` breadth-first.
+
+        When several modules produce the same competency, the one covering the
+        most still-outstanding competencies wins, then the one with fewer
+        unmet requirements, then the lowest ID — so plans are reproducible.
+        """
+        targets = list(dict.fromkeys(targets))
+        known = self.known(learner, trust_claims)
+        covered = Bitset(len(self._comp_ids))
+        queued = Bitset(len(self._comp_ids))
+
+        missing: Set[str] = set()
+        unresolved: Set[str] = set()
+        selected: List[int] = []
+        provided_by: Dict[int, int] = {}
+
+        frontier = deque()
+        for t in targets:
+            ci = self._comp_index.get(t)
+            if ci is None:
+                missing.add(t)
+                unresolved.add(t)
+            elif ci not in known and ci not in queued:
+                queued.add(ci)
+                frontier.append(ci)
+
+        while frontier:
+            ci = frontier.popleft()
+            missing.add(self._comp_ids[ci])
+            if ci in covered:
+                continue
+
+            candidates = self._producers[ci]
+            if not candidates:
+                unresolved.add(self._comp_ids[ci])
+                continue
+
+            def rank(mi: int):
+                gain = sum(1 for c in self._produces[mi] if c in queued and c not in covered)
+                cost = sum(1 for r in self._requires[mi] if r not in known and r not in covered)
+                return (-gain, cost, self._module_ids[mi])
+
+            best = min(candidates, key=rank)
+            selected.append(best)
+            for c in self._produces[best]:
+                if c not in covered:
+                    covered.add(c)
+                    provided_by[c] = best
+            for r in self._requires[best]:
+                if r not in known and r not in queued:
+                    queued.add(r)
+                    frontier.append(r)
+
+        ordered, cyclic = self._toposort(selected, provided_by)
+        return Plan(targets, ordered, missing, unresolved, cyclic)
+
+    def subgraph(self, targets: Iterable[str]) -> Set[str]:
+        """
+        Competency and module IDs a goal can touch: the targets, every module
+        producing them, and transitively everything those modules require.
+        """
+        seen = Bitset(len(self._comp_ids))
+        ids: Set[str] = set()
+        frontier = deque()
+        for t in targets:
+            ids.add(t)
+            ci = self._comp_index.get(t)
+            if ci is not None and ci not in seen:
+                seen.add(ci)
+                frontier.append(ci)
+        while frontier:
+            ci = frontier.popleft()
+            ids.add(self._comp_ids[ci])
+            for mi in self._producers[ci]:
+                ids.add(self._module_ids[mi])
+                for c in self._produces[mi] + self._requires[mi]:
+                    if c not in seen:
+                        seen.add(c)
+                        frontier.append(c)
+        return ids
+
+    def _toposort(self, selected: List[int], provided_by: Dict[int, int]):
+        """Kahn's algorithm over the chosen modules; ties broken by module ID."""
+        chosen = set(selected)
+        indegree = {mi: 0 for mi in chosen}
+        dependents: Dict[int, List[int]] = {mi: [] for mi in chosen}
+        for mi in chosen:
+            deps = {provided_by[r] for r in self._requires[mi] if r in provided_by} - {mi}
+            for dep in deps:
+                dependents[dep].append(mi)
+                indegree[mi] += 1
+
+        heap = [(self._module_ids[mi], mi) for mi, d in indegree.items() if d == 0]
+        heapq.heapify(heap)
+        ordered = []
+        while heap:
+            _, mi = heapq.heappop(heap)
+            ordered.append(self._module_ids[mi])
+            for nxt in dependents[mi]:
+                indegree[nxt] -= 1
+                if indegree[nxt] == 0:
+                    heapq.heappush(heap, (self._module_ids[nxt], nxt))
+
+        cyclic = sorted(self._module_ids[mi] for mi, d in indegree.items() if d > 0)
+        return ordered + cyclic, cyclic
@@ -1,8 +1,10 @@
-import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from rich.console import Console
 
+from engine.resolver.catalog import get_catalog
+from engine.resolver.index import RegistryIndex
+
 console = Console()
 
 class CurriculumResolver:
@@ -11,48 +13,42 @@ class CurriculumResolver:
     Ensures IDs are unique and dependencies are resolvable.
     """
 
-    def __init__(self, search_dirs: List[Path]):
+    def __init__(self, search_dirs: List[Path], index_path: Optional[Path] = None, use_index: bool = True):
         self.search_dirs = search_dirs
         self.modules: Dict[str, Dict[str, Any]] = {}
         self.campaigns: Dict[str, Dict[str, Any]] = {}
         self.tracks: Dict[str, Dict[str, Any]] = {}
+        # Inverted index: competency ID -> IDs of modules that produce it
+        self.producers: Dict[str, List[str]] = {}
+
+        # One shared scan per process (persisted in the on-disk registry index
+        # under the first search dir, the school root, unless disabled)
+        self.catalog = get_catalog(search_dirs, index_path=index_path, use_index=use_index)
+        self.index: Optional[RegistryIndex] = self.catalog.index
         self._load_all()
 
     def _load_all(self):
-        """Scan all directories for yaml files and load them."""
-        for sdir in self.search_dirs:
-            if not sdir.exists():
-                continue
-            
-            # Find all yaml files recursively
-            for yaml_path in sdir.rglob("*.yaml"):
-                if "learner_state" in str(yaml_path):
-                    continue
-                
-                try:
-                    with open(yaml_path) as f:
-                        data = yaml.safe_load(f)
-                    
-                    if not data or not isinstance(data, dict):
-                        continue
-                        
-                    artifact_id = data.get("id")
-                    if not artifact_id:
-                        continue
-                    
-                    # Store path for reference
-                    data["_path"] = yaml_path
-                    
-                    # Categorize based on content or filename
-                    if "assignments" in data or "produces" in data:
-                        self.modules[artifact_id] = data
-                    elif "modules" in data and "sub_goal" in data:
-                        self.campaigns[artifact_id] = data
-                    elif "campaigns" in data and "goal" in data:
-                        self.tracks[artifact_id] = data
-                        
-                except Exception as e:
-                    console.print(f"[yellow]Warning: Failed to load artifact at {yaml_path}: {e}[/yellow]")
+        """Take the categorized artifacts from the shared catalog scan."""
+        if self.catalog.index_error:
+            console.print(f"[yellow]Warning: Registry index unavailable ({self.catalog.index_error}); rescanning.[/yellow]")
+        for yaml_path, error in self.catalog.errors.items():
+            console.print(f"[yellow]Warning: Failed to load artifact at {yaml_path}: {error}[/yellow]")
+
+        self.modules = dict(self.catalog.modules)
+        self.campaigns = dict(self.catalog.campaigns)
+        self.tracks = dict(self.catalog.tracks)
+        self._build_producer_index()
+
+    def _build_producer_index(self):
+        """Map every produced competency to the modules that produce it."""
+        self.producers = {}
+        for mid, mod in self.modules.items():
+            for comp in mod.get("produces", None) or []:
+                self.producers.setdefault(comp, []).append(mid)
+
+    def is_resolvable(self, requirement: str) -> bool:
+        """A requirement resolves if it names a module or a produced competency."""
+        return requirement in self.modules or requirement in self.producers
 
     def get_module(self, module_id: str) -> Optional[Dict[str, Any]]:
         return self.modules.get(module_id)
@@ -70,19 +66,15 @@ class CurriculumResolver:
             return []
             
         requires = artifact.get("requires", [])
-        missing = []
-        for req in requires:
-            # Simple check: does any module produce this ID?
-            # Or is the ID another module?
-            if req not in self.modules:
-                # Check if any module produces this competency
-                found = False
-                for mod in self.modules.values():
-                    if req in mod.get("produces", []):
-                        found = True
-                        break
-                if not found:
-                    missing.append(req)
+        return [req for req in requires if not self.is_resolvable(req)]
+
+    def resolve_all_dependencies(self) -> Set[str]:
+        """Return every unresolved requirement across all modules in one pass."""
+        missing = set()
+        for mod in self.modules.values():
+            for req in mod.get("requires", None) or []:
+                if not self.is_resolvable(req):
+                    missing.add(req)
         return missing
 
     def report(self):
@@ -92,10 +84,7 @@ class CurriculumResolver:
         console.print(f"Campaigns: {len(self.campaigns)}")
         console.print(f"Modules:   {len(self.modules)}")
         
-        all_missing = set()
-        for mid in self.modules:
-            missing = self.resolve_dependencies(mid)
-            all_missing.update(missing)
+        all_missing = self.resolve_all_dependencies()
             
         if all_missing:
             console.print(f"[yellow]Unresolved Dependencies: {len(all_missing)}[/yellow]")
@@ -0,0 +1,282 @@
+"""
+Progress Rollups.
+
+Materialized per-learner progress counters, kept in the learner ledger's
+database: completed assignments per module, campaign, domain and in total
+(the union of all modules, as `status` reports it).
+
+Counters follow the ledger's event log. Each learner has a cursor (the
+last event folded in) and the catalog version the counters were built
+against. refresh() reads only that learner's events past the cursor, and
+for each completed-assignment key whose membership changed it adjusts
+the few scopes containing that assignment, so recording one piece of
+evidence costs O(affected scopes). A different catalog version rebuilds
+the learner from the ledger's current entries; rebuild() does so on
+demand. Readers (status, dashboards polling many learners) then read the
+counters instead of recounting.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from engine.resolver.catalog import Catalog
+from engine.resolver.ledger import LedgerStore, COMPLETED_SECTIONS
+
+ROLLUP_KINDS = ("module", "campaign", "domain", "total")
+
+# Scope ID of the single `total` scope
+TOTAL_SCOPE = "total"
+
+_IN_COMPLETED = f"section IN ({','.join('?' * len(COMPLETED_SECTIONS))})"
+
+
+class ScopeMap:
+    """For one catalog version: assignment -> scopes containing it, and scope totals."""
+
+    def __init__(self, catalog: Catalog):
+        self.version = catalog.version
+        self.scopes: Dict[str, List[Tuple[str, str]]] = {}
+        self.totals: Dict[str, Dict[str, int]] = {kind: {} for kind in ROLLUP_KINDS}
+
+        domains: Dict[str, set] = {}
+        for module_id, assignments in catalog.module_assignments.items():
+            relevant = set(assignments)
+            self._add("module", module_id, relevant)
+            # Module IDs mirror domains/<domain>/..., so the first segment is the domain
+            domains.setdefault(module_id.split(".")[0], set()).update(relevant)
+        for domain, relevant in domains.items():
+            self._add("domain", domain, relevant)
+        for campaign_id, assignments in catalog.campaign_assignments.items():
+            self._add("campaign", campaign_id, set(assignments))
+        self._add("total", TOTAL_SCOPE, set().union(*domains.values()))
+
+    def _add(self, kind: str, scope_id: str, relevant: set):
+        self.totals[kind][scope_id] = len(relevant)
+        for a in relevant:
+            self.scopes.setdefault(a, []).append((kind, scope_id))
+
+    def affected(self, assignment_id: str) -> List[Tuple[str, str]]:
+        return self.scopes.get(assignment_id, [])
+
+
+class ProgressRollups:
+    """Per-learner progress counters over a ledger, for one catalog."""
+
+    def __init__(self, store: LedgerStore, catalog: Catalog):
+        self.store = store
+        self.catalog = catalog
+        self._scope_map: Optional[ScopeMap] = None
+
+    @property
+    def scope_map(self) -> ScopeMap:
+        if self._scope_map is None or self._scope_map.version != self.catalog.version:
+            self._scope_map = ScopeMap(self.catalog)
+        return self._scope_map
+
+    @property
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """{kind: {scope_id: assignments in scope}}."""
+        return self.scope_map.totals
+
+    def _connect(self):
+        conn = self.store.connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollup_state ("
+            " learner_id TEXT PRIMARY KEY,"
+            " catalog_version TEXT NOT NULL,"
+            " cursor INTEGER NOT NULL)"
+        )
+        # Completed assignment keys the counters currently reflect
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollup_keys ("
+            " learner_id TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " PRIMARY KEY (learner_id, key)) WITHOUT ROWID"
+        )
+        # Non-zero counters only
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups ("
+            " learner_id TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " scope_id TEXT NOT NULL,"
+            " done INTEGER NOT NULL,"
+            " PRIMARY KEY (learner_id, kind, scope_id)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS rollups_by_scope ON rollups (kind, scope_id)")
+        return conn
+
+    # --- Maintenance ---
+
+    def refresh(self, learner_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Bring counters up to date with the ledger for these learners (all
+        learners with events when None). Returns counts of learners
+        updated incrementally and rebuilt.
+        """
+        # The scope map is only built once some learner needs updating
+        version = self.catalog.version
+        stats = {"updated": 0, "rebuilt": 0}
+        conn = self._connect()
+        try:
+            if learner_ids is None:
+                heads = conn.execute("SELECT learner_id, MAX(seq) FROM events GROUP BY learner_id").fetchall()
+            else:
+                heads = [(lid, conn.execute("SELECT MAX(seq) FROM events WHERE learner_id = ?", (lid,)).fetchone()[0])
+                         for lid in learner_ids]
+            states = dict((lid, (v, c)) for lid, v, c in
+                          conn.execute("SELECT learner_id, catalog_version, cursor FROM rollup_state"))
+            for learner_id, head in heads:
+                head = head or 0
+                state = states.get(learner_id)
+                if state and state[0] == version and state[1] >= head:
+                    continue
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Re-read under the write lock; another process may have caught up
+                    row = conn.execute("SELECT catalog_version, cursor FROM rollup_state WHERE learner_id = ?",
+                                       (learner_id,)).fetchone()
+                    head = conn.execute("SELECT MAX(seq) FROM events WHERE learner_id = ?",
+                                        (learner_id,)).fetchone()[0] or 0
+                    if row is None or row[0] != version:
+                        self._rebuild(conn, learner_id, head)
+                        stats["rebuilt"] += 1
+                    elif row[1] < head:
+                        self._catch_up(conn, learner_id, row[1], head)
+                        stats["updated"] += 1
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        finally:
+            conn.close()
+        return stats
+
+    def rebuild(self, learner_ids: Optional[Iterable[str]] = None) -> int:
+        """Recompute counters from scratch from the ledger's current entries."""
+        conn = self._connect()
+        try:
+            if learner_ids is None:
+                learner_ids = [lid for lid, in conn.execute(
+                    "SELECT learner_id FROM rollup_state UNION SELECT DISTINCT learner_id FROM entries")]
+            n = 0
+            for learner_id in learner_ids:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    head = conn.execute("SELECT MAX(seq) FROM events WHERE learner_id = ?",
+                                        (learner_id,)).fetchone()[0] or 0
+                    self._rebuild(conn, learner_id, head)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                n += 1
+            return n
+        finally:
+            conn.close()
+
+    def _rebuild(self, conn, learner_id: str, head: int):
+        scope_map = self.scope_map
+        completed = {key for key, in conn.execute(
+            f"SELECT key FROM entries WHERE learner_id = ? AND {_IN_COMPLETED}", (learner_id, *COMPLETED_SECTIONS))}
+        counts: Dict[Tuple[str, str], int] = {}
+        for key in completed:
+            for scope in scope_map.affected(key):
+                counts[scope] = counts.get(scope, 0) + 1
+        conn.execute("DELETE FROM rollup_keys WHERE learner_id = ?", (learner_id,))
+        conn.execute("DELETE FROM rollups WHERE learner_id = ?", (learner_id,))
+        conn.executemany("INSERT INTO rollup_keys VALUES (?, ?)", ((learner_id, k) for k in completed))
+        conn.executemany("INSERT INTO rollups VALUES (?, ?, ?, ?)",
+                         ((learner_id, kind, sid, n) for (kind, sid), n in counts.items()))
+        conn.execute("INSERT OR REPLACE INTO rollup_state VALUES (?, ?, ?)", (learner_id, scope_map.version, head))
+
+    def _catch_up(self, conn, learner_id: str, cursor: int, head: int):
+        """Fold events (cursor, head] into the counters."""
+        scope_map = self.scope_map
+        keys = [key for key, in conn.execute(
+            f"SELECT DISTINCT key FROM events WHERE learner_id = ? AND seq > ? AND seq <= ? AND {_IN_COMPLETED}",
+            (learner_id, cursor, head, *COMPLETED_SECTIONS))]
+        deltas: Dict[Tuple[str, str], int] = {}
+        for key in keys:
+            # The union of the completed sections decides, not the single event
+            now = conn.execute(f"SELECT 1 FROM entries WHERE learner_id = ? AND key = ? AND {_IN_COMPLETED} LIMIT 1",
+                               (learner_id, key, *COMPLETED_SECTIONS)).fetchone() is not None
+            before = conn.execute("SELECT 1 FROM rollup_keys WHERE learner_id = ? AND key = ?",
+                                  (learner_id, key)).fetchone() is not None
+            if now == before:
+                continue
+            if now:
+                conn.execute("INSERT INTO rollup_keys VALUES (?, ?)", (learner_id, key))
+            else:
+                conn.execute("DELETE FROM rollup_keys WHERE learner_id = ? AND key = ?", (learner_id, key))
+            for scope in scope_map.affected(key):
+                deltas[scope] = deltas.get(scope, 0) + (1 if now else -1)
+        for (kind, scope_id), delta in deltas.items():
+            if delta:
+                conn.execute("INSERT INTO rollups VALUES (?, ?, ?, ?) ON CONFLICT (learner_id, kind, scope_id)"
+                             " DO UPDATE SET done = done + excluded.done", (learner_id, kind, scope_id, delta))
+        conn.execute("DELETE FROM rollups WHERE learner_id = ? AND done = 0", (learner_id,))
+        conn.execute("UPDATE rollup_state SET cursor = ? WHERE learner_id = ?", (head, learner_id))
+
+    # --- Reads ---
+
+    def counters(self, learner_id: str, kind: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """{kind: {scope_id: completed}} for one learner; scopes with no progress are absent."""
+        result: Dict[str, Dict[str, int]] = {k: {} for k in ROLLUP_KINDS}
+        conn = self._connect()
+        try:
+            if kind:
+                rows = conn.execute("SELECT kind, scope_id, done FROM rollups WHERE learner_id = ? AND kind = ?",
+                                    (learner_id, kind))
+            else:
+                rows = conn.execute("SELECT kind, scope_id, done FROM rollups WHERE learner_id = ?", (learner_id,))
+            for k, scope_id, done in rows:
+                result[k][scope_id] = done
+        finally:
+            conn.close()
+        return result
+
+    def completed_count(self, learner_id: str) -> int:
+        """Completed assignments the counters reflect (in or out of the catalog)."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM rollup_keys WHERE learner_id = ?", (learner_id,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def scope_counters(self, kind: str, scope_id: str) -> Dict[str, int]:
+        """{learner_id: completed} for one scope, across every learner with progress in it."""
+        conn = self._connect()
+        try:
+            return dict(conn.execute("SELECT learner_id, done FROM rollups WHERE kind = ? AND scope_id = ?",
+                                     (kind, scope_id)))
+        finally:
+            conn.close()
+
+
+def compact_ledger(store: LedgerStore) -> int:
+    """
+    Compact the ledger, keeping each learner's events past its rollup
+    cursor. Learners without rollups are rebuilt from entries when first
+    read, so their superseded events all go. Returns events removed.
+    """
+    conn = store.connect()
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_state'").fetchone():
+            conn.execute("BEGIN IMMEDIATE")
+            removed = conn.execute("DELETE FROM events WHERE seq NOT IN (SELECT seq FROM entries)").rowcount
+            conn.execute("COMMIT")
+            conn.execute("VACUUM")
+            return removed
+        conn.execute("BEGIN IMMEDIATE")
+        removed = conn.execute(
+            "DELETE FROM events WHERE seq NOT IN (SELECT seq FROM entries)"
+            " AND seq <= COALESCE((SELECT cursor FROM rollup_state r WHERE r.learner_id = events.learner_id), seq)"
+        ).rowcount
+        conn.execute("COMMIT")
+        conn.execute("VACUUM")
+        return removed
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
@@ -39,6 +39,11 @@ class RunConfig(BaseModel):
     learner_state: LearnerState
     curriculum: CurriculumConfig
     output: OutputConfig = Field(default_factory=OutputConfig)
+
+    # Sampling parameters for every LLM call of the run
+    temperature: float = 0.0
+    max_tokens: int = 4096
+    seed: Optional[int] = Field(None, description="Sampling seed, for providers that honour it")
     
     # Optional override for template paths
     template_dir: Optional[str] = None
@@ -0,0 +1,169 @@
+"""
+Copy-on-write benchmark sandboxes.
+
+A sandbox's school-content is materialized from an immutable snapshot by
+hardlinking (or reflinking) every file instead of copying it, so a sandbox
+costs one directory entry per file and no data blocks. ArtifactWriter
+replaces files atomically (write to a temp file, then rename), which swaps
+the sandbox's directory entry and never touches the shared inode — the
+snapshot stays pristine however many sandboxes write over it.
+
+Anything else that writes into a sandbox must do the same (or unlink
+first); appending to a linked file in place would write through to the
+snapshot.
+"""
+
+import datetime
+import errno
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Files that are per-sandbox state, never shared with the snapshot
+NEVER_LINK = {".registry_index.sqlite", ".registry_index.sqlite-journal", ".registry_index.sqlite-wal",
+              ".validation_results.sqlite", ".validation_results.sqlite-journal"}
+
+LINK_METHODS = ("auto", "hardlink", "reflink", "copy")
+
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs, overlayfs on those)
+_FICLONE = 0x40049409
+
+# runs/<YYYYmmdd_HHMMSS>_<name> (runner sandboxes, bench batches)
+RUN_DIR_PATTERN = re.compile(r"^\d{8}_\d{6}(_.*)?$")
+
+
+def _reflink(src: str, dst: str):
+    import fcntl
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dst)
+            raise
+
+
+class SnapshotLinker:
+    """Links one snapshot into many sandboxes, remembering what the filesystem supports."""
+
+    def __init__(self, method: str = "auto"):
+        if method not in LINK_METHODS:
+            raise ValueError(f"Unknown link method: {method}. Expected one of {', '.join(LINK_METHODS)}")
+        self.method = method
+        # "auto" degrades hardlink -> reflink -> copy on the first failure of each
+        self._chain = ["hardlink", "reflink", "copy"] if method == "auto" else [method]
+
+    def _place(self, src: str, dst: str) -> str:
+        while True:
+            how = self._chain[0]
+            try:
+                if how == "hardlink":
+                    os.link(src, dst)
+                elif how == "reflink":
+                    _reflink(src, dst)
+                else:
+                    shutil.copy2(src, dst)
+                return how
+            except OSError as e:
+                if how == "copy" or len(self._chain) == 1 or e.errno not in (
+                        errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EMLINK):
+                    raise
+                self._chain.pop(0)
+
+    def materialize(self, snapshot: Path, dest: Path) -> Dict[str, int]:
+        """Mirror `snapshot` into `dest` (which must not exist yet). Returns counts per method."""
+        snapshot, dest = Path(snapshot), Path(dest)
+        if not snapshot.is_dir():
+            raise FileNotFoundError(f"Snapshot not found: {snapshot}")
+        counts = {"hardlink": 0, "reflink": 0, "copy": 0, "dirs": 0}
+        started = time.perf_counter()
+        dest.mkdir(parents=True)
+        for root, dirs, files in os.walk(snapshot):
+            rel = os.path.relpath(root, snapshot)
+            target_root = dest if rel == "." else dest / rel
+            for d in dirs:
+                (target_root / d).mkdir()
+                counts["dirs"] += 1
+            for f in files:
+                if f in NEVER_LINK or f.endswith(".tmp"):
+                    continue
+                counts[self._place(os.path.join(root, f), str(target_root / f))] += 1
+        counts["ms"] = int((time.perf_counter() - started) * 1000)
+        return counts
+
+
+def materialize(snapshot: Path, dest: Path, method: str = "auto") -> Dict[str, int]:
+    """Link an immutable snapshot into a fresh sandbox directory."""
+    return SnapshotLinker(method).materialize(snapshot, dest)
+
+
+def materialize_school(snapshot: Path, school: Path, method: str = "auto") -> Dict[str, int]:
+    """
+    Build a sandbox school-content from a snapshot that is either a whole
+    school root (containing domains/) or a bare domains/ directory.
+    """
+    snapshot, school = Path(snapshot), Path(school)
+    if (snapshot / "domains").is_dir():
+        counts = materialize(snapshot, school, method)
+    else:
+        school.mkdir(parents=True)
+        counts = materialize(snapshot, school / "domains", method)
+    for sub in ("domains", "projects", "exams"):
+        (school / sub).mkdir(exist_ok=True)
+    return counts
+
+
+def write_replacing(path: Path, content: str):
+    """
+    Write a file by atomic rename. If `path` is linked into a snapshot, the
+    link is replaced rather than written through.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{time.monotonic_ns()}.tmp")
+    try:
+        tmp.write_text(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _run_dirs(runs_dir: Path) -> List[Path]:
+    found = []
+    for parent in (runs_dir, runs_dir / "bench"):
+        if parent.is_dir():
+            found.extend(p for p in parent.iterdir() if p.is_dir() and RUN_DIR_PATTERN.match(p.name))
+    return found
+
+
+def gc_runs(runs_dir: Path, keep: int = 20, older_than_days: Optional[float] = None,
+            dry_run: bool = False) -> List[Path]:
+    """
+    Delete old run sandboxes under runs/ and runs/bench/.
+
+    The newest `keep` runs always survive; of the rest, only those older than
+    `older_than_days` are removed (all of them when it is None). Deleting a
+    sandbox only drops its links, never snapshot data.
+    """
+    runs = sorted(_run_dirs(Path(runs_dir)), key=lambda p: p.name, reverse=True)
+    cutoff = None
+    if older_than_days is not None:
+        cutoff = datetime.datetime.now() - datetime.timedelta(days=older_than_days)
+
+    removed = []
+    for path in runs[keep:]:
+        if cutoff is not None:
+            try:
+                started = datetime.datetime.strptime(path.name[:15], "%Y%m%d_%H%M%S")
+            except ValueError:
+                continue
+            if started > cutoff:
+                continue
+        if not dry_run:
+            shutil.rmtree(path, ignore_errors=True)
+        removed.append(path)
+    return removed
@@ -2,6 +2,9 @@ from pathlib import Path
 import yaml
 import os
 
+from engine.benchmarking.telemetry import span
+from engine.utils.sandbox import write_replacing
+
 class ArtifactWriter:
     def __init__(self, root_dir: str):
         self.root = Path(root_dir)
@@ -57,10 +60,12 @@ class ArtifactWriter:
         else:
             raise ValueError(f"Unknown artifact type: {artifact_type}")
             
-        # Ensure directory exists
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write content
-        path.write_text(content)
+        with span("write", artifact_type=artifact_type, artifact_id=artifact_id, bytes=len(content)):
+            # Atomic replace: never writes through a file linked from a snapshot
+            write_replacing(path, content)
+        # The next resolver in this process must see the new artifact. Imported
+        # here: the catalog pulls in sqlite3 and multiprocessing at runner startup.
+        from engine.resolver.catalog import invalidate
+        invalidate(self.root)
         print(f"[Writer] Saved {artifact_type} ({artifact_id}) to {path}")
         return path